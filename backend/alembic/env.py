@@ -0,0 +1,65 @@
+"""Alembic environment: migrates DATABASE_URL to the models in app/models.py.
+
+Run from the backend directory:
+    alembic upgrade head
+    alembic revision --autogenerate --rev-id 0002 -m "add ..."
+"""
+import re
+from logging.config import fileConfig
+
+from alembic import context
+from sqlalchemy import create_engine, pool
+
+from app.config import settings
+from app.models import Base
+
+config = context.config
+if config.config_file_name is not None and config.attributes.get("configure_logger", True):
+    fileConfig(config.config_file_name)
+
+target_metadata = Base.metadata
+
+# Postgres-only objects created by migrations with raw SQL; the models do not
+# describe them, so autogenerate must not propose dropping them
+POSTGRES_ONLY_INDEXES = {"idx_employees_search_trgm", "idx_leave_requests_period"}
+ATTENDANCE_PARTITION = re.compile(r"attendance_(default|y\d{4}m\d{2})")
+
+def include_object(obj, name, type_, reflected, compare_to) -> bool:
+    if type_ == "index" and name in POSTGRES_ONLY_INDEXES:
+        return False
+    if type_ == "table" and reflected and ATTENDANCE_PARTITION.fullmatch(name):
+        return False
+    return True
+
+def run_migrations_offline() -> None:
+    """Write the migration SQL to stdout (alembic upgrade head --sql)."""
+    context.configure(
+        url=settings.DATABASE_URL,
+        target_metadata=target_metadata,
+        include_object=include_object,
+        literal_binds=True,
+        dialect_opts={"paramstyle": "named"},
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+def run_migrations_online() -> None:
+    # A connection of its own, without the app's pool and statement timeout
+    connectable = config.attributes.get("connection") or create_engine(
+        settings.DATABASE_URL, poolclass=pool.NullPool
+    )
+    with connectable.connect() as connection:
+        context.configure(
+            connection=connection,
+            target_metadata=target_metadata,
+            include_object=include_object,
+            # SQLite cannot ALTER most things; batch mode recreates the table
+            render_as_batch=connection.dialect.name == "sqlite",
+        )
+        with context.begin_transaction():
+            context.run_migrations()
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
@@ -0,0 +1,612 @@
+"""initial schema
+
+Generated from app/models.py, plus what the models cannot describe: on
+Postgres, monthly partitioning of attendance, the leave overlap exclusion
+constraint and the trigram and GiST indexes. Replaces database/init.sql.
+
+Revision ID: 0001
+Revises: 
+Create Date: 2026-10-17 02:50:59.673962
+
+"""
+import json
+import uuid
+from datetime import date
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = '0001'
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Postgres enum types, created with the first table using them
+ENUMS = (
+    'gender_type', 'marital_status', 'employment_type', 'employment_status', 'attendance_status',
+    'leave_status', 'recruitment_status', 'interview_type', 'performance_rating', 'priority_level', 'job_status',
+)
+
+DEFAULT_ROLES = [
+    {'name': 'Super Admin', 'description': 'Full system access', 'permissions': {'all': True}},
+    {'name': 'HR Manager', 'description': 'HR management access', 'permissions': {
+        'employees': ['read', 'write'], 'payroll': ['read', 'write'],
+        'recruitment': ['read', 'write'], 'performance': ['read', 'write'],
+    }},
+    {'name': 'Department Manager', 'description': 'Department management access', 'permissions': {
+        'employees': ['read'], 'attendance': ['read'], 'performance': ['read', 'write'],
+    }},
+    {'name': 'Employee', 'description': 'Basic employee access', 'permissions': {
+        'profile': ['read', 'write'], 'attendance': ['read'], 'leave': ['read', 'write'],
+    }},
+]
+
+
+def create_attendance_partitions() -> None:
+    """The default partition, the last year and the next three months.
+
+    Later months are created by app/attendance_partitions.py.
+    """
+    op.execute("CREATE TABLE attendance_default PARTITION OF attendance DEFAULT")
+    today = date.today()
+    for offset in range(-12, 4):
+        index = today.year * 12 + today.month - 1 + offset
+        start, end = date(index // 12, index % 12 + 1, 1), date((index + 1) // 12, (index + 1) % 12 + 1, 1)
+        op.execute(
+            f"CREATE TABLE attendance_y{start:%Y}m{start:%m} PARTITION OF attendance "
+            f"FOR VALUES FROM ('{start}') TO ('{end}')"
+        )
+
+
+def upgrade() -> None:
+    postgres = op.get_context().dialect.name == "postgresql"
+    if postgres:
+        # Also in database/init.sql, for roles that may not create extensions
+        op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        op.execute("CREATE EXTENSION IF NOT EXISTS btree_gist")
+
+    op.create_table('organizations',
+    sa.Column('id', sa.Uuid(), nullable=False),
+    sa.Column('name', sa.String(length=255), nullable=False),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('address', sa.Text(), nullable=True),
+    sa.Column('phone', sa.String(length=20), nullable=True),
+    sa.Column('email', sa.String(length=255), nullable=True),
+    sa.Column('website', sa.String(length=255), nullable=True),
+    sa.Column('logo_url', sa.String(length=500), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.PrimaryKeyConstraint('id', name=op.f('organizations_pkey'))
+    )
+    op.create_table('roles',
+    sa.Column('id', sa.Uuid(), nullable=False),
+    sa.Column('name', sa.String(length=100), nullable=False),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('permissions', sa.JSON().with_variant(postgresql.JSONB(), 'postgresql'), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.PrimaryKeyConstraint('id', name=op.f('roles_pkey')),
+    sa.UniqueConstraint('name', name=op.f('roles_name_key'))
+    )
+    roles = sa.table(
+        'roles',
+        sa.column('id', sa.Uuid()),
+        sa.column('name', sa.String()),
+        sa.column('description', sa.Text()),
+        # As JSON text, which Postgres casts to jsonb; also renders with --sql
+        sa.column('permissions', sa.Text()),
+    )
+    op.bulk_insert(roles, [
+        {'id': uuid.uuid4(), **role, 'permissions': json.dumps(role['permissions'])} for role in DEFAULT_ROLES
+    ])
+    op.create_table('dashboard_summaries',
+    sa.Column('organization_id', sa.Uuid(), nullable=False),
+    sa.Column('payload', sa.Text(), nullable=False),
+    sa.Column('refreshed_at', sa.DateTime(timezone=True), nullable=False),
+    sa.ForeignKeyConstraint(['organization_id'], ['organizations.id'], name=op.f('dashboard_summaries_organization_id_fkey'), ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('organization_id', name=op.f('dashboard_summaries_pkey'))
+    )
+    op.create_table('departments',
+    sa.Column('id', sa.Uuid(), nullable=False),
+    sa.Column('organization_id', sa.Uuid(), nullable=True),
+    sa.Column('name', sa.String(length=255), nullable=False),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('manager_id', sa.Uuid(), nullable=True),
+    sa.Column('budget', sa.Numeric(precision=15, scale=2), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.ForeignKeyConstraint(['manager_id'], ['employees.id'], name='fk_departments_manager', ondelete='SET NULL', use_alter=True),
+    sa.ForeignKeyConstraint(['organization_id'], ['organizations.id'], name=op.f('departments_organization_id_fkey'), ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id', name=op.f('departments_pkey'))
+    )
+    op.create_index('idx_departments_organization_id', 'departments', ['organization_id'], unique=False)
+    op.create_table('leave_types',
+    sa.Column('id', sa.Uuid(), nullable=False),
+    sa.Column('organization_id', sa.Uuid(), nullable=True),
+    sa.Column('name', sa.String(length=100), nullable=False),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('max_days_per_year', sa.Integer(), nullable=True),
+    sa.Column('is_paid', sa.Boolean(), nullable=True),
+    sa.Column('requires_approval', sa.Boolean(), nullable=True),
+    sa.Column('advance_notice_days', sa.Integer(), nullable=True),
+    sa.Column('is_active', sa.Boolean(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.ForeignKeyConstraint(['organization_id'], ['organizations.id'], name=op.f('leave_types_organization_id_fkey'), ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id', name=op.f('leave_types_pkey'))
+    )
+    op.create_index('idx_leave_types_organization_id', 'leave_types', ['organization_id'], unique=False)
+    op.create_table('training_programs',
+    sa.Column('id', sa.Uuid(), nullable=False),
+    sa.Column('organization_id', sa.Uuid(), nullable=True),
+    sa.Column('title', sa.String(length=255), nullable=False),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('duration_hours', sa.Integer(), nullable=True),
+    sa.Column('max_participants', sa.Integer(), nullable=True),
+    sa.Column('cost_per_participant', sa.Numeric(precision=10, scale=2), nullable=True),
+    sa.Column('trainer_name', sa.String(length=255), nullable=True),
+    sa.Column('is_active', sa.Boolean(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.ForeignKeyConstraint(['organization_id'], ['organizations.id'], name=op.f('training_programs_organization_id_fkey'), ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id', name=op.f('training_programs_pkey'))
+    )
+    op.create_table('positions',
+    sa.Column('id', sa.Uuid(), nullable=False),
+    sa.Column('department_id', sa.Uuid(), nullable=True),
+    sa.Column('title', sa.String(length=255), nullable=False),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('requirements', sa.Text(), nullable=True),
+    sa.Column('min_salary', sa.Numeric(precision=12, scale=2), nullable=True),
+    sa.Column('max_salary', sa.Numeric(precision=12, scale=2), nullable=True),
+    sa.Column('is_active', sa.Boolean(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.ForeignKeyConstraint(['department_id'], ['departments.id'], name=op.f('positions_department_id_fkey'), ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id', name=op.f('positions_pkey'))
+    )
+    op.create_index('idx_positions_department_id', 'positions', ['department_id'], unique=False)
+    op.create_table('employees',
+    sa.Column('id', sa.Uuid(), nullable=False),
+    sa.Column('employee_id', sa.String(length=50), nullable=False),
+    sa.Column('organization_id', sa.Uuid(), nullable=True),
+    sa.Column('department_id', sa.Uuid(), nullable=True),
+    sa.Column('position_id', sa.Uuid(), nullable=True),
+    sa.Column('manager_id', sa.Uuid(), nullable=True),
+    sa.Column('first_name', sa.String(length=100), nullable=False),
+    sa.Column('last_name', sa.String(length=100), nullable=False),
+    sa.Column('email', sa.String(length=255), nullable=False),
+    sa.Column('phone', sa.String(length=20), nullable=True),
+    sa.Column('date_of_birth', sa.Date(), nullable=True),
+    sa.Column('gender', sa.Enum('male', 'female', 'other', 'prefer_not_to_say', name='gender_type'), nullable=True),
+    sa.Column('marital_status', sa.Enum('single', 'married', 'divorced', 'widowed', name='marital_status'), nullable=True),
+    sa.Column('nationality', sa.String(length=100), nullable=True),
+    sa.Column('address', sa.Text(), nullable=True),
+    sa.Column('city', sa.String(length=100), nullable=True),
+    sa.Column('state', sa.String(length=100), nullable=True),
+    sa.Column('postal_code', sa.String(length=20), nullable=True),
+    sa.Column('country', sa.String(length=100), nullable=True),
+    sa.Column('hire_date', sa.Date(), nullable=False),
+    sa.Column('employment_type', sa.Enum('full_time', 'part_time', 'contract', 'intern', 'consultant', name='employment_type'), nullable=False),
+    sa.Column('employment_status', sa.Enum('active', 'inactive', 'terminated', 'suspended', name='employment_status'), nullable=True),
+    sa.Column('termination_date', sa.Date(), nullable=True),
+    sa.Column('termination_reason', sa.Text(), nullable=True),
+    sa.Column('base_salary', sa.Numeric(precision=12, scale=2), nullable=True),
+    sa.Column('emergency_contact_name', sa.String(length=200), nullable=True),
+    sa.Column('emergency_contact_phone', sa.String(length=20), nullable=True),
+    sa.Column('emergency_contact_relationship', sa.String(length=100), nullable=True),
+    sa.Column('profile_picture_url', sa.String(length=500), nullable=True),
+    sa.Column('bio', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.ForeignKeyConstraint(['department_id'], ['departments.id'], name=op.f('employees_department_id_fkey'), ondelete='SET NULL'),
+    sa.ForeignKeyConstraint(['manager_id'], ['employees.id'], name=op.f('employees_manager_id_fkey'), ondelete='SET NULL'),
+    sa.ForeignKeyConstraint(['organization_id'], ['organizations.id'], name=op.f('employees_organization_id_fkey'), ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['position_id'], ['positions.id'], name=op.f('employees_position_id_fkey'), ondelete='SET NULL'),
+    sa.PrimaryKeyConstraint('id', name=op.f('employees_pkey')),
+    sa.UniqueConstraint('email', name=op.f('employees_email_key')),
+    sa.UniqueConstraint('employee_id', name=op.f('employees_employee_id_key'))
+    )
+    op.create_index('idx_employees_department_id', 'employees', ['department_id'], unique=False)
+    op.create_index('idx_employees_employment_status', 'employees', ['employment_status'], unique=False)
+    op.create_index('idx_employees_last_name_id', 'employees', ['last_name', 'id'], unique=False)
+    op.create_index('idx_employees_manager_id', 'employees', ['manager_id'], unique=False)
+    op.create_index('idx_employees_organization_id', 'employees', ['organization_id'], unique=False)
+    if postgres:
+        # Departments and employees reference each other
+        op.create_foreign_key(
+            'fk_departments_manager', 'departments', 'employees', ['manager_id'], ['id'], ondelete='SET NULL'
+        )
+        # Must match app.search.employee_search_document()
+        op.execute(
+            "CREATE INDEX idx_employees_search_trgm ON employees USING gin "
+            "((first_name || ' ' || last_name || ' ' || email || ' ' || employee_id) gin_trgm_ops)"
+        )
+    op.create_table('attendance',
+    sa.Column('id', sa.Uuid(), nullable=False),
+    sa.Column('employee_id', sa.Uuid(), nullable=True),
+    sa.Column('date', sa.Date(), nullable=False),
+    sa.Column('check_in_time', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('check_out_time', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('break_duration', sa.Integer(), nullable=True),
+    sa.Column('total_hours', sa.Numeric(precision=4, scale=2), nullable=True),
+    sa.Column('status', sa.Enum('present', 'absent', 'late', 'half_day', 'work_from_home', name='attendance_status'), nullable=False),
+    sa.Column('notes', sa.Text(), nullable=True),
+    sa.Column('location_check_in', sa.String(length=255), nullable=True),
+    sa.Column('location_check_out', sa.String(length=255), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.ForeignKeyConstraint(['employee_id'], ['employees.id'], name=op.f('attendance_employee_id_fkey'), ondelete='CASCADE'),
+    # Partitioned by month on Postgres, where keys must include the partition key
+    sa.PrimaryKeyConstraint(*(('id', 'date') if postgres else ('id',)), name=op.f('attendance_pkey')),
+    sa.UniqueConstraint('employee_id', 'date', name=op.f('attendance_employee_id_date_key')),
+    postgresql_partition_by='RANGE (date)'
+    )
+    # Created on every partition
+    op.create_index('idx_attendance_date_id', 'attendance', ['date', 'id'], unique=False)
+    if postgres:
+        create_attendance_partitions()
+    op.create_table('attendance_rollups',
+    sa.Column('employee_id', sa.Uuid(), nullable=False),
+    sa.Column('month', sa.Date(), nullable=False),
+    sa.Column('days_recorded', sa.Integer(), nullable=False),
+    sa.Column('present_days', sa.Integer(), nullable=False),
+    sa.Column('late_days', sa.Integer(), nullable=False),
+    sa.Column('absent_days', sa.Integer(), nullable=False),
+    sa.Column('half_days', sa.Integer(), nullable=False),
+    sa.Column('remote_days', sa.Integer(), nullable=False),
+    sa.Column('total_hours', sa.Numeric(precision=7, scale=2), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.ForeignKeyConstraint(['employee_id'], ['employees.id'], name=op.f('attendance_rollups_employee_id_fkey'), ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('employee_id', 'month', name=op.f('attendance_rollups_pkey'))
+    )
+    op.create_index('idx_attendance_rollups_month', 'attendance_rollups', ['month'], unique=False)
+    op.create_table('employee_benefits',
+    sa.Column('id', sa.Uuid(), nullable=False),
+    sa.Column('employee_id', sa.Uuid(), nullable=True),
+    sa.Column('benefit_type', sa.String(length=100), nullable=False),
+    sa.Column('benefit_name', sa.String(length=255), nullable=False),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('monthly_cost', sa.Numeric(precision=10, scale=2), nullable=True),
+    sa.Column('employee_contribution', sa.Numeric(precision=10, scale=2), nullable=True),
+    sa.Column('company_contribution', sa.Numeric(precision=10, scale=2), nullable=True),
+    sa.Column('start_date', sa.Date(), nullable=True),
+    sa.Column('end_date', sa.Date(), nullable=True),
+    sa.Column('is_active', sa.Boolean(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.ForeignKeyConstraint(['employee_id'], ['employees.id'], name=op.f('employee_benefits_employee_id_fkey'), ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id', name=op.f('employee_benefits_pkey'))
+    )
+    op.create_index('idx_employee_benefits_employee_id', 'employee_benefits', ['employee_id'], unique=False)
+    op.create_table('employee_hierarchy',
+    sa.Column('ancestor_id', sa.Uuid(), nullable=False),
+    sa.Column('descendant_id', sa.Uuid(), nullable=False),
+    sa.Column('depth', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['ancestor_id'], ['employees.id'], name=op.f('employee_hierarchy_ancestor_id_fkey'), ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['descendant_id'], ['employees.id'], name=op.f('employee_hierarchy_descendant_id_fkey'), ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('ancestor_id', 'descendant_id', name=op.f('employee_hierarchy_pkey'))
+    )
+    op.create_index('idx_employee_hierarchy_descendant_id', 'employee_hierarchy', ['descendant_id'], unique=False)
+    op.create_table('employee_training',
+    sa.Column('id', sa.Uuid(), nullable=False),
+    sa.Column('employee_id', sa.Uuid(), nullable=True),
+    sa.Column('training_program_id', sa.Uuid(), nullable=True),
+    sa.Column('enrollment_date', sa.Date(), server_default=sa.func.current_date(), nullable=True),
+    sa.Column('completion_date', sa.Date(), nullable=True),
+    sa.Column('score', sa.Numeric(precision=5, scale=2), nullable=True),
+    sa.Column('certificate_url', sa.String(length=500), nullable=True),
+    sa.Column('is_completed', sa.Boolean(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.ForeignKeyConstraint(['employee_id'], ['employees.id'], name=op.f('employee_training_employee_id_fkey'), ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['training_program_id'], ['training_programs.id'], name=op.f('employee_training_training_program_id_fkey'), ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id', name=op.f('employee_training_pkey'))
+    )
+    op.create_index('idx_employee_training_employee_id', 'employee_training', ['employee_id'], unique=False)
+    op.create_table('leave_balances',
+    sa.Column('id', sa.Uuid(), nullable=False),
+    sa.Column('employee_id', sa.Uuid(), nullable=False),
+    sa.Column('leave_type_id', sa.Uuid(), nullable=False),
+    sa.Column('year', sa.Integer(), nullable=False),
+    sa.Column('accrued_days', sa.Numeric(precision=6, scale=2), nullable=False),
+    sa.Column('carried_forward_days', sa.Numeric(precision=6, scale=2), nullable=False),
+    sa.Column('used_days', sa.Numeric(precision=6, scale=2), nullable=False),
+    sa.Column('pending_days', sa.Numeric(precision=6, scale=2), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.ForeignKeyConstraint(['employee_id'], ['employees.id'], name=op.f('leave_balances_employee_id_fkey'), ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['leave_type_id'], ['leave_types.id'], name=op.f('leave_balances_leave_type_id_fkey'), ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id', name=op.f('leave_balances_pkey')),
+    sa.UniqueConstraint('employee_id', 'leave_type_id', 'year', name=op.f('leave_balances_employee_id_leave_type_id_year_key'))
+    )
+    op.create_table('leave_requests',
+    sa.Column('id', sa.Uuid(), nullable=False),
+    sa.Column('employee_id', sa.Uuid(), nullable=True),
+    sa.Column('leave_type_id', sa.Uuid(), nullable=True),
+    sa.Column('start_date', sa.Date(), nullable=False),
+    sa.Column('end_date', sa.Date(), nullable=False),
+    sa.Column('total_days', sa.Integer(), nullable=False),
+    sa.Column('reason', sa.Text(), nullable=False),
+    sa.Column('status', sa.Enum('pending', 'approved', 'rejected', 'cancelled', name='leave_status'), nullable=True),
+    sa.Column('approved_by', sa.Uuid(), nullable=True),
+    sa.Column('approved_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('rejection_reason', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.ForeignKeyConstraint(['approved_by'], ['employees.id'], name=op.f('leave_requests_approved_by_fkey'), ondelete='SET NULL'),
+    sa.ForeignKeyConstraint(['employee_id'], ['employees.id'], name=op.f('leave_requests_employee_id_fkey'), ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['leave_type_id'], ['leave_types.id'], name=op.f('leave_requests_leave_type_id_fkey'), ondelete='RESTRICT'),
+    sa.PrimaryKeyConstraint('id', name=op.f('leave_requests_pkey'))
+    )
+    op.create_index('idx_leave_requests_employee_id', 'leave_requests', ['employee_id'], unique=False)
+    op.create_index('idx_leave_requests_status', 'leave_requests', ['status'], unique=False)
+    if postgres:
+        # Matches app.leave.leave_period() and ACTIVE_STATUSES
+        op.execute(
+            "ALTER TABLE leave_requests ADD CONSTRAINT leave_requests_no_overlap EXCLUDE USING gist "
+            "(employee_id WITH =, daterange(start_date, end_date, '[]') WITH &&) "
+            "WHERE (status IN ('pending', 'approved'))"
+        )
+        op.execute(
+            "CREATE INDEX idx_leave_requests_period ON leave_requests "
+            "USING gist (daterange(start_date, end_date, '[]'))"
+        )
+    op.create_table('performance_reviews',
+    sa.Column('id', sa.Uuid(), nullable=False),
+    sa.Column('employee_id', sa.Uuid(), nullable=True),
+    sa.Column('reviewer_id', sa.Uuid(), nullable=True),
+    sa.Column('review_period_start', sa.Date(), nullable=False),
+    sa.Column('review_period_end', sa.Date(), nullable=False),
+    sa.Column('overall_rating', sa.Enum('outstanding', 'exceeds_expectations', 'meets_expectations', 'below_expectations', 'unsatisfactory', name='performance_rating'), nullable=False),
+    sa.Column('technical_skills_rating', sa.Enum('outstanding', 'exceeds_expectations', 'meets_expectations', 'below_expectations', 'unsatisfactory', name='performance_rating'), nullable=True),
+    sa.Column('communication_rating', sa.Enum('outstanding', 'exceeds_expectations', 'meets_expectations', 'below_expectations', 'unsatisfactory', name='performance_rating'), nullable=True),
+    sa.Column('teamwork_rating', sa.Enum('outstanding', 'exceeds_expectations', 'meets_expectations', 'below_expectations', 'unsatisfactory', name='performance_rating'), nullable=True),
+    sa.Column('leadership_rating', sa.Enum('outstanding', 'exceeds_expectations', 'meets_expectations', 'below_expectations', 'unsatisfactory', name='performance_rating'), nullable=True),
+    sa.Column('achievements', sa.Text(), nullable=True),
+    sa.Column('areas_for_improvement', sa.Text(), nullable=True),
+    sa.Column('goals_next_period', sa.Text(), nullable=True),
+    sa.Column('manager_feedback', sa.Text(), nullable=True),
+    sa.Column('employee_comments', sa.Text(), nullable=True),
+    sa.Column('is_completed', sa.Boolean(), nullable=True),
+    sa.Column('completed_date', sa.Date(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.ForeignKeyConstraint(['employee_id'], ['employees.id'], name=op.f('performance_reviews_employee_id_fkey'), ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['reviewer_id'], ['employees.id'], name=op.f('performance_reviews_reviewer_id_fkey'), ondelete='SET NULL'),
+    sa.PrimaryKeyConstraint('id', name=op.f('performance_reviews_pkey'))
+    )
+    op.create_index('idx_performance_reviews_employee_id', 'performance_reviews', ['employee_id'], unique=False)
+    op.create_index('idx_performance_reviews_reviewer_id', 'performance_reviews', ['reviewer_id'], unique=False)
+    op.create_table('users',
+    sa.Column('id', sa.Uuid(), nullable=False),
+    sa.Column('employee_id', sa.Uuid(), nullable=True),
+    sa.Column('username', sa.String(length=100), nullable=False),
+    sa.Column('email', sa.String(length=255), nullable=False),
+    sa.Column('password_hash', sa.String(length=255), nullable=False),
+    sa.Column('is_active', sa.Boolean(), nullable=True),
+    sa.Column('last_login', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.ForeignKeyConstraint(['employee_id'], ['employees.id'], name=op.f('users_employee_id_fkey'), ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id', name=op.f('users_pkey')),
+    sa.UniqueConstraint('email', name=op.f('users_email_key')),
+    sa.UniqueConstraint('username', name=op.f('users_username_key'))
+    )
+    op.create_index('idx_users_employee_id', 'users', ['employee_id'], unique=False)
+    op.create_table('announcements',
+    sa.Column('id', sa.Uuid(), nullable=False),
+    sa.Column('organization_id', sa.Uuid(), nullable=True),
+    sa.Column('title', sa.String(length=255), nullable=False),
+    sa.Column('content', sa.Text(), nullable=False),
+    sa.Column('priority', sa.Enum('low', 'medium', 'high', 'critical', name='priority_level'), nullable=True),
+    sa.Column('target_audience', sa.String(length=100), nullable=True),
+    sa.Column('target_department_id', sa.Uuid(), nullable=True),
+    sa.Column('is_active', sa.Boolean(), nullable=True),
+    sa.Column('publish_date', sa.Date(), server_default=sa.func.current_date(), nullable=True),
+    sa.Column('expiry_date', sa.Date(), nullable=True),
+    sa.Column('created_by', sa.Uuid(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.ForeignKeyConstraint(['created_by'], ['users.id'], name=op.f('announcements_created_by_fkey'), ondelete='SET NULL'),
+    sa.ForeignKeyConstraint(['organization_id'], ['organizations.id'], name=op.f('announcements_organization_id_fkey'), ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['target_department_id'], ['departments.id'], name=op.f('announcements_target_department_id_fkey'), ondelete='SET NULL'),
+    sa.PrimaryKeyConstraint('id', name=op.f('announcements_pkey'))
+    )
+    op.create_index('idx_announcements_organization_id', 'announcements', ['organization_id'], unique=False)
+    op.create_table('employee_documents',
+    sa.Column('id', sa.Uuid(), nullable=False),
+    sa.Column('employee_id', sa.Uuid(), nullable=True),
+    sa.Column('document_type', sa.String(length=100), nullable=False),
+    sa.Column('document_name', sa.String(length=255), nullable=False),
+    sa.Column('file_url', sa.String(length=500), nullable=False),
+    sa.Column('uploaded_by', sa.Uuid(), nullable=True),
+    sa.Column('is_confidential', sa.Boolean(), nullable=True),
+    sa.Column('expiry_date', sa.Date(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.ForeignKeyConstraint(['employee_id'], ['employees.id'], name=op.f('employee_documents_employee_id_fkey'), ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['uploaded_by'], ['users.id'], name=op.f('employee_documents_uploaded_by_fkey'), ondelete='SET NULL'),
+    sa.PrimaryKeyConstraint('id', name=op.f('employee_documents_pkey'))
+    )
+    op.create_index('idx_employee_documents_employee_id', 'employee_documents', ['employee_id'], unique=False)
+    op.create_table('job_postings',
+    sa.Column('id', sa.Uuid(), nullable=False),
+    sa.Column('organization_id', sa.Uuid(), nullable=True),
+    sa.Column('position_id', sa.Uuid(), nullable=True),
+    sa.Column('title', sa.String(length=255), nullable=False),
+    sa.Column('description', sa.Text(), nullable=False),
+    sa.Column('requirements', sa.Text(), nullable=True),
+    sa.Column('location', sa.String(length=255), nullable=True),
+    sa.Column('employment_type', sa.Enum('full_time', 'part_time', 'contract', 'intern', 'consultant', name='employment_type'), nullable=False),
+    sa.Column('salary_min', sa.Numeric(precision=12, scale=2), nullable=True),
+    sa.Column('salary_max', sa.Numeric(precision=12, scale=2), nullable=True),
+    sa.Column('is_active', sa.Boolean(), nullable=True),
+    sa.Column('posted_date', sa.Date(), server_default=sa.func.current_date(), nullable=True),
+    sa.Column('closing_date', sa.Date(), nullable=True),
+    sa.Column('posted_by', sa.Uuid(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.ForeignKeyConstraint(['organization_id'], ['organizations.id'], name=op.f('job_postings_organization_id_fkey'), ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['position_id'], ['positions.id'], name=op.f('job_postings_position_id_fkey'), ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['posted_by'], ['users.id'], name=op.f('job_postings_posted_by_fkey'), ondelete='SET NULL'),
+    sa.PrimaryKeyConstraint('id', name=op.f('job_postings_pkey'))
+    )
+    op.create_index('idx_job_postings_organization_id', 'job_postings', ['organization_id'], unique=False)
+    op.create_table('jobs',
+    sa.Column('id', sa.Uuid(), nullable=False),
+    sa.Column('kind', sa.String(length=100), nullable=False),
+    sa.Column('payload', sa.Text(), nullable=False),
+    sa.Column('unique_key', sa.String(length=255), nullable=True),
+    sa.Column('status', sa.Enum('queued', 'running', 'succeeded', 'failed', name='job_status'), nullable=False),
+    sa.Column('attempts', sa.Integer(), nullable=False),
+    sa.Column('max_attempts', sa.Integer(), nullable=False),
+    sa.Column('run_after', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    sa.Column('progress', sa.Integer(), nullable=False),
+    sa.Column('progress_message', sa.String(length=255), nullable=True),
+    sa.Column('result', sa.Text(), nullable=True),
+    sa.Column('error', sa.Text(), nullable=True),
+    sa.Column('locked_by', sa.String(length=255), nullable=True),
+    sa.Column('locked_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('started_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('finished_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('created_by', sa.Uuid(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.ForeignKeyConstraint(['created_by'], ['users.id'], name=op.f('jobs_created_by_fkey'), ondelete='SET NULL'),
+    sa.PrimaryKeyConstraint('id', name=op.f('jobs_pkey'))
+    )
+    op.create_index('idx_jobs_active_unique_key', 'jobs', ['unique_key'], unique=True, postgresql_where=sa.text("status IN ('queued', 'running')"), sqlite_where=sa.text("status IN ('queued', 'running')"))
+    op.create_index('idx_jobs_queued_run_after', 'jobs', ['run_after'], unique=False, postgresql_where=sa.text("status = 'queued'"), sqlite_where=sa.text("status = 'queued'"))
+    op.create_index('idx_jobs_running_locked_at', 'jobs', ['locked_at'], unique=False, postgresql_where=sa.text("status = 'running'"), sqlite_where=sa.text("status = 'running'"))
+    op.create_table('payroll',
+    sa.Column('id', sa.Uuid(), nullable=False),
+    sa.Column('employee_id', sa.Uuid(), nullable=True),
+    sa.Column('pay_period_start', sa.Date(), nullable=False),
+    sa.Column('pay_period_end', sa.Date(), nullable=False),
+    sa.Column('basic_salary', sa.Numeric(precision=12, scale=2), nullable=False),
+    sa.Column('allowances', sa.Numeric(precision=12, scale=2), nullable=True),
+    sa.Column('overtime_pay', sa.Numeric(precision=12, scale=2), nullable=True),
+    sa.Column('bonus', sa.Numeric(precision=12, scale=2), nullable=True),
+    sa.Column('gross_pay', sa.Numeric(precision=12, scale=2), nullable=False),
+    sa.Column('tax_deduction', sa.Numeric(precision=12, scale=2), nullable=True),
+    sa.Column('insurance_deduction', sa.Numeric(precision=12, scale=2), nullable=True),
+    sa.Column('retirement_deduction', sa.Numeric(precision=12, scale=2), nullable=True),
+    sa.Column('other_deductions', sa.Numeric(precision=12, scale=2), nullable=True),
+    sa.Column('total_deductions', sa.Numeric(precision=12, scale=2), nullable=False),
+    sa.Column('net_pay', sa.Numeric(precision=12, scale=2), nullable=False),
+    sa.Column('is_processed', sa.Boolean(), nullable=True),
+    sa.Column('processed_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('processed_by', sa.Uuid(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.ForeignKeyConstraint(['employee_id'], ['employees.id'], name=op.f('payroll_employee_id_fkey'), ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['processed_by'], ['users.id'], name=op.f('payroll_processed_by_fkey'), ondelete='SET NULL'),
+    sa.PrimaryKeyConstraint('id', name=op.f('payroll_pkey')),
+    sa.UniqueConstraint('employee_id', 'pay_period_start', 'pay_period_end', name=op.f('payroll_employee_id_pay_period_start_pay_period_end_key'))
+    )
+    op.create_index('idx_payroll_pay_period', 'payroll', ['pay_period_start', 'pay_period_end'], unique=False)
+    op.create_table('user_roles',
+    sa.Column('id', sa.Uuid(), nullable=False),
+    sa.Column('user_id', sa.Uuid(), nullable=True),
+    sa.Column('role_id', sa.Uuid(), nullable=True),
+    sa.Column('assigned_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.Column('assigned_by', sa.Uuid(), nullable=True),
+    sa.ForeignKeyConstraint(['assigned_by'], ['users.id'], name=op.f('user_roles_assigned_by_fkey'), ondelete='SET NULL'),
+    sa.ForeignKeyConstraint(['role_id'], ['roles.id'], name=op.f('user_roles_role_id_fkey'), ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], name=op.f('user_roles_user_id_fkey'), ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id', name=op.f('user_roles_pkey')),
+    sa.UniqueConstraint('user_id', 'role_id', name=op.f('user_roles_user_id_role_id_key'))
+    )
+    op.create_table('job_applications',
+    sa.Column('id', sa.Uuid(), nullable=False),
+    sa.Column('job_posting_id', sa.Uuid(), nullable=True),
+    sa.Column('first_name', sa.String(length=100), nullable=False),
+    sa.Column('last_name', sa.String(length=100), nullable=False),
+    sa.Column('email', sa.String(length=255), nullable=False),
+    sa.Column('phone', sa.String(length=20), nullable=True),
+    sa.Column('resume_url', sa.String(length=500), nullable=True),
+    sa.Column('cover_letter', sa.Text(), nullable=True),
+    sa.Column('status', sa.Enum('applied', 'screening', 'interview_scheduled', 'interviewed', 'selected', 'rejected', 'offer_sent', 'offer_accepted', 'joined', name='recruitment_status'), nullable=True),
+    sa.Column('applied_date', sa.Date(), server_default=sa.func.current_date(), nullable=True),
+    sa.Column('ai_screening_score', sa.Numeric(precision=5, scale=2), nullable=True),
+    sa.Column('ai_screening_notes', sa.Text(), nullable=True),
+    sa.Column('ai_screening_date', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('expected_salary', sa.Numeric(precision=12, scale=2), nullable=True),
+    sa.Column('available_start_date', sa.Date(), nullable=True),
+    sa.Column('notes', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.ForeignKeyConstraint(['job_posting_id'], ['job_postings.id'], name=op.f('job_applications_job_posting_id_fkey'), ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id', name=op.f('job_applications_pkey'))
+    )
+    op.create_index('idx_job_applications_email', 'job_applications', ['email'], unique=False)
+    op.create_index('idx_job_applications_job_posting_id', 'job_applications', ['job_posting_id'], unique=False)
+    op.create_index('idx_job_applications_status', 'job_applications', ['status'], unique=False)
+    op.create_table('interviews',
+    sa.Column('id', sa.Uuid(), nullable=False),
+    sa.Column('job_application_id', sa.Uuid(), nullable=True),
+    sa.Column('interviewer_id', sa.Uuid(), nullable=True),
+    sa.Column('interview_type', sa.Enum('phone', 'video', 'in_person', 'technical', 'hr', 'final', name='interview_type'), nullable=False),
+    sa.Column('scheduled_date', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('duration_minutes', sa.Integer(), nullable=True),
+    sa.Column('location', sa.String(length=255), nullable=True),
+    sa.Column('meeting_link', sa.String(length=500), nullable=True),
+    sa.Column('conducted', sa.Boolean(), nullable=True),
+    sa.Column('actual_start_time', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('actual_end_time', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('rating', sa.Enum('outstanding', 'exceeds_expectations', 'meets_expectations', 'below_expectations', 'unsatisfactory', name='performance_rating'), nullable=True),
+    sa.Column('feedback', sa.Text(), nullable=True),
+    sa.Column('technical_score', sa.Numeric(precision=5, scale=2), nullable=True),
+    sa.Column('communication_score', sa.Numeric(precision=5, scale=2), nullable=True),
+    sa.Column('overall_score', sa.Numeric(precision=5, scale=2), nullable=True),
+    sa.Column('recommendation', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.ForeignKeyConstraint(['interviewer_id'], ['employees.id'], name=op.f('interviews_interviewer_id_fkey'), ondelete='SET NULL'),
+    sa.ForeignKeyConstraint(['job_application_id'], ['job_applications.id'], name=op.f('interviews_job_application_id_fkey'), ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id', name=op.f('interviews_pkey'))
+    )
+    op.create_index('idx_interviews_application_id', 'interviews', ['job_application_id'], unique=False)
+    op.create_index('idx_interviews_interviewer_id', 'interviews', ['interviewer_id'], unique=False)
+    op.create_index('idx_interviews_scheduled_date', 'interviews', ['scheduled_date'], unique=False)
+
+
+def downgrade() -> None:
+    if op.get_context().dialect.name == "postgresql":
+        op.drop_constraint('fk_departments_manager', 'departments', type_='foreignkey')
+    # Dependents first; dropping attendance drops its partitions too
+    for table in (
+        'interviews',
+        'job_applications',
+        'user_roles',
+        'payroll',
+        'jobs',
+        'job_postings',
+        'employee_documents',
+        'announcements',
+        'users',
+        'performance_reviews',
+        'leave_requests',
+        'leave_balances',
+        'employee_training',
+        'employee_hierarchy',
+        'employee_benefits',
+        'attendance_rollups',
+        'attendance',
+        'employees',
+        'positions',
+        'training_programs',
+        'leave_types',
+        'departments',
+        'dashboard_summaries',
+        'roles',
+        'organizations',
+    ):
+        op.drop_table(table)
+    if op.get_context().dialect.name == "postgresql":
+        for name in ENUMS:
+            op.execute(f"DROP TYPE IF EXISTS {name}")
@@ -0,0 +1,207 @@
+"""Monthly partitions of the attendance table (PostgreSQL).
+
+attendance is range-partitioned by date with one partition per month, named
+attendance_yYYYYmMM, plus attendance_default for dates without a partition
+(see the initial migration). Queries with a date range only scan the partitions
+of that range, and each month's indexes stay small, so inserts stop paying
+for the whole history.
+
+`maintain` is meant to run daily (cron or similar). It:
+- creates the partitions of the next ATTENDANCE_PARTITION_MONTHS_AHEAD months,
+  plus a partition for every month that has rows in the default partition,
+  and moves those rows into it;
+- if ATTENDANCE_RETENTION_MONTHS is set, detaches the partitions older than
+  that, writes each to ATTENDANCE_ARCHIVE_DIRECTORY as gzip-compressed CSV,
+  and drops it.
+
+Monthly attendance rollups of archived months are kept. Run from the backend
+directory with:
+    python -m app.attendance_partitions maintain [--dry-run]
+    python -m app.attendance_partitions restore archives/attendance/attendance_y2021m01.csv.gz
+"""
+import argparse
+import gzip
+import json
+import os
+import re
+from datetime import date
+from pathlib import Path
+from typing import Dict, List, Optional
+from sqlalchemy import text
+from app.attendance_rollups import month_start, next_month
+from app.config import settings
+from app.database import engine
+
+PARTITION_PATTERN = re.compile(r"^attendance_y(\d{4})m(\d{2})$")
+ARCHIVE_SUFFIX = ".csv.gz"
+
+def partition_name(month: date) -> str:
+    return f"attendance_y{month.year:04d}m{month.month:02d}"
+
+def partition_month(name: str) -> Optional[date]:
+    match = PARTITION_PATTERN.match(name)
+    return date(int(match.group(1)), int(match.group(2)), 1) if match else None
+
+def add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+def _require_postgres() -> None:
+    if engine.dialect.name != "postgresql":
+        raise SystemExit("Attendance partitioning requires PostgreSQL")
+
+def attached_partitions(connection) -> Dict[date, str]:
+    """Monthly partitions currently attached to attendance, by month."""
+    names = connection.execute(text(
+        "SELECT child.relname FROM pg_inherits "
+        "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+        "WHERE pg_inherits.inhparent = 'attendance'::regclass"
+    )).scalars()
+    return {partition_month(name): name for name in names if partition_month(name)}
+
+def detached_partitions(connection) -> Dict[date, str]:
+    """Monthly partition tables no longer attached, left by an interrupted archive."""
+    names = connection.execute(text(
+        "SELECT tablename FROM pg_tables WHERE schemaname = current_schema() "
+        "AND tablename LIKE 'attendance\\_y%'"
+    )).scalars()
+    attached = set(attached_partitions(connection).values())
+    return {partition_month(name): name for name in names if partition_month(name) and name not in attached}
+
+def create_partition(connection, month: date) -> int:
+    """Create and attach the partition of a month, moving its rows out of the default partition.
+
+    Returns the number of rows moved.
+    """
+    name = partition_name(month)
+    connection.execute(text(f'CREATE TABLE "{name}" (LIKE attendance INCLUDING DEFAULTS INCLUDING CONSTRAINTS)'))
+    moved = connection.execute(
+        text(
+            "WITH moved AS (DELETE FROM attendance_default WHERE date >= :start AND date < :end RETURNING *) "
+            f'INSERT INTO "{name}" SELECT * FROM moved'
+        ),
+        {"start": month, "end": next_month(month)}
+    ).rowcount
+    # Attaching builds the partition's copies of the attendance indexes
+    connection.execute(text(
+        f"ALTER TABLE attendance ATTACH PARTITION \"{name}\" "
+        f"FOR VALUES FROM ('{month.isoformat()}') TO ('{next_month(month).isoformat()}')"
+    ))
+    return moved
+
+def _archive_path(name: str) -> Path:
+    return Path(settings.ATTENDANCE_ARCHIVE_DIRECTORY) / f"{name}{ARCHIVE_SUFFIX}"
+
+def archive_partition(name: str, attached: bool = True) -> str:
+    """Detach a partition, write it to a compressed CSV file and drop it. Returns the file path.
+
+    The table is only dropped once its file is complete; a run interrupted
+    before that leaves a detached table, which the next run archives.
+    """
+    if attached:
+        with engine.begin() as connection:
+            connection.execute(text(f'ALTER TABLE attendance DETACH PARTITION "{name}"'))
+
+    path = _archive_path(name)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    partial = path.with_name(path.name + ".partial")
+    with engine.connect() as connection:
+        cursor = connection.connection.dbapi_connection.cursor()
+        with gzip.open(partial, "wb") as archive:
+            cursor.copy_expert(f'COPY "{name}" TO STDOUT WITH (FORMAT csv, HEADER true)', archive)
+        connection.rollback()
+    os.replace(partial, path)
+
+    with engine.begin() as connection:
+        connection.execute(text(f'DROP TABLE "{name}"'))
+    return str(path)
+
+def maintain(
+    months_ahead: Optional[int] = None,
+    retention_months: Optional[int] = None,
+    today: Optional[date] = None,
+    dry_run: bool = False
+) -> dict:
+    """Create upcoming partitions and archive expired ones; see the module docstring."""
+    _require_postgres()
+    months_ahead = settings.ATTENDANCE_PARTITION_MONTHS_AHEAD if months_ahead is None else months_ahead
+    retention_months = settings.ATTENDANCE_RETENTION_MONTHS if retention_months is None else retention_months
+    current = month_start(today or date.today())
+
+    with engine.connect() as connection:
+        attached = attached_partitions(connection)
+        detached = detached_partitions(connection)
+        stray_months = connection.execute(text(
+            "SELECT DISTINCT date_trunc('month', date)::date FROM attendance_default"
+        )).scalars().all()
+        connection.rollback()
+
+    wanted = {add_months(current, offset) for offset in range(months_ahead + 1)} | set(stray_months)
+    to_create = sorted(month for month in wanted if month not in attached and month not in detached)
+    cutoff = add_months(current, -retention_months) if retention_months else None
+    to_archive = sorted(
+        (month, name) for month, name in attached.items() if cutoff and month < cutoff
+    )
+    report = {
+        "created": [partition_name(month) for month in to_create],
+        "moved_from_default": 0,
+        "archived": [],
+        "skipped": [partition_name(month) for month in sorted(wanted) if month in detached],
+    }
+    if dry_run:
+        report["archived"] = [str(_archive_path(name)) for _, name in to_archive]
+        report["archived"] += [str(_archive_path(name)) for name in detached.values()]
+        return report
+
+    for month in to_create:
+        # One transaction per partition keeps the default partition's lock short
+        with engine.begin() as connection:
+            report["moved_from_default"] += create_partition(connection, month)
+    for name in detached.values():
+        report["archived"].append(archive_partition(name, attached=False))
+    for _, name in to_archive:
+        report["archived"].append(archive_partition(name))
+    return report
+
+def restore(path: str) -> dict:
+    """Load an archived month back as an attached partition."""
+    _require_postgres()
+    file_name = Path(path).name
+    name = file_name[:-len(ARCHIVE_SUFFIX)] if file_name.endswith(ARCHIVE_SUFFIX) else file_name
+    month = partition_month(name)
+    if month is None:
+        raise SystemExit(f"Not an attendance archive: {path}")
+
+    with engine.begin() as connection:
+        if month in attached_partitions(connection):
+            raise SystemExit(f"{name} is already attached")
+        connection.execute(text(f'CREATE TABLE "{name}" (LIKE attendance INCLUDING DEFAULTS INCLUDING CONSTRAINTS)'))
+        cursor = connection.connection.dbapi_connection.cursor()
+        with gzip.open(path, "rb") as archive:
+            cursor.copy_expert(f'COPY "{name}" FROM STDIN WITH (FORMAT csv, HEADER true)', archive)
+        rows = cursor.rowcount
+        connection.execute(text(
+            f"ALTER TABLE attendance ATTACH PARTITION \"{name}\" "
+            f"FOR VALUES FROM ('{month.isoformat()}') TO ('{next_month(month).isoformat()}')"
+        ))
+    return {"partition": name, "rows": rows}
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Maintain the monthly attendance partitions.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    maintain_parser = subparsers.add_parser("maintain", help="create upcoming partitions, archive expired ones")
+    maintain_parser.add_argument("--months-ahead", type=int)
+    maintain_parser.add_argument("--retention-months", type=int, help="0 keeps all months")
+    maintain_parser.add_argument("--dry-run", action="store_true", help="only report what would change")
+    restore_parser = subparsers.add_parser("restore", help="re-attach an archived month")
+    restore_parser.add_argument("path")
+    args = parser.parse_args(argv)
+
+    if args.command == "maintain":
+        report = maintain(args.months_ahead, args.retention_months, dry_run=args.dry_run)
+    else:
+        report = restore(args.path)
+    print(json.dumps(report, indent=2, default=str))
+
+if __name__ == "__main__":
+    main()
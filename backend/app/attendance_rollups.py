@@ -0,0 +1,190 @@
+"""Monthly attendance rollups.
+
+attendance_rollups holds one row per (employee, month) with the month's total
+hours and day counts by status, so timesheet summaries read one row per
+employee instead of scanning attendance. Every write to attendance adjusts
+the affected rollups in the same transaction with additive upserts (the new
+minus the old contribution of each attendance row), so concurrent writers
+never overwrite each other's totals.
+
+Attendance written around the API (seeding, imports, manual SQL) is brought
+back in line by rebuilding the affected months from attendance, one month per
+transaction:
+    python -m app.attendance_rollups rebuild [--from 2024-01] [--to 2024-12]
+
+A rebuild replaces a month's rows with totals read from attendance, so a
+delta landing in between would be lost or counted twice. On PostgreSQL every
+writer holds a shared advisory lock on the months it adjusts and the rebuild
+holds that month's lock exclusively, so a month is rebuilt either before or
+after a concurrent write, never during it; writes to other months carry on.
+SQLite serializes write transactions on the database lock already.
+"""
+import argparse
+import asyncio
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Dict, List, Optional, Tuple
+from uuid import UUID
+from sqlalchemy import Date, case, cast, delete, func, insert, select
+from app.database import engine, upsert
+from app.models import Attendance, AttendanceRollup, AttendanceStatus
+
+# Rows per upsert statement, keeping bind parameters under driver limits
+UPSERT_CHUNK_SIZE = 1000
+
+# Rollup column counting the days of each attendance status
+STATUS_COLUMNS = {
+    AttendanceStatus.present: "present_days",
+    AttendanceStatus.late: "late_days",
+    AttendanceStatus.absent: "absent_days",
+    AttendanceStatus.half_day: "half_days",
+    AttendanceStatus.work_from_home: "remote_days",
+}
+ROLLUP_COLUMNS = ["days_recorded", *STATUS_COLUMNS.values(), "total_hours"]
+
+# Class id of the per-month advisory locks (PostgreSQL only)
+ROLLUP_LOCK_CLASS = 7301
+
+RollupKey = Tuple[UUID, date]
+
+def month_start(day: date) -> date:
+    return day.replace(day=1)
+
+def next_month(month: date) -> date:
+    return date(month.year + month.month // 12, month.month % 12 + 1, 1)
+
+def _contribution(status: Optional[AttendanceStatus], total_hours) -> dict:
+    """Rollup columns one attendance row adds to its month."""
+    values = dict.fromkeys(ROLLUP_COLUMNS, 0)
+    values["days_recorded"] = 1
+    if status in STATUS_COLUMNS:
+        values[STATUS_COLUMNS[status]] = 1
+    values["total_hours"] = Decimal(str(total_hours or 0))
+    return values
+
+def record_change(
+    deltas: Dict[RollupKey, dict],
+    employee_id: UUID,
+    day: date,
+    old: Optional[tuple] = None,
+    new: Optional[tuple] = None
+) -> None:
+    """Add an attendance row's change to deltas.
+
+    old and new are the row's (status, total_hours) before and after the
+    write; None when the row did not exist before or no longer exists.
+    """
+    delta = deltas.setdefault((employee_id, month_start(day)), dict.fromkeys(ROLLUP_COLUMNS, 0))
+    for sign, values in ((-1, old), (1, new)):
+        if values is not None:
+            for column, value in _contribution(*values).items():
+                delta[column] += sign * value
+
+async def lock_months(db, months, exclusive: bool = False) -> None:
+    """Take the advisory locks of months until the end of the transaction.
+
+    Writers lock shared, rebuilds exclusively. Months are locked in order so
+    writers touching several months cannot deadlock a rebuild.
+    """
+    if engine.dialect.name != "postgresql":
+        return
+    lock = func.pg_advisory_xact_lock if exclusive else func.pg_advisory_xact_lock_shared
+    for month in sorted(set(months)):
+        await db.execute(select(lock(ROLLUP_LOCK_CLASS, month.year * 12 + month.month - 1)))
+
+def _rollup_upsert(rows: List[dict]):
+    table = AttendanceRollup.__table__
+    stmt = upsert(table).values(rows)
+    return stmt.on_conflict_do_update(
+        index_elements=[table.c.employee_id, table.c.month],
+        set_={
+            **{column: table.c[column] + stmt.excluded[column] for column in ROLLUP_COLUMNS},
+            "updated_at": func.now(),
+        }
+    )
+
+async def apply_rollup_deltas(db, deltas: Dict[RollupKey, dict]) -> None:
+    """Add deltas to their rollup rows, creating missing rows. Does not commit."""
+    # Sorted so concurrent transactions lock rollup rows in the same order
+    rows = [
+        {"employee_id": employee_id, "month": month, **delta}
+        for (employee_id, month), delta in sorted(deltas.items(), key=lambda item: (str(item[0][0]), item[0][1]))
+        if any(delta.values())
+    ]
+    await lock_months(db, [row["month"] for row in rows])
+    for start in range(0, len(rows), UPSERT_CHUNK_SIZE):
+        await db.execute(_rollup_upsert(rows[start:start + UPSERT_CHUNK_SIZE]))
+
+def _month_of(column):
+    if engine.dialect.name == "postgresql":
+        return cast(func.date_trunc("month", column), Date)
+    return func.date(column, "start of month")
+
+def rebuild_month_statements(month: date):
+    """DELETE and INSERT ... SELECT recomputing one month's rollups from attendance."""
+    table = AttendanceRollup.__table__
+    in_month = (
+        Attendance.employee_id.is_not(None),
+        Attendance.date >= month,
+        Attendance.date < next_month(month),
+    )
+    totals = select(
+        Attendance.employee_id,
+        _month_of(Attendance.date),
+        func.count(),
+        *[func.sum(case((Attendance.status == status, 1), else_=0)) for status in STATUS_COLUMNS],
+        func.coalesce(func.sum(Attendance.total_hours), 0),
+    ).where(*in_month).group_by(Attendance.employee_id)
+    return (
+        delete(table).where(table.c.month == month),
+        insert(table).from_select(["employee_id", "month", *ROLLUP_COLUMNS], totals),
+    )
+
+async def rebuild_rollups(db, start_month: Optional[date] = None, end_month: Optional[date] = None) -> dict:
+    """Recompute the rollups of every month in [start_month, end_month] from attendance.
+
+    Defaults to the months of the first and last attendance rows. Each month
+    is rebuilt under its exclusive advisory lock, waiting for the writers
+    already adjusting it and holding back new ones until it commits.
+    """
+    if start_month is None or end_month is None:
+        first, last = (await db.execute(select(func.min(Attendance.date), func.max(Attendance.date)))).one()
+        start_month = start_month or first
+        end_month = end_month or last
+    if start_month is None or end_month is None:
+        return {"months": 0, "rollups": 0}
+
+    month, end_month = month_start(start_month), month_start(end_month)
+    months = rollups = 0
+    while month <= end_month:
+        clear, fill = rebuild_month_statements(month)
+        await lock_months(db, [month], exclusive=True)
+        await db.execute(clear)
+        rollups += (await db.execute(fill)).rowcount
+        await db.commit()
+        months += 1
+        month = next_month(month)
+    return {"months": months, "rollups": rollups}
+
+def _month_arg(value: str) -> date:
+    return datetime.strptime(value, "%Y-%m").date()
+
+async def _run(args) -> dict:
+    from app.database import open_async_session
+    db = open_async_session()
+    try:
+        return await rebuild_rollups(db, args.start_month, args.end_month)
+    finally:
+        await db.close()
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Maintain monthly attendance rollups.")
+    parser.add_argument("command", choices=["rebuild"])
+    parser.add_argument("--from", dest="start_month", type=_month_arg, help="first month, YYYY-MM")
+    parser.add_argument("--to", dest="end_month", type=_month_arg, help="last month, YYYY-MM")
+    report = asyncio.run(_run(parser.parse_args(argv)))
+    print(json.dumps(report, indent=2, default=str))
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,34 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from typing import Optional
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from fastapi import HTTPException, status
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import object_session
+from app.cache import TTLCache
 from app.config import settings
+from app.database import on_commit
+from app.models import User
 
 # Password hashing
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+# bcrypt releases the GIL, so a small thread pool keeps hashing off the event loop
+password_executor = ThreadPoolExecutor(
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    thread_name_prefix="password-hash"
+)
+_pending_password_jobs = 0
+
+# Active users keyed by id, so authenticated requests can skip the users lookup.
+# Other workers learn of a change only when their entry expires, so the TTL is short
+user_cache = TTLCache(maxsize=settings.USER_CACHE_SIZE, ttl=settings.USER_CACHE_TTL_SECONDS, name="users")
+
+# Columns kept in the cache; the password hash stays in the database
+CACHED_USER_COLUMNS = [column for column in inspect(User).columns.keys() if column != "password_hash"]
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a plain password against its hash."""
     return pwd_context.verify(plain_password, hashed_password)
@@ -16,6 +37,30 @@ def get_password_hash(password: str) -> str:
     """Generate hash for a password."""
     return pwd_context.hash(password)
 
+async def _run_password_job(func, *args):
+    """Run a hashing call on the password pool, shedding load when it is saturated."""
+    global _pending_password_jobs
+    if _pending_password_jobs >= settings.PASSWORD_HASH_WORKERS + settings.PASSWORD_HASH_QUEUE_LIMIT:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Authentication service is busy, please retry",
+            headers={"Retry-After": "1"},
+        )
+    _pending_password_jobs += 1
+    try:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(password_executor, func, *args)
+    finally:
+        _pending_password_jobs -= 1
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Verify a password on the password hashing pool."""
+    return await _run_password_job(verify_password, plain_password, hashed_password)
+
+async def get_password_hash_async(password: str) -> str:
+    """Hash a password on the password hashing pool."""
+    return await _run_password_job(get_password_hash, password)
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """Create a JWT access token."""
     to_encode = data.copy()
@@ -39,3 +84,27 @@ def verify_token(token: str) -> dict:
             detail="Could not validate credentials",
             headers={"WWW-Authenticate": "Bearer"},
         )
+
+def cache_user(user: User) -> None:
+    """Cache a column snapshot of an active user."""
+    if user.is_active:
+        user_cache.set(user.id, {column: getattr(user, column) for column in CACHED_USER_COLUMNS})
+
+def get_cached_user(user_id) -> Optional[User]:
+    """Return a detached User built from the cache, or None on a miss."""
+    snapshot = user_cache.get(user_id)
+    if snapshot is None:
+        return None
+    return User(**snapshot)
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _invalidate_cached_user(mapper, connection, target) -> None:
+    # Cleared once the change commits: clearing at flush would let a concurrent
+    # request cache the old row again before the commit. Bulk UPDATE
+    # statements bypass this hook; they are covered by the TTL
+    user_id, session = target.id, object_session(target)
+    if session is None:
+        user_cache.invalidate(user_id)
+    else:
+        on_commit(session, lambda: user_cache.invalidate(user_id))
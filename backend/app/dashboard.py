@@ -0,0 +1,180 @@
+"""Dashboard summaries.
+
+The dashboard reads one precomputed row per organization from
+dashboard_summaries instead of running its aggregates on every page load.
+Workers refresh every summary older than DASHBOARD_REFRESH_INTERVAL_SECONDS,
+or computed on an earlier day, through "dashboard.refresh" jobs (see
+run_refresh_scheduler), so summaries stay fresh whether or not anyone reads
+them. Reads never run the aggregates: a summary past
+DASHBOARD_MAX_STALENESS_SECONDS, or from an earlier day, is not served, and
+the read queues its refresh instead. The job's unique key allows one queued
+or running refresh per organization across all processes.
+"""
+import asyncio
+import json
+import logging
+from datetime import date, datetime, time, timedelta, timezone
+from typing import List, Optional
+from uuid import UUID
+from sqlalchemy import func, or_, select
+from app.config import settings
+from app.database import open_async_session, upsert
+from app.jobs import enqueue, job_handler
+from app.models import (
+    Attendance, DashboardSummary, Department, Employee, EmploymentStatus, JobApplication,
+    JobPosting, LeaveRequest, LeaveStatus, Organization, RecruitmentStatus
+)
+
+logger = logging.getLogger(__name__)
+
+# Applications no longer in the hiring pipeline
+CLOSED_APPLICATION_STATUSES = (RecruitmentStatus.rejected, RecruitmentStatus.joined)
+
+async def compute_summary(db, organization_id: UUID, today: date) -> dict:
+    """Run the dashboard aggregates for one organization, one grouped query each."""
+    headcount_result = await db.execute(
+        select(Employee.department_id, Department.name, func.count())
+        .outerjoin(Department, Department.id == Employee.department_id)
+        .where(
+            Employee.organization_id == organization_id,
+            Employee.employment_status == EmploymentStatus.active
+        )
+        .group_by(Employee.department_id, Department.name)
+        .order_by(Department.name)
+    )
+    headcount = [
+        {"department_id": department_id, "department_name": name, "employees": count}
+        for department_id, name, count in headcount_result.all()
+    ]
+    total_employees = sum(row["employees"] for row in headcount)
+
+    attendance_result = await db.execute(
+        select(Attendance.status, func.count())
+        .join(Employee, Employee.id == Attendance.employee_id)
+        .where(Employee.organization_id == organization_id, Attendance.date == today)
+        .group_by(Attendance.status)
+    )
+    attendance = {status.value: count for status, count in attendance_result.all() if status}
+
+    pending_leave = await db.scalar(
+        select(func.count())
+        .select_from(LeaveRequest)
+        .join(Employee, Employee.id == LeaveRequest.employee_id)
+        .where(
+            Employee.organization_id == organization_id,
+            LeaveRequest.status == LeaveStatus.pending
+        )
+    )
+
+    open_applications = await db.scalar(
+        select(func.count())
+        .select_from(JobApplication)
+        .join(JobPosting, JobPosting.id == JobApplication.job_posting_id)
+        .where(
+            JobPosting.organization_id == organization_id,
+            JobApplication.status.not_in(CLOSED_APPLICATION_STATUSES)
+        )
+    )
+
+    return {
+        "date": today.isoformat(),
+        "total_employees": total_employees,
+        "headcount_by_department": [
+            {**row, "department_id": str(row["department_id"]) if row["department_id"] else None}
+            for row in headcount
+        ],
+        "attendance_today": {
+            **attendance,
+            "not_recorded": max(total_employees - sum(attendance.values()), 0),
+        },
+        "pending_leave_requests": pending_leave or 0,
+        "open_job_applications": open_applications or 0,
+    }
+
+async def refresh_summary(db, organization_id: UUID, today: Optional[date] = None) -> dict:
+    """Recompute and store an organization's summary, returning it."""
+    summary = await compute_summary(db, organization_id, today or date.today())
+    refreshed_at = datetime.now(timezone.utc)
+    table = DashboardSummary.__table__
+    stmt = upsert(table).values(
+        organization_id=organization_id,
+        payload=json.dumps(summary),
+        refreshed_at=refreshed_at
+    )
+    await db.execute(stmt.on_conflict_do_update(
+        index_elements=[table.c.organization_id],
+        set_={"payload": stmt.excluded.payload, "refreshed_at": stmt.excluded.refreshed_at}
+    ))
+    await db.commit()
+    return {**summary, "refreshed_at": refreshed_at}
+
+def _is_fresh(summary: Optional[dict], today: date) -> bool:
+    if summary is None or summary["date"] != today.isoformat():
+        return False
+    age = datetime.now(timezone.utc) - summary["refreshed_at"]
+    return age <= timedelta(seconds=settings.DASHBOARD_MAX_STALENESS_SECONDS)
+
+async def _read_summary(db, organization_id: UUID) -> Optional[dict]:
+    row = await db.get(DashboardSummary, organization_id, populate_existing=True)
+    if row is None:
+        return None
+    refreshed_at = row.refreshed_at
+    if refreshed_at.tzinfo is None:
+        # SQLite drops the offset; refreshed_at is always written in UTC
+        refreshed_at = refreshed_at.replace(tzinfo=timezone.utc)
+    return {**json.loads(row.payload), "refreshed_at": refreshed_at}
+
+async def request_refresh(db, organization_id: UUID) -> None:
+    """Queue a refresh of an organization's summary unless one is already queued or running."""
+    await enqueue(
+        db, "dashboard.refresh", {"organization_id": str(organization_id)},
+        unique_key=f"dashboard.refresh:{organization_id}"
+    )
+
+async def get_summary(db, organization_id: UUID) -> Optional[dict]:
+    """Return the stored summary, or None (queueing a refresh) when it is missing or stale."""
+    summary = await _read_summary(db, organization_id)
+    if not _is_fresh(summary, date.today()):
+        await request_refresh(db, organization_id)
+        return None
+    return summary
+
+async def queue_due_refreshes(db) -> List[UUID]:
+    """Queue a refresh for every organization whose summary is missing, due or from an earlier day."""
+    now = datetime.now(timezone.utc)
+    due_before = max(
+        now - timedelta(seconds=settings.DASHBOARD_REFRESH_INTERVAL_SECONDS),
+        # Local midnight, when the summaries' date changes
+        datetime.combine(date.today(), time()).astimezone(timezone.utc)
+    )
+    result = await db.execute(
+        select(Organization.id)
+        .outerjoin(DashboardSummary, DashboardSummary.organization_id == Organization.id)
+        .where(or_(DashboardSummary.refreshed_at.is_(None), DashboardSummary.refreshed_at < due_before))
+    )
+    organization_ids = list(result.scalars())
+    for organization_id in organization_ids:
+        await request_refresh(db, organization_id)
+    return organization_ids
+
+async def run_refresh_scheduler() -> None:
+    """Queue due summary refreshes every DASHBOARD_REFRESH_INTERVAL_SECONDS until cancelled.
+
+    Run by every worker; the refresh jobs' unique keys keep the queue to one
+    refresh per organization however many workers schedule them.
+    """
+    while True:
+        db = open_async_session()
+        try:
+            await queue_due_refreshes(db)
+        except Exception:
+            logger.exception("Scheduling dashboard refreshes failed")
+        finally:
+            await db.close()
+        await asyncio.sleep(settings.DASHBOARD_REFRESH_INTERVAL_SECONDS)
+
+@job_handler("dashboard.refresh", concurrency=1)
+async def refresh_summary_job(db, payload: dict, context) -> dict:
+    """Queued summary refresh; one at a time, keeping the aggregate scans off the API."""
+    summary = await refresh_summary(db, UUID(payload["organization_id"]))
+    return {"refreshed_at": summary["refreshed_at"]}
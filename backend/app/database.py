@@ -1,21 +1,195 @@
-from sqlalchemy import create_engine
+from itertools import cycle
+from typing import List
+from uuid import uuid4
+from fastapi import Depends, Request
+from sqlalchemy import MetaData, create_engine, event
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, Session
+from starlette.concurrency import run_in_threadpool
 from app.config import settings
+from app.metrics import TimedAsyncAdaptedQueuePool, TimedQueuePool, instrument_engine
+
+def _unique_statement_name() -> str:
+    return f"__asyncpg_{uuid4()}__"
+
+def engine_options(url: str, use_async: bool = False) -> dict:
+    """Engine arguments built from the DB_* settings; SQLite keeps its default pool."""
+    options = {
+        "pool_pre_ping": True,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "echo": settings.ENVIRONMENT == "development" if settings.DB_ECHO is None else settings.DB_ECHO,
+    }
+    if url.startswith("sqlite"):
+        return options
+
+    options.update(
+        poolclass=TimedAsyncAdaptedQueuePool if use_async else TimedQueuePool,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+    )
+    connect_args = {}
+    if settings.DB_PGBOUNCER_TRANSACTION_MODE:
+        if use_async:
+            # Server connections change between transactions, so prepared
+            # statements cannot be reused and their names must not collide
+            connect_args.update(
+                statement_cache_size=0,
+                prepared_statement_cache_size=0,
+                prepared_statement_name_func=_unique_statement_name,
+            )
+    elif settings.DB_STATEMENT_TIMEOUT_MS:
+        # Set once per connection at startup; PgBouncer rejects startup options
+        timeout = str(settings.DB_STATEMENT_TIMEOUT_MS)
+        if use_async:
+            connect_args["server_settings"] = {"statement_timeout": timeout}
+        else:
+            connect_args["options"] = f"-c statement_timeout={timeout}"
+    if connect_args:
+        options["connect_args"] = connect_args
+    return options
+
+def configure_engine(sync_engine, url: str, name: str) -> None:
+    """Attach metrics and per-transaction settings to a (sync) Engine."""
+    instrument_engine(sync_engine, name)
+    if settings.DB_PGBOUNCER_TRANSACTION_MODE and settings.DB_STATEMENT_TIMEOUT_MS and not url.startswith("sqlite"):
+        @event.listens_for(sync_engine, "begin")
+        def _set_statement_timeout(conn) -> None:
+            # SET LOCAL lasts only for the transaction, so it never leaks to
+            # another client sharing the PgBouncer server connection
+            conn.exec_driver_sql(f"SET LOCAL statement_timeout = {int(settings.DB_STATEMENT_TIMEOUT_MS)}")
 
 # Create database engine
-engine = create_engine(
-    settings.DATABASE_URL,
-    pool_pre_ping=True,
-    pool_recycle=300,
-    echo=settings.ENVIRONMENT == "development"
-)
+engine = create_engine(settings.DATABASE_URL, **engine_options(settings.DATABASE_URL))
+configure_engine(engine, settings.DATABASE_URL, "primary")
 
 # Create SessionLocal class
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
-# Create Base class for models
-Base = declarative_base()
+# Create Base class for models. Constraints get the names Postgres would
+# give them, so migrations can refer to them by name
+Base = declarative_base(metadata=MetaData(naming_convention={
+    "pk": "%(table_name)s_pkey",
+    "uq": "%(table_name)s_%(column_0_N_name)s_key",
+    "fk": "%(table_name)s_%(column_0_name)s_fkey",
+}))
+
+def on_commit(session: Session, callback) -> None:
+    """Run callback() once the session's transaction commits; dropped if it rolls back.
+
+    Process-local caches and indexes apply changes this way, so they never
+    reflect a write that is not committed yet or that was rolled back.
+    """
+    session.info.setdefault("on_commit", []).append(callback)
+
+@event.listens_for(Session, "after_commit")
+def _run_on_commit(session) -> None:
+    for callback in session.info.pop("on_commit", []):
+        callback()
+
+@event.listens_for(Session, "after_rollback")
+def _drop_on_commit(session) -> None:
+    session.info.pop("on_commit", None)
+
+# Sync drivers and the async driver that replaces them
+ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "postgresql+psycopg2": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+def get_async_database_url(url: str) -> str:
+    """Translate a sync database URL to the matching async driver URL."""
+    scheme, sep, rest = url.partition("://")
+    return f"{ASYNC_DRIVERS.get(scheme, scheme)}{sep}{rest}"
+
+# Async engine is only built in async mode so the async driver stays optional
+async_engine = None
+AsyncSessionLocal = None
+if settings.DATABASE_MODE == "async":
+    async_database_url = settings.ASYNC_DATABASE_URL or get_async_database_url(settings.DATABASE_URL)
+    async_engine = create_async_engine(async_database_url, **engine_options(async_database_url, use_async=True))
+    configure_engine(async_engine.sync_engine, async_database_url, "primary_async")
+    AsyncSessionLocal = async_sessionmaker(
+        async_engine, autoflush=False, expire_on_commit=False
+    )
+
+def replica_urls() -> List[str]:
+    return [url.strip() for url in settings.DATABASE_READ_REPLICA_URLS.split(",") if url.strip()]
+
+def _replica_sessionmaker(index: int, url: str):
+    """Engine and session factory for one read replica, in the driver flavour of DATABASE_MODE."""
+    if settings.DATABASE_MODE == "async":
+        url = get_async_database_url(url)
+        replica_engine = create_async_engine(url, **engine_options(url, use_async=True))
+        configure_engine(replica_engine.sync_engine, url, f"replica{index}_async")
+        return async_sessionmaker(replica_engine, autoflush=False, expire_on_commit=False)
+    replica_engine = create_engine(url, **engine_options(url))
+    configure_engine(replica_engine, url, f"replica{index}")
+    return sessionmaker(autocommit=False, autoflush=False, bind=replica_engine)
+
+replica_sessions = [_replica_sessionmaker(index, url) for index, url in enumerate(replica_urls())]
+_next_replica = cycle(replica_sessions)
+
+def upsert(table):
+    """INSERT construct with ON CONFLICT support for the configured database."""
+    if engine.dialect.name == "postgresql":
+        return postgresql.insert(table)
+    return sqlite.insert(table)
+
+class ThreadedSession:
+    """AsyncSession-compatible wrapper that runs a sync Session on the threadpool.
+
+    Used for `get_async_db` when DATABASE_MODE is "sync", so the ported routers
+    have one code path and psycopg2 calls still never block the event loop.
+    """
+
+    def __init__(self, session: Session):
+        self.sync_session = session
+
+    def add(self, instance) -> None:
+        self.sync_session.add(instance)
+
+    def add_all(self, instances) -> None:
+        self.sync_session.add_all(instances)
+
+    def expunge(self, instance) -> None:
+        self.sync_session.expunge(instance)
+
+    async def execute(self, *args, **kwargs):
+        return await run_in_threadpool(self.sync_session.execute, *args, **kwargs)
+
+    async def scalar(self, *args, **kwargs):
+        return await run_in_threadpool(self.sync_session.scalar, *args, **kwargs)
+
+    async def scalars(self, *args, **kwargs):
+        return await run_in_threadpool(self.sync_session.scalars, *args, **kwargs)
+
+    async def get(self, *args, **kwargs):
+        return await run_in_threadpool(self.sync_session.get, *args, **kwargs)
+
+    async def delete(self, instance) -> None:
+        await run_in_threadpool(self.sync_session.delete, instance)
+
+    async def run_sync(self, fn, *args, **kwargs):
+        return await run_in_threadpool(fn, self.sync_session, *args, **kwargs)
+
+    async def flush(self) -> None:
+        await run_in_threadpool(self.sync_session.flush)
+
+    async def refresh(self, instance, *args, **kwargs) -> None:
+        await run_in_threadpool(self.sync_session.refresh, instance, *args, **kwargs)
+
+    async def commit(self) -> None:
+        await run_in_threadpool(self.sync_session.commit)
+
+    async def rollback(self) -> None:
+        await run_in_threadpool(self.sync_session.rollback)
+
+    async def close(self) -> None:
+        await run_in_threadpool(self.sync_session.close)
 
 # Dependency to get database session
 def get_db() -> Session:
@@ -24,3 +198,64 @@ def get_db() -> Session:
         yield db
     finally:
         db.close()
+
+def open_async_session() -> AsyncSession:
+    """Open a session for the configured DATABASE_MODE outside of a request."""
+    if AsyncSessionLocal is not None:
+        return AsyncSessionLocal()
+    return ThreadedSession(SessionLocal())
+
+# Dependency to get a non-blocking database session
+async def get_async_db() -> AsyncSession:
+    db = open_async_session()
+    try:
+        yield db
+    finally:
+        await db.close()
+
+# Set on responses to writes; clients holding it read from the primary
+READ_PRIMARY_COOKIE = "hrms_read_primary"
+# Sent by clients (e.g. the frontend after a write) to read from the primary
+READ_PRIMARY_HEADER = "X-Read-Primary"
+
+def open_read_session(primary: bool = False) -> AsyncSession:
+    """Open a session on the next read replica, or on the primary if there are none."""
+    if primary or not replica_sessions:
+        return open_async_session()
+    session = next(_next_replica)()
+    if AsyncSessionLocal is not None:
+        return session
+    return ThreadedSession(session)
+
+def reads_from_primary(request: Request) -> bool:
+    """Whether the client asked to see its own recent writes."""
+    if READ_PRIMARY_COOKIE in request.cookies:
+        return True
+    return request.headers.get(READ_PRIMARY_HEADER, "").lower() in ("1", "true")
+
+# Dependency for read-only routes, round-robin across the read replicas.
+# Replicas lag the primary, so never write through this session.
+async def get_read_db(request: Request, primary_db: AsyncSession = Depends(get_async_db)) -> AsyncSession:
+    # Reads served by the primary share the request's primary session (the
+    # one authentication used), so a request never holds two primary
+    # connections and concurrent requests cannot deadlock on the pool
+    if reads_from_primary(request) or not replica_sessions:
+        yield primary_db
+        return
+    db = open_read_session()
+    try:
+        yield db
+    finally:
+        await db.close()
+
+async def read_your_writes_middleware(request: Request, call_next):
+    """Pin the client's reads to the primary for a while after each successful write."""
+    response = await call_next(request)
+    if request.method not in ("GET", "HEAD", "OPTIONS") and response.status_code < 400:
+        response.set_cookie(
+            READ_PRIMARY_COOKIE, "1",
+            max_age=settings.READ_YOUR_WRITES_SECONDS,
+            httponly=True,
+            samesite="lax"
+        )
+    return response
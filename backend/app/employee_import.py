@@ -0,0 +1,271 @@
+"""Bulk employee import from CSV or XLSX files.
+
+Rows are read as a stream and validated in chunks: uniqueness and foreign
+keys are checked with one set-based query per column per chunk, and valid
+rows are inserted with a single executemany per chunk.
+
+Run from the backend directory as a CLI:
+    python -m app.employee_import employees.csv
+"""
+import argparse
+import asyncio
+import csv
+import io
+import json
+from datetime import datetime
+from itertools import islice
+from typing import BinaryIO, Dict, Iterable, Iterator, List, Optional, get_args
+from uuid import UUID, uuid4
+from pydantic import ValidationError
+from sqlalchemy import insert, select
+from sqlalchemy.exc import IntegrityError
+from starlette.concurrency import run_in_threadpool
+from app.config import settings
+from app.models import Department, Employee, Organization, Position
+from app.org_chart import add_to_hierarchy
+from app.schemas import EmployeeCreate
+from app.search import SEARCH_FIELDS, employee_search_index
+
+def iter_csv_rows(fileobj: BinaryIO) -> Iterator[dict]:
+    reader = csv.DictReader(io.TextIOWrapper(fileobj, encoding="utf-8-sig", newline=""))
+    for row in reader:
+        yield row
+
+def iter_xlsx_rows(fileobj: BinaryIO) -> Iterator[dict]:
+    try:
+        from openpyxl import load_workbook
+    except ImportError:
+        raise ValueError("XLSX import requires the openpyxl package")
+    workbook = load_workbook(fileobj, read_only=True, data_only=True)
+    try:
+        rows = workbook.active.iter_rows(values_only=True)
+        header = [str(cell).strip() if cell is not None else "" for cell in next(rows, ())]
+        for values in rows:
+            if all(value is None for value in values):
+                continue
+            yield dict(zip(header, values))
+    finally:
+        workbook.close()
+
+def iter_import_rows(fileobj: BinaryIO, filename: str) -> Iterator[dict]:
+    """Stream rows from a CSV or XLSX file as dicts keyed by header."""
+    if filename.lower().endswith(".xlsx"):
+        return iter_xlsx_rows(fileobj)
+    if filename.lower().endswith(".csv"):
+        return iter_csv_rows(fileobj)
+    raise ValueError("Unsupported file type, expected .csv or .xlsx")
+
+# Columns validated as text; spreadsheets return numbers for cells such as
+# employee codes and phone numbers
+TEXT_FIELDS = {
+    name for name, field in EmployeeCreate.model_fields.items()
+    if field.annotation is str or str in get_args(field.annotation)
+} | {"manager_employee_id"}
+
+def _text(value):
+    """Spreadsheet number as the text typed into the cell (90001.0 -> "90001")."""
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    return str(value)
+
+def _clean(row: dict) -> dict:
+    """Drop blank cells and normalise spreadsheet values for validation."""
+    cleaned = {}
+    for key, value in row.items():
+        if key is None:
+            continue
+        if isinstance(value, str):
+            value = value.strip()
+        if value in ("", None):
+            continue
+        key = key.strip()
+        if isinstance(value, datetime):
+            value = value.date()
+        elif key in TEXT_FIELDS and isinstance(value, (int, float)) and not isinstance(value, bool):
+            value = _text(value)
+        cleaned[key] = value
+    return cleaned
+
+async def _existing(db, column, values) -> set:
+    if not values:
+        return set()
+    result = await db.execute(select(column).where(column.in_(values)))
+    return set(result.scalars())
+
+class EmployeeImporter:
+    """Validates and inserts employee rows chunk by chunk."""
+
+    def __init__(self, db, chunk_size: Optional[int] = None):
+        self.db = db
+        self.chunk_size = chunk_size or settings.IMPORT_CHUNK_SIZE
+        self.total_rows = 0
+        self.imported = 0
+        self.errors: List[dict] = []
+        # Keys already claimed earlier in this file
+        self._seen_employee_ids: set = set()
+        self._seen_emails: set = set()
+        # employee_id code -> id of employees imported so far, for manager lookups
+        self._imported_codes: Dict[str, UUID] = {}
+
+    async def run(self, rows: Iterator[dict]) -> dict:
+        # Row numbers match the spreadsheet, with the header on row 1
+        numbered = enumerate(rows, start=2)
+        while True:
+            chunk = await run_in_threadpool(lambda: list(islice(numbered, self.chunk_size)))
+            if not chunk:
+                break
+            await self.import_chunk(chunk)
+        return self.report()
+
+    def report(self) -> dict:
+        return {
+            "total_rows": self.total_rows,
+            "imported": self.imported,
+            "failed": len(self.errors),
+            "errors": self.errors,
+        }
+
+    async def import_chunk(self, chunk: List[tuple]) -> None:
+        self.total_rows += len(chunk)
+        candidates = []
+        for row_number, raw in chunk:
+            row = _clean(raw)
+            manager_code = row.pop("manager_employee_id", None)
+            try:
+                employee = EmployeeCreate(**row)
+            except ValidationError as exc:
+                self._reject(row_number, [
+                    f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}"
+                    for error in exc.errors()
+                ])
+                continue
+            candidates.append((row_number, employee, manager_code))
+
+        # One query per constraint for the whole chunk
+        employee_ids = {employee.employee_id for _, employee, _ in candidates}
+        emails = {employee.email for _, employee, _ in candidates}
+        manager_codes = {code for _, _, code in candidates if code}
+        taken_employee_ids = await _existing(self.db, Employee.employee_id, employee_ids)
+        taken_emails = await _existing(self.db, Employee.email, emails)
+        organizations = await _existing(
+            self.db, Organization.id, {employee.organization_id for _, employee, _ in candidates}
+        )
+        departments = await _existing(
+            self.db, Department.id, {e.department_id for _, e, _ in candidates if e.department_id}
+        )
+        positions = await _existing(
+            self.db, Position.id, {e.position_id for _, e, _ in candidates if e.position_id}
+        )
+        managers = await _existing(
+            self.db, Employee.id, {e.manager_id for _, e, _ in candidates if e.manager_id}
+        )
+        manager_ids_by_code = dict(self._imported_codes)
+        if manager_codes - manager_ids_by_code.keys():
+            result = await self.db.execute(
+                select(Employee.employee_id, Employee.id).where(
+                    Employee.employee_id.in_(manager_codes - manager_ids_by_code.keys())
+                )
+            )
+            manager_ids_by_code.update(result.all())
+
+        rows = []
+        for row_number, employee, manager_code in candidates:
+            problems = []
+            if employee.employee_id in taken_employee_ids or employee.employee_id in self._seen_employee_ids:
+                problems.append("employee_id: Employee ID already exists")
+            if employee.email in taken_emails or employee.email in self._seen_emails:
+                problems.append("email: Email already exists")
+            if employee.organization_id not in organizations:
+                problems.append("organization_id: Organization not found")
+            if employee.department_id and employee.department_id not in departments:
+                problems.append("department_id: Department not found")
+            if employee.position_id and employee.position_id not in positions:
+                problems.append("position_id: Position not found")
+            if employee.manager_id and employee.manager_id not in managers:
+                problems.append("manager_id: Manager not found")
+            values = employee.model_dump()
+            if manager_code:
+                if manager_code in manager_ids_by_code:
+                    values["manager_id"] = manager_ids_by_code[manager_code]
+                else:
+                    problems.append("manager_employee_id: Manager not found")
+            if problems:
+                self._reject(row_number, problems)
+                continue
+
+            values["id"] = uuid4()
+            self._seen_employee_ids.add(employee.employee_id)
+            self._seen_emails.add(employee.email)
+            # Later rows in this file may report to this employee
+            manager_ids_by_code[employee.employee_id] = values["id"]
+            rows.append((row_number, values))
+
+        if not rows:
+            return
+        try:
+            await self._insert([values for _, values in rows])
+            inserted = [values for _, values in rows]
+        except IntegrityError:
+            # A concurrent create or import took a key after the checks above;
+            # insert one row at a time to find and report the conflicting rows
+            await self.db.rollback()
+            inserted = []
+            for row_number, values in rows:
+                try:
+                    await self._insert([values])
+                    inserted.append(values)
+                except IntegrityError:
+                    await self.db.rollback()
+                    self._reject(row_number, await self._conflicts(values))
+        self.imported += len(inserted)
+        for values in inserted:
+            self._imported_codes[values["employee_id"]] = values["id"]
+            # Bulk inserts skip ORM events, so keep the search index current here
+            if employee_search_index.loaded:
+                employee_search_index.add(values["id"], tuple(values[field] for field in SEARCH_FIELDS))
+
+    async def _insert(self, rows: List[dict]) -> None:
+        await self.db.execute(insert(Employee), rows)
+        # Bulk inserts skip flush hooks, so extend the reporting tree explicitly
+        await self.db.run_sync(
+            lambda session: add_to_hierarchy(session.connection(), [values["id"] for values in rows])
+        )
+        await self.db.commit()
+
+    async def _conflicts(self, values: dict) -> List[str]:
+        """Explain why a row that passed validation could not be inserted."""
+        problems = []
+        if await _existing(self.db, Employee.employee_id, {values["employee_id"]}):
+            problems.append("employee_id: Employee ID already exists")
+        if await _existing(self.db, Employee.email, {values["email"]}):
+            problems.append("email: Email already exists")
+        if values["manager_id"] and not await _existing(self.db, Employee.id, {values["manager_id"]}):
+            problems.append("manager_id: Manager not found")
+        return problems or ["Conflicts with a concurrent change, retry the row"]
+
+    def _reject(self, row_number: int, problems: List[str]) -> None:
+        self.errors.append({"row": row_number, "errors": problems})
+
+async def import_employees(db, rows: Iterable[dict], chunk_size: Optional[int] = None) -> dict:
+    """Import employee rows, returning a report with row-level errors."""
+    return await EmployeeImporter(db, chunk_size).run(iter(rows))
+
+async def _import_file(path: str, chunk_size: Optional[int]) -> dict:
+    from app.database import open_async_session
+    db = open_async_session()
+    try:
+        with open(path, "rb") as fileobj:
+            return await import_employees(db, iter_import_rows(fileobj, path), chunk_size)
+    finally:
+        await db.close()
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Bulk import employees from a CSV or XLSX file.")
+    parser.add_argument("path", help="CSV or XLSX file with one employee per row")
+    parser.add_argument("--chunk-size", type=int, default=None, help="rows validated and inserted per batch")
+    args = parser.parse_args(argv)
+    report = asyncio.run(_import_file(args.path, args.chunk_size))
+    print(json.dumps(report, indent=2, default=str))
+
+if __name__ == "__main__":
+    main()
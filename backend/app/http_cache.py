@@ -0,0 +1,69 @@
+"""Conditional GET support for rarely changing reference data.
+
+Endpoints compute a weak ETag from a cheap validator query (row count and
+latest updated_at) and answer a matching If-None-Match with 304 before
+loading or serializing anything. Serialized bodies can also be kept in a
+TTLCache that the write handlers clear; other workers notice changes
+within REFERENCE_CACHE_TTL_SECONDS.
+"""
+import hashlib
+from typing import Any, Optional
+from fastapi import Request, Response
+from pydantic import TypeAdapter
+from app.cache import TTLCache
+from app.config import settings
+from app.database import reads_from_primary
+
+# Authenticated data: browsers may store it but must revalidate every time
+CACHE_CONTROL = "private, no-cache"
+
+def weak_etag(*validators: Any) -> str:
+    """Weak ETag over the given validator values (counts, timestamps, ids)."""
+    digest = hashlib.sha1(repr(validators).encode()).hexdigest()[:20]
+    return f'W/"{digest}"'
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Weak comparison of the request's If-None-Match against etag."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == opaque for tag in header.split(","))
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=304, headers={"ETag": etag, "Cache-Control": CACHE_CONTROL})
+
+def json_response(body: bytes, etag: str) -> Response:
+    """Pre-serialized JSON body with its validator headers."""
+    return Response(
+        body,
+        media_type="application/json",
+        headers={"ETag": etag, "Cache-Control": CACHE_CONTROL}
+    )
+
+def serialize(adapter: TypeAdapter, value) -> bytes:
+    """Validate ORM objects with a response schema adapter and dump them to JSON."""
+    return adapter.dump_json(adapter.validate_python(value, from_attributes=True))
+
+# (etag, JSON body) per reference data response
+reference_cache = TTLCache(
+    maxsize=settings.REFERENCE_CACHE_SIZE, ttl=settings.REFERENCE_CACHE_TTL_SECONDS, name="reference"
+)
+
+def cached_reference_response(request: Request, key) -> Optional[Response]:
+    """Answer from the reference cache, or None on a miss.
+
+    Clients reading their own writes bypass it, since another worker's cache
+    may predate the write.
+    """
+    if reads_from_primary(request):
+        return None
+    cached = reference_cache.get(key)
+    if cached is None:
+        return None
+    etag, body = cached
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    return json_response(body, etag)
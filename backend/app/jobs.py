@@ -0,0 +1,326 @@
+"""Background jobs.
+
+Work that outlasts an HTTP request (payroll runs, resume screening) is
+enqueued as a row of the jobs table and run by worker processes started with
+`python worker.py`, away from the uvicorn workers serving interactive
+traffic. The table is the queue: a worker claims the oldest due job with
+SELECT ... FOR UPDATE SKIP LOCKED, so any number of workers share it without
+a broker and never claim the same job twice.
+
+Handlers are registered per job kind with @job_handler and report progress
+through their JobContext, which also serves as the job's heartbeat. A
+failing job is retried with exponential backoff until max_attempts, unless
+it raised PermanentJobError (a retry cannot succeed) and is failed at once; a
+running job whose worker stopped sending heartbeats for
+JOB_LOCK_TIMEOUT_SECONDS is requeued. Each worker runs at most
+JOB_WORKER_CONCURRENCY jobs at once, and a kind registered with
+concurrency=N has at most N running jobs across all workers.
+"""
+import asyncio
+import json
+import logging
+import os
+import socket
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Awaitable, Callable, Dict, Optional
+from uuid import UUID
+from sqlalchemy import func, select, update
+from sqlalchemy.exc import IntegrityError
+from app.config import settings
+from app.database import open_async_session
+from app.models import Job, JobStatus
+
+logger = logging.getLogger(__name__)
+
+# Jobs a unique_key can block
+ACTIVE_STATUSES = (JobStatus.queued, JobStatus.running)
+
+# Minimum time between progress writes of one job
+PROGRESS_INTERVAL_SECONDS = 1.0
+
+class PermanentJobError(Exception):
+    """Raised by a handler for a failure no retry can fix; the job fails without retries."""
+
+@dataclass
+class JobHandler:
+    func: Callable[..., Awaitable[Optional[dict]]]
+    concurrency: Optional[int] = None  # running jobs of this kind across all workers
+
+_handlers: Dict[str, JobHandler] = {}
+
+def job_handler(kind: str, concurrency: Optional[int] = None):
+    """Register `async def handler(db, payload, context) -> Optional[dict]` for a job kind.
+
+    The returned dict is stored as the job's result.
+    """
+    def register(func):
+        _handlers[kind] = JobHandler(func, concurrency)
+        return func
+    return register
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+async def enqueue(
+    db,
+    kind: str,
+    payload: dict,
+    unique_key: Optional[str] = None,
+    created_by: Optional[UUID] = None,
+    max_attempts: Optional[int] = None
+) -> Job:
+    """Add a job to the queue and commit.
+
+    With a unique_key, a queued or running job with the same key is returned
+    instead of adding another one.
+    """
+    active = select(Job).where(Job.unique_key == unique_key, Job.status.in_(ACTIVE_STATUSES)).limit(1)
+    if unique_key:
+        existing = await db.scalar(active)
+        if existing:
+            return existing
+
+    job = Job(
+        kind=kind,
+        payload=json.dumps(payload, default=str),
+        unique_key=unique_key,
+        status=JobStatus.queued,
+        max_attempts=max_attempts or settings.JOB_MAX_ATTEMPTS,
+        run_after=_now(),
+        created_by=created_by,
+    )
+    db.add(job)
+    try:
+        await db.commit()
+    except IntegrityError:
+        # Lost a race for the key (idx_jobs_active_unique_key)
+        await db.rollback()
+        return await db.scalar(active)
+    await db.refresh(job)
+    return job
+
+def job_status(job: Job) -> dict:
+    """A job as returned by the API, with its JSON result decoded."""
+    return {
+        column.key: getattr(job, column.key) for column in Job.__table__.columns
+        if column.key not in ("payload", "result")
+    } | {"result": json.loads(job.result) if job.result else None}
+
+async def _update_job(job_id: UUID, worker_id: str, **values) -> None:
+    """Update a job this worker holds, in a short transaction of its own.
+
+    A job requeued after its lock timed out belongs to whoever claimed it
+    next, so updates from the previous holder are ignored.
+    """
+    db = open_async_session()
+    try:
+        await db.execute(
+            update(Job).where(Job.id == job_id, Job.locked_by == worker_id).values(updated_at=_now(), **values)
+        )
+        await db.commit()
+    finally:
+        await db.close()
+
+class JobContext:
+    """Handed to job handlers: the job's identity and progress reporting."""
+
+    def __init__(self, job_id: UUID, attempt: int, worker_id: str):
+        self.job_id = job_id
+        self.attempt = attempt
+        self.worker_id = worker_id
+        self._last_progress = 0.0
+
+    async def progress(self, done: int, total: int, message: Optional[str] = None) -> None:
+        """Record done/total as the job's progress; writes are throttled except for the last one.
+
+        Written in a transaction of its own, so call it between the handler's
+        commits (SQLite allows only one writer at a time).
+        """
+        now = time.monotonic()
+        if done < total and now - self._last_progress < PROGRESS_INTERVAL_SECONDS:
+            return
+        self._last_progress = now
+        await _update_job(
+            self.job_id,
+            self.worker_id,
+            progress=min(100, 100 * done // total) if total else 100,
+            progress_message=message,
+            locked_at=_now(),
+        )
+
+async def claim_job(db, worker_id: str):
+    """Claim the oldest due job this worker can run.
+
+    Returns its (id, kind, payload, attempts, max_attempts) row, or None.
+    """
+    kinds = set(_handlers)
+    running = await db.execute(
+        select(Job.kind, func.count()).where(Job.status == JobStatus.running).group_by(Job.kind)
+    )
+    for kind, count in running.all():
+        # Checked before claiming, so concurrent claims can overshoot a limit briefly
+        limit = _handlers[kind].concurrency if kind in _handlers else None
+        if limit is not None and count >= limit:
+            kinds.discard(kind)
+    if not kinds:
+        await db.rollback()
+        return None
+
+    now = _now()
+    due = (
+        select(Job.id)
+        .where(Job.status == JobStatus.queued, Job.kind.in_(kinds), Job.run_after <= now)
+        .order_by(Job.run_after)
+        .limit(1)
+        # Rows other workers are claiming are skipped rather than waited on
+        .with_for_update(skip_locked=True)
+        .scalar_subquery()
+    )
+    result = await db.execute(
+        update(Job)
+        .where(Job.id == due, Job.status == JobStatus.queued)
+        .values(
+            status=JobStatus.running,
+            attempts=Job.attempts + 1,
+            locked_by=worker_id,
+            locked_at=now,
+            started_at=func.coalesce(Job.started_at, now),
+            updated_at=now,
+        )
+        .returning(Job.id, Job.kind, Job.payload, Job.attempts, Job.max_attempts)
+    )
+    claimed = result.first()
+    await db.commit()
+    return claimed
+
+async def requeue_stale_jobs(db) -> int:
+    """Requeue running jobs whose worker stopped sending heartbeats; fail those out of attempts."""
+    now = _now()
+    stale = (
+        Job.status == JobStatus.running,
+        Job.locked_at < now - timedelta(seconds=settings.JOB_LOCK_TIMEOUT_SECONDS),
+    )
+    await db.execute(
+        update(Job).where(*stale, Job.attempts >= Job.max_attempts).values(
+            status=JobStatus.failed, error="Worker stopped responding", finished_at=now,
+            locked_by=None, locked_at=None, updated_at=now
+        )
+    )
+    result = await db.execute(
+        update(Job).where(*stale).values(
+            status=JobStatus.queued, run_after=now, locked_by=None, locked_at=None, updated_at=now
+        )
+    )
+    await db.commit()
+    return result.rowcount
+
+class Worker:
+    """Claims and runs jobs until stopped; see worker.py."""
+
+    def __init__(self, concurrency: Optional[int] = None, worker_id: Optional[str] = None):
+        self.concurrency = concurrency or settings.JOB_WORKER_CONCURRENCY
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+        self._running: Dict[UUID, asyncio.Task] = {}
+        self._stopping = False
+        self._wake = asyncio.Event()
+
+    def stop(self) -> None:
+        """Stop claiming jobs; run() returns once the running ones finish."""
+        self._stopping = True
+        self._wake.set()
+
+    async def run(self) -> None:
+        logger.info("Worker %s running %s", self.worker_id, ", ".join(sorted(_handlers)) or "no job kinds")
+        heartbeat = asyncio.create_task(self._heartbeat())
+        try:
+            while not self._stopping:
+                if len(self._running) < self.concurrency and await self._claim():
+                    continue
+                try:
+                    await asyncio.wait_for(self._wake.wait(), settings.JOB_POLL_INTERVAL_SECONDS)
+                except asyncio.TimeoutError:
+                    pass
+                self._wake.clear()
+            if self._running:
+                logger.info("Waiting for %s running jobs", len(self._running))
+                await asyncio.gather(*self._running.values(), return_exceptions=True)
+        finally:
+            heartbeat.cancel()
+
+    async def _claim(self) -> bool:
+        db = open_async_session()
+        try:
+            job = await claim_job(db, self.worker_id)
+        except Exception:
+            logger.exception("Claiming a job failed")
+            return False
+        finally:
+            await db.close()
+        if job is None:
+            return False
+        self._running[job.id] = asyncio.create_task(self._execute(job))
+        return True
+
+    async def _heartbeat(self) -> None:
+        while True:
+            await asyncio.sleep(settings.JOB_LOCK_TIMEOUT_SECONDS / 3)
+            db = open_async_session()
+            try:
+                if self._running:
+                    await db.execute(
+                        update(Job)
+                        .where(Job.id.in_(list(self._running)), Job.locked_by == self.worker_id)
+                        .values(locked_at=_now())
+                    )
+                    await db.commit()
+                if await requeue_stale_jobs(db):
+                    self._wake.set()
+            except Exception:
+                logger.exception("Job heartbeat failed")
+            finally:
+                await db.close()
+
+    async def _execute(self, job) -> None:
+        context = JobContext(job.id, job.attempts, self.worker_id)
+        logger.info("Running %s job %s (attempt %s)", job.kind, job.id, job.attempts)
+        error = None
+        permanent = False
+        db = open_async_session()
+        try:
+            result = await _handlers[job.kind].func(db, json.loads(job.payload), context)
+        except PermanentJobError as exc:
+            logger.error("%s job %s failed permanently: %s", job.kind, job.id, exc)
+            error, permanent = str(exc), True
+        except Exception as exc:
+            logger.exception("%s job %s failed", job.kind, job.id)
+            error = f"{type(exc).__name__}: {exc}"
+        finally:
+            await db.close()
+
+        try:
+            now = _now()
+            released = {"locked_by": None, "locked_at": None}
+            if error is None:
+                await _update_job(
+                    job.id, self.worker_id, status=JobStatus.succeeded, progress=100, progress_message=None, error=None,
+                    result=None if result is None else json.dumps(result, default=str), finished_at=now,
+                    **released
+                )
+            elif job.attempts < job.max_attempts and not permanent:
+                delay = settings.JOB_RETRY_DELAY_SECONDS * 2 ** (job.attempts - 1)
+                await _update_job(
+                    job.id, self.worker_id, status=JobStatus.queued, error=error,
+                    run_after=now + timedelta(seconds=delay), **released
+                )
+            else:
+                await _update_job(
+                    job.id, self.worker_id, status=JobStatus.failed, error=error, finished_at=now, **released
+                )
+        except Exception:
+            # Left running; requeued once its lock times out
+            logger.exception("Recording the outcome of job %s failed", job.id)
+        finally:
+            self._running.pop(job.id, None)
+            self._wake.set()
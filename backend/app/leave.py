@@ -0,0 +1,286 @@
+"""Leave balance ledger.
+
+Every (employee, leave type, year) has one leave_balances row holding the days
+accrued, carried forward, used by approved requests and held by pending ones.
+Request status changes move days between those columns with single-row
+increments in the same transaction, so reading a balance never has to sum
+leave_requests. A request is charged to the year it starts in.
+
+Pending and approved requests of one employee may not overlap. On Postgres
+this is enforced by the leave_requests_no_overlap exclusion constraint, and
+team calendars use the GiST index on the request's daterange.
+
+Accrual and carry-forward are batch jobs that set their column from scratch,
+so both are safe to re-run. Schedule them from the backend directory with:
+    python -m app.leave accrue <organization_id> <year>
+    python -m app.leave carry-forward <organization_id> <from_year>
+"""
+import argparse
+import asyncio
+import json
+from datetime import date
+from decimal import Decimal
+from typing import Iterable, Iterator, List, Optional
+from uuid import UUID, uuid4
+from sqlalchemy import and_, func, literal_column, or_, select, update
+from app.config import settings
+from app.database import engine, upsert
+from app.models import Employee, LeaveBalance, LeaveRequest, LeaveStatus, LeaveType
+
+# Rows per upsert statement, keeping bind parameters under driver limits
+UPSERT_CHUNK_SIZE = 1000
+
+# Balance column holding a request's days while it is in each status
+HELD_IN = {
+    LeaveStatus.pending: "pending_days",
+    LeaveStatus.approved: "used_days",
+}
+
+# Status changes a leave request may go through
+TRANSITIONS = {
+    LeaveStatus.pending: {LeaveStatus.approved, LeaveStatus.rejected, LeaveStatus.cancelled},
+    LeaveStatus.approved: {LeaveStatus.cancelled},
+}
+
+# Statuses whose requests occupy their dates, matching leave_requests_no_overlap (Postgres)
+ACTIVE_STATUSES = (LeaveStatus.pending, LeaveStatus.approved)
+
+def leave_period():
+    """Inclusive daterange of a leave request, identical to the indexed expression."""
+    return func.daterange(LeaveRequest.start_date, LeaveRequest.end_date, literal_column("'[]'"))
+
+def leave_period_overlaps(start_date: date, end_date: date):
+    """Filter for leave requests overlapping [start_date, end_date].
+
+    On Postgres this is a daterange && test served by the GiST index
+    idx_leave_requests_period; elsewhere it falls back to plain date comparisons.
+    """
+    if engine.dialect.name == "postgresql":
+        return leave_period().op("&&")(func.daterange(start_date, end_date, literal_column("'[]'")))
+    return and_(LeaveRequest.start_date <= end_date, LeaveRequest.end_date >= start_date)
+
+def leave_days(start_date: date, end_date: date) -> int:
+    """Working days (Monday to Friday) a leave request uses, counted as payroll counts unpaid leave."""
+    weeks, extra_days = divmod((end_date - start_date).days + 1, 7)
+    return weeks * 5 + sum((start_date.weekday() + offset) % 7 < 5 for offset in range(extra_days))
+
+def accrued_entitlement(
+    max_days_per_year: Optional[int],
+    hire_date: Optional[date],
+    termination_date: Optional[date],
+    year: int,
+    as_of: Optional[date] = None
+) -> Decimal:
+    """Days of a leave type an employee has earned for a year.
+
+    The yearly allowance is prorated by the months employed in the year. In
+    monthly accrual mode only months up to as_of (default today) count.
+    """
+    if not max_days_per_year:
+        return Decimal("0")
+    first_month, last_month = 1, 12
+    if hire_date:
+        if hire_date.year > year:
+            return Decimal("0")
+        if hire_date.year == year:
+            first_month = hire_date.month
+    if termination_date:
+        if termination_date.year < year:
+            return Decimal("0")
+        if termination_date.year == year:
+            last_month = termination_date.month
+    if settings.LEAVE_ACCRUAL_MODE == "monthly":
+        as_of = as_of or date.today()
+        if as_of.year < year:
+            return Decimal("0")
+        if as_of.year == year:
+            last_month = min(last_month, as_of.month)
+    months = max(0, last_month - first_month + 1)
+    return round(Decimal(max_days_per_year) * months / 12, 2)
+
+def available_days_expr():
+    table = LeaveBalance.__table__
+    return (
+        table.c.accrued_days + table.c.carried_forward_days
+        - table.c.used_days - table.c.pending_days
+    )
+
+async def ensure_balance(db, employee: Employee, leave_type: LeaveType, year: int) -> None:
+    """Create the balance row for a year on first use, seeded with its accrual."""
+    stmt = upsert(LeaveBalance.__table__).values(
+        id=uuid4(),
+        employee_id=employee.id,
+        leave_type_id=leave_type.id,
+        year=year,
+        accrued_days=accrued_entitlement(
+            leave_type.max_days_per_year, employee.hire_date, employee.termination_date, year
+        ),
+    )
+    await db.execute(stmt.on_conflict_do_nothing(
+        index_elements=["employee_id", "leave_type_id", "year"]
+    ))
+
+async def adjust_balance(
+    db,
+    employee_id: UUID,
+    leave_type_id: UUID,
+    year: int,
+    deltas: dict,
+    require_available: Optional[Decimal] = None
+) -> bool:
+    """Apply day deltas to one balance row in place.
+
+    With require_available the update only happens if at least that many days
+    are still available, checked in the same statement so concurrent requests
+    cannot overdraw the balance. Returns whether the row was updated.
+    """
+    table = LeaveBalance.__table__
+    stmt = update(table).where(
+        table.c.employee_id == employee_id,
+        table.c.leave_type_id == leave_type_id,
+        table.c.year == year
+    ).values(
+        **{column: table.c[column] + delta for column, delta in deltas.items()},
+        updated_at=func.now()
+    )
+    if require_available is not None:
+        stmt = stmt.where(available_days_expr() >= require_available)
+    result = await db.execute(stmt)
+    return result.rowcount == 1
+
+def transition_deltas(days, old_status: Optional[LeaveStatus], new_status: LeaveStatus) -> dict:
+    """Balance column changes for a request moving from old_status to new_status."""
+    deltas = {}
+    if old_status in HELD_IN:
+        deltas[HELD_IN[old_status]] = -days
+    if new_status in HELD_IN:
+        deltas[HELD_IN[new_status]] = deltas.get(HELD_IN[new_status], 0) + days
+    return deltas
+
+def _upsert_balances(rows: List[dict], column: str):
+    table = LeaveBalance.__table__
+    stmt = upsert(table).values(rows)
+    return stmt.on_conflict_do_update(
+        index_elements=[table.c.employee_id, table.c.leave_type_id, table.c.year],
+        set_={column: stmt.excluded[column], "updated_at": func.now()}
+    )
+
+async def _write_balances(db, rows: Iterable[dict], column: str) -> int:
+    written = 0
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) == UPSERT_CHUNK_SIZE:
+            await db.execute(_upsert_balances(batch, column))
+            await db.commit()
+            written += len(batch)
+            batch = []
+    if batch:
+        await db.execute(_upsert_balances(batch, column))
+        await db.commit()
+        written += len(batch)
+    return written
+
+async def accrue_leave(db, organization_id: UUID, year: int, as_of: Optional[date] = None) -> dict:
+    """Set accrued_days on every balance of an organization for a year.
+
+    Covers each employee working during the year and each active leave type
+    with a yearly allowance, creating missing balance rows.
+    """
+    employee_result = await db.execute(
+        select(Employee.id, Employee.hire_date, Employee.termination_date).where(
+            Employee.organization_id == organization_id,
+            Employee.hire_date <= date(year, 12, 31),
+            or_(Employee.termination_date.is_(None), Employee.termination_date >= date(year, 1, 1))
+        )
+    )
+    employees = employee_result.all()
+    type_result = await db.execute(
+        select(LeaveType.id, LeaveType.max_days_per_year).where(
+            LeaveType.organization_id == organization_id,
+            LeaveType.is_active.is_(True),
+            LeaveType.max_days_per_year.is_not(None)
+        )
+    )
+    leave_types = type_result.all()
+
+    def rows() -> Iterator[dict]:
+        for employee_id, hire_date, termination_date in employees:
+            for leave_type_id, max_days in leave_types:
+                yield {
+                    "id": uuid4(),
+                    "employee_id": employee_id,
+                    "leave_type_id": leave_type_id,
+                    "year": year,
+                    "accrued_days": accrued_entitlement(max_days, hire_date, termination_date, year, as_of),
+                }
+
+    written = await _write_balances(db, rows(), "accrued_days")
+    return {"organization_id": organization_id, "year": year, "balances": written}
+
+async def carry_forward_leave(
+    db,
+    organization_id: UUID,
+    from_year: int,
+    max_days: Optional[float] = None
+) -> dict:
+    """Carry each balance's unused days of from_year into the next year.
+
+    Days still held by pending requests are not carried. Carried days are
+    capped per leave type at max_days (default LEAVE_CARRY_FORWARD_MAX_DAYS).
+    """
+    cap = Decimal(str(settings.LEAVE_CARRY_FORWARD_MAX_DAYS if max_days is None else max_days))
+    to_year = from_year + 1
+    result = await db.execute(
+        select(
+            LeaveBalance.employee_id,
+            LeaveBalance.leave_type_id,
+            available_days_expr().label("available_days"),
+            Employee.hire_date,
+            Employee.termination_date,
+            LeaveType.max_days_per_year
+        )
+        .join(Employee, Employee.id == LeaveBalance.employee_id)
+        .join(LeaveType, LeaveType.id == LeaveBalance.leave_type_id)
+        .where(
+            Employee.organization_id == organization_id,
+            LeaveBalance.year == from_year
+        )
+    )
+    balances = result.all()
+
+    def rows() -> Iterator[dict]:
+        for employee_id, leave_type_id, available, hire_date, termination_date, allowance in balances:
+            yield {
+                "id": uuid4(),
+                "employee_id": employee_id,
+                "leave_type_id": leave_type_id,
+                "year": to_year,
+                # Only used when the next year's row does not exist yet
+                "accrued_days": accrued_entitlement(allowance, hire_date, termination_date, to_year),
+                "carried_forward_days": min(max(Decimal(available or 0), Decimal("0")), cap),
+            }
+
+    written = await _write_balances(db, rows(), "carried_forward_days")
+    return {"organization_id": organization_id, "year": to_year, "balances": written}
+
+async def _run_job(args) -> dict:
+    from app.database import open_async_session
+    db = open_async_session()
+    try:
+        if args.command == "accrue":
+            return await accrue_leave(db, args.organization_id, args.year)
+        return await carry_forward_leave(db, args.organization_id, args.year)
+    finally:
+        await db.close()
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Run leave balance batch jobs.")
+    parser.add_argument("command", choices=["accrue", "carry-forward"])
+    parser.add_argument("organization_id", type=UUID)
+    parser.add_argument("year", type=int, help="year to accrue, or the year to carry forward from")
+    report = asyncio.run(_run_job(parser.parse_args(argv)))
+    print(json.dumps(report, indent=2, default=str))
+
+if __name__ == "__main__":
+    main()
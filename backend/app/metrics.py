@@ -0,0 +1,283 @@
+"""Prometheus metrics for request latency, database work and pool usage.
+
+MetricsMiddleware times every HTTP request by route template and tracks
+in-flight requests. Engine events attribute each SQL statement's count and
+duration to the request that issued it, and timed pool classes record how
+long a connection checkout waited. Named in-process caches report their
+size, hits and misses. Everything is served in the Prometheus text format
+at /metrics.
+
+When PROMETHEUS_MULTIPROC_DIR is set (several server workers), /metrics
+aggregates the per-process files written by prometheus_client.
+"""
+import os
+import threading
+import time
+from contextvars import ContextVar
+from typing import Dict, Optional
+from fastapi import Response
+from prometheus_client import (
+    CONTENT_TYPE_LATEST, CollectorRegistry, Counter, Gauge, Histogram, REGISTRY, generate_latest
+)
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+from sqlalchemy import event, exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+from app.cache import caches
+
+REQUEST_LATENCY = Histogram(
+    "hrms_http_request_duration_seconds",
+    "HTTP request latency by route template",
+    ["method", "route", "status"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+)
+REQUESTS_IN_FLIGHT = Gauge(
+    "hrms_http_requests_in_flight",
+    "HTTP requests currently being served",
+    ["method"],
+    multiprocess_mode="livesum"
+)
+DB_QUERIES_PER_REQUEST = Histogram(
+    "hrms_db_queries_per_request",
+    "SQL statements issued per HTTP request",
+    ["method", "route"],
+    buckets=(0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 89)
+)
+DB_TIME_PER_REQUEST = Histogram(
+    "hrms_db_time_per_request_seconds",
+    "Time spent executing SQL per HTTP request",
+    ["method", "route"],
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5)
+)
+DB_STATEMENT_DURATION = Histogram(
+    "hrms_db_statement_duration_seconds",
+    "SQL statement execution time",
+    ["engine"],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5)
+)
+POOL_CHECKOUT_WAIT = Histogram(
+    "hrms_db_pool_checkout_seconds",
+    "Time to check a connection out of the pool, including waiting for a free one",
+    ["engine"],
+    buckets=(0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 5, 30)
+)
+POOL_CHECKOUT_TIMEOUTS = Counter(
+    "hrms_db_pool_checkout_timeouts_total",
+    "Checkouts that gave up after pool_timeout with no free connection",
+    ["engine"]
+)
+
+# Route label for requests that matched no route, keeping label cardinality bounded
+UNMATCHED_ROUTE = "unmatched"
+
+class RequestDBStats:
+    __slots__ = ("queries", "seconds")
+
+    def __init__(self):
+        self.queries = 0
+        self.seconds = 0.0
+
+_request_db_stats: ContextVar[Optional[RequestDBStats]] = ContextVar("request_db_stats", default=None)
+
+class _CheckoutTimer:
+    """Pool mixin recording checkout time under the pool's `metrics_name`.
+
+    Also keeps running totals for /health: callers currently waiting for a
+    connection, checkouts, timeouts, and total and worst checkout time.
+    """
+    metrics_name = "primary"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._stats_lock = threading.Lock()
+        self.waiting = 0
+        self.checkouts = 0
+        self.timeouts = 0
+        self.checkout_seconds_total = 0.0
+        self.checkout_seconds_max = 0.0
+
+    def _do_get(self):
+        with self._stats_lock:
+            self.waiting += 1
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            POOL_CHECKOUT_TIMEOUTS.labels(self.metrics_name).inc()
+            with self._stats_lock:
+                self.timeouts += 1
+            raise
+        finally:
+            elapsed = time.perf_counter() - start
+            POOL_CHECKOUT_WAIT.labels(self.metrics_name).observe(elapsed)
+            with self._stats_lock:
+                self.waiting -= 1
+                self.checkouts += 1
+                self.checkout_seconds_total += elapsed
+                self.checkout_seconds_max = max(self.checkout_seconds_max, elapsed)
+
+    def recreate(self):
+        pool = super().recreate()
+        pool.metrics_name = self.metrics_name
+        return pool
+
+class TimedQueuePool(_CheckoutTimer, QueuePool):
+    pass
+
+class TimedAsyncAdaptedQueuePool(_CheckoutTimer, AsyncAdaptedQueuePool):
+    pass
+
+# Engines whose pools are reported as gauges, by metrics name
+_engines: Dict[str, object] = {}
+
+def instrument_engine(engine, name: str = "primary") -> None:
+    """Record statement counts and timings for a sync Engine (use .sync_engine for async)."""
+    _engines[name] = engine
+    if isinstance(engine.pool, _CheckoutTimer):
+        engine.pool.metrics_name = name
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _start_timer(conn, cursor, statement, parameters, context, executemany) -> None:
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _stop_timer(conn, cursor, statement, parameters, context, executemany) -> None:
+        elapsed = time.perf_counter() - conn.info["query_start"].pop()
+        DB_STATEMENT_DURATION.labels(name).observe(elapsed)
+        stats = _request_db_stats.get()
+        if stats is not None:
+            stats.queries += 1
+            stats.seconds += elapsed
+
+    @event.listens_for(engine, "handle_error")
+    def _drop_timer(exception_context) -> None:
+        starts = exception_context.connection.info.get("query_start") if exception_context.connection else None
+        if starts:
+            starts.pop()
+
+def pool_status() -> Dict[str, dict]:
+    """Size, usage and checkout wait of each instrumented connection pool."""
+    status = {}
+    for name, engine in _engines.items():
+        pool = engine.pool
+        if not isinstance(pool, QueuePool):
+            status[name] = {"pool": type(pool).__name__}
+            continue
+        checked_out = pool.checkedout()
+        capacity = pool.size() + max(pool._max_overflow, 0)
+        entry = {
+            "pool": type(pool).__name__,
+            "size": pool.size(),
+            "max_overflow": pool._max_overflow,
+            "checked_out": checked_out,
+            "idle": pool.checkedin(),
+            "overflow": max(pool.overflow(), 0),
+            "saturated": pool._max_overflow >= 0 and checked_out >= capacity,
+        }
+        if isinstance(pool, _CheckoutTimer):
+            entry.update(
+                waiting=pool.waiting,
+                checkouts=pool.checkouts,
+                timeouts=pool.timeouts,
+                avg_checkout_ms=round(1000 * pool.checkout_seconds_total / pool.checkouts, 3) if pool.checkouts else 0.0,
+                max_checkout_ms=round(1000 * pool.checkout_seconds_max, 3),
+            )
+        status[name] = entry
+    return status
+
+class PoolCollector:
+    """Reports checked-out, idle, overflow and waiting counts for each instrumented pool."""
+
+    def collect(self):
+        checked_out = GaugeMetricFamily(
+            "hrms_db_pool_checked_out", "Connections currently checked out", labels=["engine"]
+        )
+        idle = GaugeMetricFamily(
+            "hrms_db_pool_idle", "Idle connections held by the pool", labels=["engine"]
+        )
+        overflow = GaugeMetricFamily(
+            "hrms_db_pool_overflow", "Connections open beyond pool_size", labels=["engine"]
+        )
+        waiting = GaugeMetricFamily(
+            "hrms_db_pool_waiting", "Callers waiting for a free connection", labels=["engine"]
+        )
+        for name, status in pool_status().items():
+            if "checked_out" not in status:
+                continue
+            checked_out.add_metric([name], status["checked_out"])
+            idle.add_metric([name], status["idle"])
+            overflow.add_metric([name], status["overflow"])
+            if "waiting" in status:
+                waiting.add_metric([name], status["waiting"])
+        yield checked_out
+        yield idle
+        yield overflow
+        yield waiting
+
+REGISTRY.register(PoolCollector())
+
+class CacheCollector:
+    """Reports size, hits and misses of each named TTLCache in this process."""
+
+    def collect(self):
+        size = GaugeMetricFamily("hrms_cache_entries", "Entries held by the cache", labels=["cache"])
+        hits = CounterMetricFamily("hrms_cache_hits", "Cache lookups answered from the cache", labels=["cache"])
+        misses = CounterMetricFamily(
+            "hrms_cache_misses", "Cache lookups that found no live entry", labels=["cache"]
+        )
+        for name, cache in caches.items():
+            stats = cache.stats()
+            size.add_metric([name], stats["size"])
+            hits.add_metric([name], stats["hits"])
+            misses.add_metric([name], stats["misses"])
+        yield size
+        yield hits
+        yield misses
+
+REGISTRY.register(CacheCollector())
+
+class MetricsMiddleware:
+    """ASGI middleware timing each request end to end, response body included."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status_code = 500
+        stats = RequestDBStats()
+        token = _request_db_stats.set(stats)
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        REQUESTS_IN_FLIGHT.labels(method).inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - start
+            REQUESTS_IN_FLIGHT.labels(method).dec()
+            _request_db_stats.reset(token)
+            # The router stores the matched route in the scope
+            route = getattr(scope.get("route"), "path", UNMATCHED_ROUTE)
+            REQUEST_LATENCY.labels(method, route, str(status_code)).observe(elapsed)
+            DB_QUERIES_PER_REQUEST.labels(method, route).observe(stats.queries)
+            DB_TIME_PER_REQUEST.labels(method, route).observe(stats.seconds)
+
+def metrics_response() -> Response:
+    """Render all metrics in the Prometheus text exposition format."""
+    registry = REGISTRY
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import multiprocess
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        registry.register(PoolCollector())
+        registry.register(CacheCollector())
+    return Response(generate_latest(registry), headers={"Content-Type": CONTENT_TYPE_LATEST})
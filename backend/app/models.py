@@ -1,5 +1,5 @@
-from sqlalchemy import Column, String, DateTime, Boolean, Text, Integer, Decimal, Date, ForeignKey, Enum as SQLEnum
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Column, String, DateTime, Boolean, Text, Integer, Numeric, Date, ForeignKey, Index, JSON, UniqueConstraint, Enum as SQLEnum, Uuid, text
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 import uuid
@@ -77,11 +77,17 @@ class PriorityLevel(enum.Enum):
     high = "high"
     critical = "critical"
 
+class JobStatus(enum.Enum):
+    queued = "queued"
+    running = "running"
+    succeeded = "succeeded"
+    failed = "failed"
+
 # Models
 class Organization(Base):
     __tablename__ = "organizations"
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(Uuid(as_uuid=True), primary_key=True, default=uuid.uuid4)
     name = Column(String(255), nullable=False)
     description = Column(Text)
     address = Column(Text)
@@ -99,30 +105,36 @@ class Organization(Base):
 class Department(Base):
     __tablename__ = "departments"
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    organization_id = Column(UUID(as_uuid=True), ForeignKey("organizations.id", ondelete="CASCADE"))
+    id = Column(Uuid(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    organization_id = Column(Uuid(as_uuid=True), ForeignKey("organizations.id", ondelete="CASCADE"))
     name = Column(String(255), nullable=False)
     description = Column(Text)
-    manager_id = Column(UUID(as_uuid=True), ForeignKey("employees.id", ondelete="SET NULL"))
-    budget = Column(Decimal(15, 2))
+    manager_id = Column(
+        Uuid(as_uuid=True),
+        # Added after the employees table exists
+        ForeignKey("employees.id", ondelete="SET NULL", use_alter=True, name="fk_departments_manager")
+    )
+    budget = Column(Numeric(15, 2))
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
 
     # Relationships
     organization = relationship("Organization", back_populates="departments")
-    employees = relationship("Employee", back_populates="department")
+    employees = relationship("Employee", back_populates="department", foreign_keys="Employee.department_id")
     manager = relationship("Employee", foreign_keys=[manager_id])
 
+    __table_args__ = (Index("idx_departments_organization_id", "organization_id"),)
+
 class Position(Base):
     __tablename__ = "positions"
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    department_id = Column(UUID(as_uuid=True), ForeignKey("departments.id", ondelete="CASCADE"))
+    id = Column(Uuid(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    department_id = Column(Uuid(as_uuid=True), ForeignKey("departments.id", ondelete="CASCADE"))
     title = Column(String(255), nullable=False)
     description = Column(Text)
     requirements = Column(Text)
-    min_salary = Column(Decimal(12, 2))
-    max_salary = Column(Decimal(12, 2))
+    min_salary = Column(Numeric(12, 2))
+    max_salary = Column(Numeric(12, 2))
     is_active = Column(Boolean, default=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
@@ -131,15 +143,17 @@ class Position(Base):
     department = relationship("Department")
     employees = relationship("Employee", back_populates="position")
 
+    __table_args__ = (Index("idx_positions_department_id", "department_id"),)
+
 class Employee(Base):
     __tablename__ = "employees"
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(Uuid(as_uuid=True), primary_key=True, default=uuid.uuid4)
     employee_id = Column(String(50), unique=True, nullable=False)
-    organization_id = Column(UUID(as_uuid=True), ForeignKey("organizations.id", ondelete="CASCADE"))
-    department_id = Column(UUID(as_uuid=True), ForeignKey("departments.id", ondelete="SET NULL"))
-    position_id = Column(UUID(as_uuid=True), ForeignKey("positions.id", ondelete="SET NULL"))
-    manager_id = Column(UUID(as_uuid=True), ForeignKey("employees.id", ondelete="SET NULL"))
+    organization_id = Column(Uuid(as_uuid=True), ForeignKey("organizations.id", ondelete="CASCADE"))
+    department_id = Column(Uuid(as_uuid=True), ForeignKey("departments.id", ondelete="SET NULL"))
+    position_id = Column(Uuid(as_uuid=True), ForeignKey("positions.id", ondelete="SET NULL"))
+    manager_id = Column(Uuid(as_uuid=True), ForeignKey("employees.id", ondelete="SET NULL"))
     
     # Personal Information
     first_name = Column(String(100), nullable=False)
@@ -147,8 +161,8 @@ class Employee(Base):
     email = Column(String(255), unique=True, nullable=False)
     phone = Column(String(20))
     date_of_birth = Column(Date)
-    gender = Column(SQLEnum(Gender))
-    marital_status = Column(SQLEnum(MaritalStatus))
+    gender = Column(SQLEnum(Gender, name="gender_type"))
+    marital_status = Column(SQLEnum(MaritalStatus, name="marital_status"))
     nationality = Column(String(100))
     
     # Address Information
@@ -160,10 +174,11 @@ class Employee(Base):
     
     # Employment Information
     hire_date = Column(Date, nullable=False)
-    employment_type = Column(SQLEnum(EmploymentType), nullable=False)
-    employment_status = Column(SQLEnum(EmploymentStatus), default=EmploymentStatus.active)
+    employment_type = Column(SQLEnum(EmploymentType, name="employment_type"), nullable=False)
+    employment_status = Column(SQLEnum(EmploymentStatus, name="employment_status"), default=EmploymentStatus.active)
     termination_date = Column(Date)
     termination_reason = Column(Text)
+    base_salary = Column(Numeric(12, 2))  # annual; payroll falls back to the position minimum
     
     # Emergency Contact
     emergency_contact_name = Column(String(200))
@@ -179,16 +194,37 @@ class Employee(Base):
 
     # Relationships
     organization = relationship("Organization", back_populates="employees")
-    department = relationship("Department", back_populates="employees")
+    department = relationship("Department", back_populates="employees", foreign_keys=[department_id])
     position = relationship("Position", back_populates="employees")
     manager = relationship("Employee", remote_side=[id])
     user = relationship("User", back_populates="employee", uselist=False)
 
+    # employee_id and email are indexed by their unique constraints. The
+    # trigram search index (Postgres only) is created by the migrations and
+    # must match app.search.employee_search_document()
+    __table_args__ = (
+        Index("idx_employees_organization_id", "organization_id"),
+        Index("idx_employees_department_id", "department_id"),
+        Index("idx_employees_manager_id", "manager_id"),
+        Index("idx_employees_employment_status", "employment_status"),
+        Index("idx_employees_last_name_id", "last_name", "id"),
+    )
+
+# Closure table of the reporting tree: one row per (manager, report) pair at any depth
+class EmployeeHierarchy(Base):
+    __tablename__ = "employee_hierarchy"
+    
+    ancestor_id = Column(Uuid(as_uuid=True), ForeignKey("employees.id", ondelete="CASCADE"), primary_key=True)
+    descendant_id = Column(Uuid(as_uuid=True), ForeignKey("employees.id", ondelete="CASCADE"), primary_key=True)
+    depth = Column(Integer, nullable=False)
+
+    __table_args__ = (Index("idx_employee_hierarchy_descendant_id", "descendant_id"),)
+
 class User(Base):
     __tablename__ = "users"
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    employee_id = Column(UUID(as_uuid=True), ForeignKey("employees.id", ondelete="CASCADE"))
+    id = Column(Uuid(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    employee_id = Column(Uuid(as_uuid=True), ForeignKey("employees.id", ondelete="CASCADE"))
     username = Column(String(100), unique=True, nullable=False)
     email = Column(String(255), unique=True, nullable=False)
     password_hash = Column(String(255), nullable=False)
@@ -200,27 +236,87 @@ class User(Base):
     # Relationships
     employee = relationship("Employee", back_populates="user")
 
+    __table_args__ = (Index("idx_users_employee_id", "employee_id"),)
+
 class Role(Base):
     __tablename__ = "roles"
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(Uuid(as_uuid=True), primary_key=True, default=uuid.uuid4)
     name = Column(String(100), unique=True, nullable=False)
     description = Column(Text)
-    permissions = Column(Text)  # JSON stored as text
+    permissions = Column(JSON().with_variant(JSONB(), "postgresql"))
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+class UserRole(Base):
+    __tablename__ = "user_roles"
+    
+    id = Column(Uuid(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    user_id = Column(Uuid(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"))
+    role_id = Column(Uuid(as_uuid=True), ForeignKey("roles.id", ondelete="CASCADE"))
+    assigned_at = Column(DateTime(timezone=True), server_default=func.now())
+    assigned_by = Column(Uuid(as_uuid=True), ForeignKey("users.id", ondelete="SET NULL"))
+
+    # Relationships
+    user = relationship("User", foreign_keys=[user_id])
+    role = relationship("Role")
+
+    __table_args__ = (UniqueConstraint("user_id", "role_id"),)
+
+class Payroll(Base):
+    __tablename__ = "payroll"
+    
+    id = Column(Uuid(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    employee_id = Column(Uuid(as_uuid=True), ForeignKey("employees.id", ondelete="CASCADE"))
+    pay_period_start = Column(Date, nullable=False)
+    pay_period_end = Column(Date, nullable=False)
+    
+    # Salary Components
+    basic_salary = Column(Numeric(12, 2), nullable=False)
+    allowances = Column(Numeric(12, 2), default=0)
+    overtime_pay = Column(Numeric(12, 2), default=0)
+    bonus = Column(Numeric(12, 2), default=0)
+    gross_pay = Column(Numeric(12, 2), nullable=False)
+    
+    # Deductions
+    tax_deduction = Column(Numeric(12, 2), default=0)
+    insurance_deduction = Column(Numeric(12, 2), default=0)
+    retirement_deduction = Column(Numeric(12, 2), default=0)
+    other_deductions = Column(Numeric(12, 2), default=0)
+    total_deductions = Column(Numeric(12, 2), nullable=False)
+    
+    # Net Pay
+    net_pay = Column(Numeric(12, 2), nullable=False)
+    
+    # Status
+    is_processed = Column(Boolean, default=False)
+    processed_at = Column(DateTime(timezone=True))
+    processed_by = Column(Uuid(as_uuid=True), ForeignKey("users.id", ondelete="SET NULL"))
+    
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
 
+    # Relationships
+    employee = relationship("Employee")
+
+    __table_args__ = (
+        UniqueConstraint("employee_id", "pay_period_start", "pay_period_end"),
+        Index("idx_payroll_pay_period", "pay_period_start", "pay_period_end"),
+    )
+
+# Partitioned by month on Postgres, with primary key (id, date); see the initial
+# migration and app/attendance_partitions.py
 class Attendance(Base):
     __tablename__ = "attendance"
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    employee_id = Column(UUID(as_uuid=True), ForeignKey("employees.id", ondelete="CASCADE"))
+    id = Column(Uuid(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    employee_id = Column(Uuid(as_uuid=True), ForeignKey("employees.id", ondelete="CASCADE"))
     date = Column(Date, nullable=False)
     check_in_time = Column(DateTime(timezone=True))
     check_out_time = Column(DateTime(timezone=True))
     break_duration = Column(Integer, default=0)  # in minutes
-    total_hours = Column(Decimal(4, 2))
-    status = Column(SQLEnum(AttendanceStatus), nullable=False)
+    total_hours = Column(Numeric(4, 2))
+    status = Column(SQLEnum(AttendanceStatus, name="attendance_status"), nullable=False)
     notes = Column(Text)
     location_check_in = Column(String(255))
     location_check_out = Column(String(255))
@@ -230,11 +326,36 @@ class Attendance(Base):
     # Relationships
     employee = relationship("Employee")
 
+    # Lookups by employee (and date) use the unique index; no separate
+    # employee index to maintain on every insert
+    __table_args__ = (
+        UniqueConstraint("employee_id", "date"),
+        Index("idx_attendance_date_id", "date", "id"),
+    )
+
+# Monthly attendance totals per employee, maintained incrementally (see app/attendance_rollups.py)
+class AttendanceRollup(Base):
+    __tablename__ = "attendance_rollups"
+    
+    employee_id = Column(Uuid(as_uuid=True), ForeignKey("employees.id", ondelete="CASCADE"), primary_key=True)
+    month = Column(Date, primary_key=True)  # first day of the month
+    days_recorded = Column(Integer, nullable=False, default=0)
+    present_days = Column(Integer, nullable=False, default=0)
+    late_days = Column(Integer, nullable=False, default=0)
+    absent_days = Column(Integer, nullable=False, default=0)
+    half_days = Column(Integer, nullable=False, default=0)
+    remote_days = Column(Integer, nullable=False, default=0)
+    total_hours = Column(Numeric(7, 2), nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    # Summaries by month across employees; per-employee lookups use the primary key
+    __table_args__ = (Index("idx_attendance_rollups_month", "month"),)
+
 class LeaveType(Base):
     __tablename__ = "leave_types"
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    organization_id = Column(UUID(as_uuid=True), ForeignKey("organizations.id", ondelete="CASCADE"))
+    id = Column(Uuid(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    organization_id = Column(Uuid(as_uuid=True), ForeignKey("organizations.id", ondelete="CASCADE"))
     name = Column(String(100), nullable=False)
     description = Column(Text)
     max_days_per_year = Column(Integer)
@@ -248,18 +369,20 @@ class LeaveType(Base):
     # Relationships
     organization = relationship("Organization")
 
+    __table_args__ = (Index("idx_leave_types_organization_id", "organization_id"),)
+
 class LeaveRequest(Base):
     __tablename__ = "leave_requests"
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    employee_id = Column(UUID(as_uuid=True), ForeignKey("employees.id", ondelete="CASCADE"))
-    leave_type_id = Column(UUID(as_uuid=True), ForeignKey("leave_types.id", ondelete="RESTRICT"))
+    id = Column(Uuid(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    employee_id = Column(Uuid(as_uuid=True), ForeignKey("employees.id", ondelete="CASCADE"))
+    leave_type_id = Column(Uuid(as_uuid=True), ForeignKey("leave_types.id", ondelete="RESTRICT"))
     start_date = Column(Date, nullable=False)
     end_date = Column(Date, nullable=False)
     total_days = Column(Integer, nullable=False)
     reason = Column(Text, nullable=False)
-    status = Column(SQLEnum(LeaveStatus), default=LeaveStatus.pending)
-    approved_by = Column(UUID(as_uuid=True), ForeignKey("employees.id", ondelete="SET NULL"))
+    status = Column(SQLEnum(LeaveStatus, name="leave_status"), default=LeaveStatus.pending)
+    approved_by = Column(Uuid(as_uuid=True), ForeignKey("employees.id", ondelete="SET NULL"))
     approved_at = Column(DateTime(timezone=True))
     rejection_reason = Column(Text)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -270,23 +393,54 @@ class LeaveRequest(Base):
     leave_type = relationship("LeaveType")
     approver = relationship("Employee", foreign_keys=[approved_by])
 
+    # The no-overlap exclusion constraint and the GiST index on the period
+    # (Postgres only) are created by the migrations; see app/leave.py
+    __table_args__ = (
+        Index("idx_leave_requests_employee_id", "employee_id"),
+        Index("idx_leave_requests_status", "status"),
+    )
+
+class LeaveBalance(Base):
+    __tablename__ = "leave_balances"
+    
+    id = Column(Uuid(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    employee_id = Column(Uuid(as_uuid=True), ForeignKey("employees.id", ondelete="CASCADE"), nullable=False)
+    leave_type_id = Column(Uuid(as_uuid=True), ForeignKey("leave_types.id", ondelete="CASCADE"), nullable=False)
+    year = Column(Integer, nullable=False)
+    accrued_days = Column(Numeric(6, 2), nullable=False, default=0)
+    carried_forward_days = Column(Numeric(6, 2), nullable=False, default=0)
+    used_days = Column(Numeric(6, 2), nullable=False, default=0)
+    pending_days = Column(Numeric(6, 2), nullable=False, default=0)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    # Relationships
+    employee = relationship("Employee")
+    leave_type = relationship("LeaveType")
+
+    __table_args__ = (UniqueConstraint("employee_id", "leave_type_id", "year"),)
+
+    @property
+    def available_days(self):
+        return self.accrued_days + self.carried_forward_days - self.used_days - self.pending_days
+
 class JobPosting(Base):
     __tablename__ = "job_postings"
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    organization_id = Column(UUID(as_uuid=True), ForeignKey("organizations.id", ondelete="CASCADE"))
-    position_id = Column(UUID(as_uuid=True), ForeignKey("positions.id", ondelete="CASCADE"))
+    id = Column(Uuid(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    organization_id = Column(Uuid(as_uuid=True), ForeignKey("organizations.id", ondelete="CASCADE"))
+    position_id = Column(Uuid(as_uuid=True), ForeignKey("positions.id", ondelete="CASCADE"))
     title = Column(String(255), nullable=False)
     description = Column(Text, nullable=False)
     requirements = Column(Text)
     location = Column(String(255))
-    employment_type = Column(SQLEnum(EmploymentType), nullable=False)
-    salary_min = Column(Decimal(12, 2))
-    salary_max = Column(Decimal(12, 2))
+    employment_type = Column(SQLEnum(EmploymentType, name="employment_type"), nullable=False)
+    salary_min = Column(Numeric(12, 2))
+    salary_max = Column(Numeric(12, 2))
     is_active = Column(Boolean, default=True)
     posted_date = Column(Date, server_default=func.current_date())
     closing_date = Column(Date)
-    posted_by = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="SET NULL"))
+    posted_by = Column(Uuid(as_uuid=True), ForeignKey("users.id", ondelete="SET NULL"))
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
 
@@ -294,11 +448,13 @@ class JobPosting(Base):
     organization = relationship("Organization")
     position = relationship("Position")
 
+    __table_args__ = (Index("idx_job_postings_organization_id", "organization_id"),)
+
 class JobApplication(Base):
     __tablename__ = "job_applications"
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    job_posting_id = Column(UUID(as_uuid=True), ForeignKey("job_postings.id", ondelete="CASCADE"))
+    id = Column(Uuid(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    job_posting_id = Column(Uuid(as_uuid=True), ForeignKey("job_postings.id", ondelete="CASCADE"))
     
     # Applicant Information
     first_name = Column(String(100), nullable=False)
@@ -309,16 +465,16 @@ class JobApplication(Base):
     cover_letter = Column(Text)
     
     # Application Status
-    status = Column(SQLEnum(RecruitmentStatus), default=RecruitmentStatus.applied)
+    status = Column(SQLEnum(RecruitmentStatus, name="recruitment_status"), default=RecruitmentStatus.applied)
     applied_date = Column(Date, server_default=func.current_date())
     
     # AI Screening Results
-    ai_screening_score = Column(Decimal(5, 2))
+    ai_screening_score = Column(Numeric(5, 2))
     ai_screening_notes = Column(Text)
     ai_screening_date = Column(DateTime(timezone=True))
     
     # Additional Info
-    expected_salary = Column(Decimal(12, 2))
+    expected_salary = Column(Numeric(12, 2))
     available_start_date = Column(Date)
     notes = Column(Text)
     
@@ -328,21 +484,63 @@ class JobApplication(Base):
     # Relationships
     job_posting = relationship("JobPosting")
 
+    __table_args__ = (
+        Index("idx_job_applications_job_posting_id", "job_posting_id"),
+        Index("idx_job_applications_status", "status"),
+        Index("idx_job_applications_email", "email"),
+    )
+
+class Interview(Base):
+    __tablename__ = "interviews"
+    
+    id = Column(Uuid(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    job_application_id = Column(Uuid(as_uuid=True), ForeignKey("job_applications.id", ondelete="CASCADE"))
+    interviewer_id = Column(Uuid(as_uuid=True), ForeignKey("employees.id", ondelete="SET NULL"))
+    interview_type = Column(SQLEnum(InterviewType, name="interview_type"), nullable=False)
+    scheduled_date = Column(DateTime(timezone=True), nullable=False)
+    duration_minutes = Column(Integer, default=60)
+    location = Column(String(255))
+    meeting_link = Column(String(500))
+    
+    # Interview Results
+    conducted = Column(Boolean, default=False)
+    actual_start_time = Column(DateTime(timezone=True))
+    actual_end_time = Column(DateTime(timezone=True))
+    rating = Column(SQLEnum(PerformanceRating, name="performance_rating"))
+    feedback = Column(Text)
+    technical_score = Column(Numeric(5, 2))
+    communication_score = Column(Numeric(5, 2))
+    overall_score = Column(Numeric(5, 2))
+    recommendation = Column(Text)
+    
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    # Relationships
+    job_application = relationship("JobApplication")
+    interviewer = relationship("Employee")
+
+    __table_args__ = (
+        Index("idx_interviews_application_id", "job_application_id"),
+        Index("idx_interviews_interviewer_id", "interviewer_id"),
+        Index("idx_interviews_scheduled_date", "scheduled_date"),
+    )
+
 class PerformanceReview(Base):
     __tablename__ = "performance_reviews"
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    employee_id = Column(UUID(as_uuid=True), ForeignKey("employees.id", ondelete="CASCADE"))
-    reviewer_id = Column(UUID(as_uuid=True), ForeignKey("employees.id", ondelete="SET NULL"))
+    id = Column(Uuid(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    employee_id = Column(Uuid(as_uuid=True), ForeignKey("employees.id", ondelete="CASCADE"))
+    reviewer_id = Column(Uuid(as_uuid=True), ForeignKey("employees.id", ondelete="SET NULL"))
     review_period_start = Column(Date, nullable=False)
     review_period_end = Column(Date, nullable=False)
     
     # Ratings
-    overall_rating = Column(SQLEnum(PerformanceRating), nullable=False)
-    technical_skills_rating = Column(SQLEnum(PerformanceRating))
-    communication_rating = Column(SQLEnum(PerformanceRating))
-    teamwork_rating = Column(SQLEnum(PerformanceRating))
-    leadership_rating = Column(SQLEnum(PerformanceRating))
+    overall_rating = Column(SQLEnum(PerformanceRating, name="performance_rating"), nullable=False)
+    technical_skills_rating = Column(SQLEnum(PerformanceRating, name="performance_rating"))
+    communication_rating = Column(SQLEnum(PerformanceRating, name="performance_rating"))
+    teamwork_rating = Column(SQLEnum(PerformanceRating, name="performance_rating"))
+    leadership_rating = Column(SQLEnum(PerformanceRating, name="performance_rating"))
     
     # Goals and Feedback
     achievements = Column(Text)
@@ -362,20 +560,85 @@ class PerformanceReview(Base):
     employee = relationship("Employee", foreign_keys=[employee_id])
     reviewer = relationship("Employee", foreign_keys=[reviewer_id])
 
+    __table_args__ = (
+        Index("idx_performance_reviews_employee_id", "employee_id"),
+        Index("idx_performance_reviews_reviewer_id", "reviewer_id"),
+    )
+
+class TrainingProgram(Base):
+    __tablename__ = "training_programs"
+    
+    id = Column(Uuid(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    organization_id = Column(Uuid(as_uuid=True), ForeignKey("organizations.id", ondelete="CASCADE"))
+    title = Column(String(255), nullable=False)
+    description = Column(Text)
+    duration_hours = Column(Integer)
+    max_participants = Column(Integer)
+    cost_per_participant = Column(Numeric(10, 2))
+    trainer_name = Column(String(255))
+    is_active = Column(Boolean, default=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    # Relationships
+    organization = relationship("Organization")
+
+class EmployeeTraining(Base):
+    __tablename__ = "employee_training"
+    
+    id = Column(Uuid(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    employee_id = Column(Uuid(as_uuid=True), ForeignKey("employees.id", ondelete="CASCADE"))
+    training_program_id = Column(Uuid(as_uuid=True), ForeignKey("training_programs.id", ondelete="CASCADE"))
+    enrollment_date = Column(Date, server_default=func.current_date())
+    completion_date = Column(Date)
+    score = Column(Numeric(5, 2))
+    certificate_url = Column(String(500))
+    is_completed = Column(Boolean, default=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    # Relationships
+    employee = relationship("Employee")
+    training_program = relationship("TrainingProgram")
+
+    __table_args__ = (Index("idx_employee_training_employee_id", "employee_id"),)
+
+class EmployeeBenefit(Base):
+    __tablename__ = "employee_benefits"
+    
+    id = Column(Uuid(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    employee_id = Column(Uuid(as_uuid=True), ForeignKey("employees.id", ondelete="CASCADE"))
+    benefit_type = Column(String(100), nullable=False)  # health_insurance, retirement, etc.
+    benefit_name = Column(String(255), nullable=False)
+    description = Column(Text)
+    monthly_cost = Column(Numeric(10, 2))
+    employee_contribution = Column(Numeric(10, 2))
+    company_contribution = Column(Numeric(10, 2))
+    start_date = Column(Date)
+    end_date = Column(Date)
+    is_active = Column(Boolean, default=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    # Relationships
+    employee = relationship("Employee")
+
+    __table_args__ = (Index("idx_employee_benefits_employee_id", "employee_id"),)
+
 class Announcement(Base):
     __tablename__ = "announcements"
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    organization_id = Column(UUID(as_uuid=True), ForeignKey("organizations.id", ondelete="CASCADE"))
+    id = Column(Uuid(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    organization_id = Column(Uuid(as_uuid=True), ForeignKey("organizations.id", ondelete="CASCADE"))
     title = Column(String(255), nullable=False)
     content = Column(Text, nullable=False)
-    priority = Column(SQLEnum(PriorityLevel), default=PriorityLevel.medium)
+    priority = Column(SQLEnum(PriorityLevel, name="priority_level"), default=PriorityLevel.medium)
     target_audience = Column(String(100))
-    target_department_id = Column(UUID(as_uuid=True), ForeignKey("departments.id", ondelete="SET NULL"))
+    target_department_id = Column(Uuid(as_uuid=True), ForeignKey("departments.id", ondelete="SET NULL"))
     is_active = Column(Boolean, default=True)
     publish_date = Column(Date, server_default=func.current_date())
     expiry_date = Column(Date)
-    created_by = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="SET NULL"))
+    created_by = Column(Uuid(as_uuid=True), ForeignKey("users.id", ondelete="SET NULL"))
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
 
@@ -383,3 +646,73 @@ class Announcement(Base):
     organization = relationship("Organization")
     target_department = relationship("Department")
     creator = relationship("User")
+
+    __table_args__ = (Index("idx_announcements_organization_id", "organization_id"),)
+
+class EmployeeDocument(Base):
+    __tablename__ = "employee_documents"
+    
+    id = Column(Uuid(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    employee_id = Column(Uuid(as_uuid=True), ForeignKey("employees.id", ondelete="CASCADE"))
+    document_type = Column(String(100), nullable=False)  # contract, id_copy, certificate, etc.
+    document_name = Column(String(255), nullable=False)
+    file_url = Column(String(500), nullable=False)
+    uploaded_by = Column(Uuid(as_uuid=True), ForeignKey("users.id", ondelete="SET NULL"))
+    is_confidential = Column(Boolean, default=False)
+    expiry_date = Column(Date)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    # Relationships
+    employee = relationship("Employee")
+
+    __table_args__ = (Index("idx_employee_documents_employee_id", "employee_id"),)
+
+# Precomputed dashboard aggregates, one row per organization (see app/dashboard.py)
+class DashboardSummary(Base):
+    __tablename__ = "dashboard_summaries"
+    
+    organization_id = Column(Uuid(as_uuid=True), ForeignKey("organizations.id", ondelete="CASCADE"), primary_key=True)
+    payload = Column(Text, nullable=False)  # JSON stored as text
+    refreshed_at = Column(DateTime(timezone=True), nullable=False)
+
+# Background job queue, claimed by worker processes (see app/jobs.py)
+class Job(Base):
+    __tablename__ = "jobs"
+    
+    id = Column(Uuid(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    kind = Column(String(100), nullable=False)
+    payload = Column(Text, nullable=False)  # JSON stored as text
+    unique_key = Column(String(255))  # at most one queued or running job per key
+    status = Column(SQLEnum(JobStatus, name="job_status"), nullable=False, default=JobStatus.queued)
+    attempts = Column(Integer, nullable=False, default=0)
+    max_attempts = Column(Integer, nullable=False, default=3)
+    run_after = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    progress = Column(Integer, nullable=False, default=0)  # percent
+    progress_message = Column(String(255))
+    result = Column(Text)  # JSON stored as text
+    error = Column(Text)
+    locked_by = Column(String(255))
+    locked_at = Column(DateTime(timezone=True))  # claim time, refreshed by the worker's heartbeat
+    started_at = Column(DateTime(timezone=True))
+    finished_at = Column(DateTime(timezone=True))
+    created_by = Column(Uuid(as_uuid=True), ForeignKey("users.id", ondelete="SET NULL"))
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    # Queue polling only scans due jobs; at most one active job per unique_key
+    __table_args__ = (
+        Index(
+            "idx_jobs_queued_run_after", "run_after",
+            postgresql_where=text("status = 'queued'"), sqlite_where=text("status = 'queued'")
+        ),
+        Index(
+            "idx_jobs_running_locked_at", "locked_at",
+            postgresql_where=text("status = 'running'"), sqlite_where=text("status = 'running'")
+        ),
+        Index(
+            "idx_jobs_active_unique_key", "unique_key", unique=True,
+            postgresql_where=text("status IN ('queued', 'running')"),
+            sqlite_where=text("status IN ('queued', 'running')")
+        ),
+    )
@@ -0,0 +1,112 @@
+"""Reporting-tree queries backed by the employee_hierarchy closure table.
+
+The closure table holds a row for every (ancestor, descendant) pair,
+including each employee paired with itself at depth 0. Subtree reads and
+"does X report to Y" checks are then single indexed lookups. The table is
+kept current by a Session after_flush hook when employees are created or
+change manager. `python -m app.org_chart rebuild` recomputes it from
+employees.manager_id.
+"""
+import argparse
+from typing import Iterable, Optional
+from uuid import UUID
+from sqlalchemy import delete, event, func, insert, inspect, literal, select, true
+from sqlalchemy.orm import Session, aliased
+from app.models import Employee, EmployeeHierarchy
+
+# Guards the recursive walk against cycles in existing manager_id data
+MAX_DEPTH = 100
+
+def add_to_hierarchy(connection, employee_ids: Iterable[UUID]) -> None:
+    """Insert closure rows for newly created employees by walking up manager_id."""
+    employee_ids = list(employee_ids)
+    if not employee_ids:
+        return
+    chain = (
+        select(
+            Employee.id.label("descendant_id"),
+            Employee.id.label("ancestor_id"),
+            literal(0).label("depth")
+        )
+        .where(Employee.id.in_(employee_ids))
+        .cte("chain", recursive=True)
+    )
+    manager = aliased(Employee)
+    chain = chain.union_all(
+        select(chain.c.descendant_id, manager.manager_id, chain.c.depth + 1)
+        .join(manager, manager.id == chain.c.ancestor_id)
+        .where(manager.manager_id.is_not(None), chain.c.depth < MAX_DEPTH)
+    )
+    connection.execute(
+        insert(EmployeeHierarchy).from_select(
+            ["ancestor_id", "descendant_id", "depth"],
+            select(chain.c.ancestor_id, chain.c.descendant_id, chain.c.depth)
+        )
+    )
+
+def move_subtree(connection, employee_id: UUID, new_manager_id: Optional[UUID]) -> None:
+    """Re-parent an employee and everyone reporting to them."""
+    subtree = select(EmployeeHierarchy.descendant_id).where(EmployeeHierarchy.ancestor_id == employee_id)
+    # Drop links from the old chain of command to every node in the subtree
+    connection.execute(
+        delete(EmployeeHierarchy).where(
+            EmployeeHierarchy.descendant_id.in_(subtree),
+            EmployeeHierarchy.ancestor_id.not_in(subtree)
+        )
+    )
+    if new_manager_id is None:
+        return
+    above = aliased(EmployeeHierarchy)
+    below = aliased(EmployeeHierarchy)
+    connection.execute(
+        insert(EmployeeHierarchy).from_select(
+            ["ancestor_id", "descendant_id", "depth"],
+            select(above.ancestor_id, below.descendant_id, above.depth + below.depth + 1)
+            .select_from(above)
+            .join(below, true())
+            .where(above.descendant_id == new_manager_id, below.ancestor_id == employee_id)
+        )
+    )
+
+def rebuild_hierarchy(connection) -> None:
+    """Recompute the whole closure table from employees.manager_id."""
+    connection.execute(delete(EmployeeHierarchy))
+    add_to_hierarchy(connection, connection.execute(select(Employee.id)).scalars().all())
+
+async def is_in_chain(db, employee_id: UUID, manager_id: UUID) -> bool:
+    """Whether employee_id reports to manager_id, directly or indirectly."""
+    depth = await db.scalar(
+        select(EmployeeHierarchy.depth).where(
+            EmployeeHierarchy.ancestor_id == manager_id,
+            EmployeeHierarchy.descendant_id == employee_id,
+            EmployeeHierarchy.depth > 0
+        )
+    )
+    return depth is not None
+
+@event.listens_for(Session, "after_flush")
+def _maintain_hierarchy(session, flush_context) -> None:
+    created = [obj.id for obj in session.new if isinstance(obj, Employee)]
+    moved = []
+    for obj in session.dirty:
+        if isinstance(obj, Employee) and inspect(obj).attrs.manager_id.history.has_changes():
+            moved.append((obj.id, obj.manager_id))
+    if not (created or moved):
+        return
+    connection = session.connection()
+    add_to_hierarchy(connection, created)
+    for employee_id, manager_id in moved:
+        move_subtree(connection, employee_id, manager_id)
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Maintain the employee reporting-tree closure table.")
+    parser.add_argument("command", choices=["rebuild"])
+    parser.parse_args(argv)
+    from app.database import engine
+    with engine.begin() as connection:
+        rebuild_hierarchy(connection)
+        links = connection.scalar(select(func.count()).select_from(EmployeeHierarchy))
+    print(f"Employee hierarchy rebuilt with {links} links")
+
+if __name__ == "__main__":
+    main()
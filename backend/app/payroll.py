@@ -0,0 +1,268 @@
+"""Payroll run engine.
+
+A run loads salaries, overtime hours and approved unpaid leave for a whole
+organization in a few set-based queries per chunk of employees, computes
+every payslip with NumPy/pandas column arithmetic, and writes the chunk with
+one upsert keyed on (employee_id, pay_period_start, pay_period_end).
+
+Re-running a period recomputes draft rows in place and never touches rows
+that are already processed, so a failed run can simply be started again.
+Large runs go through the job queue ("payroll.run", see app/jobs.py).
+"""
+from datetime import date, timedelta
+from typing import Awaitable, Callable, List, Optional
+from uuid import UUID, uuid4
+import numpy as np
+import pandas as pd
+from sqlalchemy import case, func, or_, select
+from starlette.concurrency import run_in_threadpool
+from app.config import settings
+from app.database import upsert
+from app.jobs import job_handler
+from app.models import (
+    Attendance, Employee, LeaveRequest, LeaveStatus, LeaveType, Payroll, Position
+)
+
+# Rows per upsert statement, keeping bind parameters under driver limits
+UPSERT_CHUNK_SIZE = 1000
+
+AMOUNT_COLUMNS = [
+    "basic_salary", "allowances", "overtime_pay", "bonus", "gross_pay",
+    "tax_deduction", "insurance_deduction", "retirement_deduction",
+    "other_deductions", "total_deductions", "net_pay",
+]
+
+def _period_share_of_year(period_start: date, period_end: date) -> float:
+    """Share of the annual salary a whole pay period pays.
+
+    Periods of whole calendar months pay a twelfth of the salary per month
+    whatever their length; other periods pay by calendar days.
+    """
+    if period_start.day == 1 and (period_end + timedelta(days=1)).day == 1:
+        months = (period_end.year - period_start.year) * 12 + period_end.month - period_start.month + 1
+        return months / 12
+    return ((period_end - period_start).days + 1) / 365
+
+def compute_payroll(
+    employees: pd.DataFrame,
+    overtime: pd.DataFrame,
+    unpaid_leave: pd.DataFrame,
+    period_start: date,
+    period_end: date
+) -> pd.DataFrame:
+    """Compute payslips for a chunk of employees.
+
+    employees has columns (employee_id, annual_salary, hire_date,
+    termination_date); overtime has (employee_id, overtime_hours); unpaid_leave
+    has (employee_id, start_date, end_date) for approved unpaid leave
+    overlapping the period. Basic pay is the period's share of the annual
+    salary, prorated by the days of the period the employee was employed.
+    Returns one row per employee with the payroll amount columns.
+    """
+    index = pd.Index(employees["employee_id"], name="employee_id")
+    annual = employees["annual_salary"].to_numpy(dtype=float)
+    daily_rate = annual / settings.PAYROLL_WORKING_DAYS_PER_YEAR
+    hourly_rate = daily_rate / settings.PAYROLL_STANDARD_HOURS_PER_DAY
+
+    # Calendar days of the period between hire and termination (both inclusive)
+    employed_from = np.maximum(
+        employees["hire_date"].fillna(period_start).to_numpy(dtype="datetime64[D]"), np.datetime64(period_start)
+    )
+    employed_to = np.minimum(
+        employees["termination_date"].fillna(period_end).to_numpy(dtype="datetime64[D]"), np.datetime64(period_end)
+    )
+    employed_days = np.maximum((employed_to - employed_from).astype(int) + 1, 0)
+
+    period_days = (period_end - period_start).days + 1
+    basic = annual * _period_share_of_year(period_start, period_end) * employed_days / period_days
+
+    overtime_hours = (
+        overtime.groupby("employee_id")["overtime_hours"].sum()
+        .reindex(index, fill_value=0).to_numpy(dtype=float)
+    )
+    overtime_pay = overtime_hours * hourly_rate * settings.PAYROLL_OVERTIME_MULTIPLIER
+
+    # Working days of unpaid leave inside the period (busday_count ends are exclusive)
+    unpaid_days = np.zeros(len(index))
+    if len(unpaid_leave):
+        starts = np.maximum(
+            unpaid_leave["start_date"].to_numpy(dtype="datetime64[D]"), np.datetime64(period_start)
+        )
+        ends = np.minimum(
+            unpaid_leave["end_date"].to_numpy(dtype="datetime64[D]"), np.datetime64(period_end)
+        ) + np.timedelta64(1, "D")
+        days = np.where(ends > starts, np.busday_count(starts, np.maximum(starts, ends)), 0)
+        unpaid_days = (
+            pd.Series(days, index=unpaid_leave["employee_id"].to_numpy()).groupby(level=0).sum()
+            .reindex(index, fill_value=0).to_numpy(dtype=float)
+        )
+
+    allowances = np.zeros(len(index))
+    bonus = np.zeros(len(index))
+    gross = basic + allowances + overtime_pay + bonus
+    other = np.minimum(unpaid_days * daily_rate, gross)
+    taxable = gross - other
+    tax = taxable * settings.PAYROLL_TAX_RATE
+    insurance = taxable * settings.PAYROLL_INSURANCE_RATE
+    retirement = basic * settings.PAYROLL_RETIREMENT_RATE
+    total_deductions = tax + insurance + retirement + other
+
+    result = pd.DataFrame({
+        "basic_salary": basic,
+        "allowances": allowances,
+        "overtime_pay": overtime_pay,
+        "bonus": bonus,
+        "gross_pay": gross,
+        "tax_deduction": tax,
+        "insurance_deduction": insurance,
+        "retirement_deduction": retirement,
+        "other_deductions": other,
+        "total_deductions": total_deductions,
+        "net_pay": gross - total_deductions,
+    }, index=index)
+    return result.round(2).reset_index()
+
+def _payroll_upsert(rows: List[dict]):
+    table = Payroll.__table__
+    stmt = upsert(table).values(rows)
+    return stmt.on_conflict_do_update(
+        index_elements=[table.c.employee_id, table.c.pay_period_start, table.c.pay_period_end],
+        set_={**{column: stmt.excluded[column] for column in AMOUNT_COLUMNS}, "updated_at": func.now()},
+        # Processed payslips are final
+        where=func.coalesce(table.c.is_processed, False).is_(False)
+    )
+
+async def _load_chunk(db, employee_ids: List[UUID], period_start: date, period_end: date):
+    standard_hours = settings.PAYROLL_STANDARD_HOURS_PER_DAY
+    overtime_result = await db.execute(
+        select(
+            Attendance.employee_id,
+            func.sum(case(
+                (Attendance.total_hours > standard_hours, Attendance.total_hours - standard_hours),
+                else_=0
+            )).label("overtime_hours")
+        ).where(
+            Attendance.employee_id.in_(employee_ids),
+            Attendance.date.between(period_start, period_end)
+        ).group_by(Attendance.employee_id)
+    )
+    leave_result = await db.execute(
+        select(LeaveRequest.employee_id, LeaveRequest.start_date, LeaveRequest.end_date)
+        .join(LeaveType, LeaveType.id == LeaveRequest.leave_type_id)
+        .where(
+            LeaveRequest.employee_id.in_(employee_ids),
+            LeaveRequest.status == LeaveStatus.approved,
+            LeaveType.is_paid.is_(False),
+            LeaveRequest.start_date <= period_end,
+            LeaveRequest.end_date >= period_start
+        )
+    )
+    overtime = pd.DataFrame(overtime_result.all(), columns=["employee_id", "overtime_hours"])
+    unpaid_leave = pd.DataFrame(leave_result.all(), columns=["employee_id", "start_date", "end_date"])
+    return overtime, unpaid_leave
+
+async def run_payroll(
+    db,
+    organization_id: UUID,
+    period_start: date,
+    period_end: date,
+    recompute_drafts: bool = True,
+    chunk_size: Optional[int] = None,
+    progress: Optional[Callable[..., Awaitable[None]]] = None
+) -> dict:
+    """Compute and store payslips for every eligible employee of an organization.
+
+    Each chunk is committed on its own. With recompute_drafts=False, employees
+    that already have a payslip for the period are skipped, which resumes an
+    interrupted run without redoing finished chunks. progress(done, total) is
+    awaited after each chunk.
+    """
+    chunk_size = chunk_size or settings.PAYROLL_CHUNK_SIZE
+
+    salary_result = await db.execute(
+        select(
+            Employee.id,
+            func.coalesce(Employee.base_salary, Position.min_salary).label("annual_salary"),
+            Employee.hire_date,
+            Employee.termination_date
+        )
+        .outerjoin(Position, Position.id == Employee.position_id)
+        .where(
+            Employee.organization_id == organization_id,
+            Employee.hire_date <= period_end,
+            or_(Employee.termination_date.is_(None), Employee.termination_date >= period_start)
+        )
+        .order_by(Employee.id)
+    )
+    salaries = salary_result.all()
+
+    existing_result = await db.execute(
+        select(Payroll.employee_id, Payroll.is_processed).where(
+            Payroll.pay_period_start == period_start,
+            Payroll.pay_period_end == period_end,
+            Payroll.employee_id.in_(
+                select(Employee.id).where(Employee.organization_id == organization_id)
+            )
+        )
+    )
+    existing = dict(existing_result.all())
+    skip = {employee_id for employee_id, processed in existing.items() if processed or not recompute_drafts}
+
+    payable = [row for row in salaries if row.annual_salary is not None and row.id not in skip]
+
+    summary = {
+        "organization_id": organization_id,
+        "pay_period_start": period_start,
+        "pay_period_end": period_end,
+        "employees": len(salaries),
+        "written": 0,
+        "skipped_processed": sum(1 for row in salaries if existing.get(row.id)),
+        "chunks": 0,
+        "total_gross": 0.0,
+        "total_net": 0.0,
+    }
+
+    for start in range(0, len(payable), chunk_size):
+        chunk = payable[start:start + chunk_size]
+        employees = pd.DataFrame(
+            chunk, columns=["employee_id", "annual_salary", "hire_date", "termination_date"]
+        )
+        overtime, unpaid_leave = await _load_chunk(
+            db, list(employees["employee_id"]), period_start, period_end
+        )
+        payslips = await run_in_threadpool(
+            compute_payroll, employees, overtime, unpaid_leave, period_start, period_end
+        )
+
+        rows = [
+            {"id": uuid4(), "employee_id": record["employee_id"], "pay_period_start": period_start,
+             "pay_period_end": period_end, "is_processed": False,
+             **{column: float(record[column]) for column in AMOUNT_COLUMNS}}
+            for record in payslips.to_dict("records")
+        ]
+        for offset in range(0, len(rows), UPSERT_CHUNK_SIZE):
+            await db.execute(_payroll_upsert(rows[offset:offset + UPSERT_CHUNK_SIZE]))
+        await db.commit()
+
+        summary["written"] += len(rows)
+        summary["chunks"] += 1
+        summary["total_gross"] += float(payslips["gross_pay"].sum())
+        summary["total_net"] += float(payslips["net_pay"].sum())
+        if progress:
+            await progress(start + len(chunk), len(payable), f"{summary['written']} payslips written")
+
+    summary["total_gross"] = round(summary["total_gross"], 2)
+    summary["total_net"] = round(summary["total_net"], 2)
+    return summary
+
+@job_handler("payroll.run", concurrency=1)
+async def run_payroll_job(db, payload: dict, context) -> dict:
+    """Queued payroll run; one at a time, as runs compete for the same tables."""
+    return await run_payroll(
+        db,
+        UUID(payload["organization_id"]),
+        date.fromisoformat(payload["pay_period_start"]),
+        date.fromisoformat(payload["pay_period_end"]),
+        recompute_drafts=payload.get("recompute_drafts", True),
+        progress=context.progress
+    )
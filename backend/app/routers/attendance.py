@@ -1,49 +1,199 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from typing import List
-from uuid import UUID
-from datetime import date
-from app.database import get_db
-from app.models import Attendance, Employee
-from app.schemas import AttendanceCreate, AttendanceUpdate, AttendanceResponse, MessageResponse
+from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy import Numeric, and_, case, cast, func, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import AsyncIterator, List, Optional
+from uuid import UUID, uuid4
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+from enum import Enum
+import csv
+import io
+import json
+from app.attendance_rollups import apply_rollup_deltas, month_start, next_month, record_change
+from app.config import settings
+from app.database import engine, get_async_db, get_read_db, open_read_session, upsert
+from app.models import Attendance, AttendanceRollup, Employee
+from app.schemas import (
+    AttendanceCreate, AttendanceUpdate, AttendanceResponse, MessageResponse,
+    AttendanceEvent, AttendanceBulkRequest, AttendanceBulkResponse, AttendanceSummaryResponse
+)
+from app.serialization import FastJSONResponse, dump_rows
 from app.routers.auth import get_current_user
 from app.models import User
 
 router = APIRouter()
 
+# Rows per upsert statement, keeping bind parameters under driver limits
+UPSERT_CHUNK_SIZE = 1000
+
 @router.get("/", response_model=List[AttendanceResponse])
 async def get_attendance_records(
     employee_id: UUID = None,
     start_date: date = None,
     end_date: date = None,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ):
-    """Get attendance records with filtering."""
-    query = db.query(Attendance)
+    """Get attendance records with filtering.
+    
+    The date range is compared to the bare date column, so on Postgres only
+    the monthly partitions it covers are scanned.
+    """
+    query = _filter_attendance(select(Attendance), employee_id, start_date, end_date)
     
+    result = await db.execute(query.order_by(Attendance.date.desc()))
+    return FastJSONResponse(dump_rows(AttendanceResponse, result.scalars().all()))
+
+@router.get("/summary", response_model=List[AttendanceSummaryResponse])
+async def get_attendance_summary(
+    start_month: Optional[date] = None,
+    end_month: Optional[date] = None,
+    employee_id: Optional[UUID] = None,
+    department_id: Optional[UUID] = None,
+    organization_id: Optional[UUID] = None,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(1000, ge=1, le=10000),
+    db: AsyncSession = Depends(get_read_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Get monthly timesheet totals per employee: hours, late days and absences.
+    
+    Months are given by any of their days and default to the current month.
+    Served from the attendance rollups, one row per employee and month.
+    """
+    start_month = month_start(start_month or date.today())
+    end_month = month_start(end_month or start_month)
+    query = select(AttendanceRollup).where(
+        AttendanceRollup.month >= start_month,
+        AttendanceRollup.month < next_month(end_month)
+    )
     if employee_id:
-        query = query.filter(Attendance.employee_id == employee_id)
+        query = query.where(AttendanceRollup.employee_id == employee_id)
+    if department_id or organization_id:
+        query = query.join(Employee, Employee.id == AttendanceRollup.employee_id)
+        if department_id:
+            query = query.where(Employee.department_id == department_id)
+        if organization_id:
+            query = query.where(Employee.organization_id == organization_id)
+    
+    query = query.order_by(AttendanceRollup.month, AttendanceRollup.employee_id)
+    result = await db.execute(query.offset(skip).limit(limit))
+    return FastJSONResponse(dump_rows(AttendanceSummaryResponse, result.scalars().all()))
+
+def _filter_attendance(
+    query,
+    employee_id: Optional[UUID] = None,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None
+):
+    """Apply the employee and date range filters shared by the attendance listings."""
+    if employee_id:
+        query = query.where(Attendance.employee_id == employee_id)
     if start_date:
-        query = query.filter(Attendance.date >= start_date)
+        query = query.where(Attendance.date >= start_date)
     if end_date:
-        query = query.filter(Attendance.date <= end_date)
+        query = query.where(Attendance.date <= end_date)
+    return query
+
+def _export_value(value):
+    """Convert a column value to its JSON/CSV representation."""
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, UUID):
+        return str(value)
+    return value
+
+async def _iter_attendance_chunks(
+    employee_id: Optional[UUID],
+    start_date: Optional[date],
+    end_date: Optional[date]
+) -> AsyncIterator[list]:
+    """Yield attendance rows in keyset-paginated chunks ordered by (date, id).
     
-    records = query.order_by(Attendance.date.desc()).all()
-    return records
+    Each chunk is a bounded query, so memory stays flat regardless of range size.
+    """
+    columns = list(Attendance.__table__.columns)
+    last_key = None
+    # Exports are reporting reads and tolerate replica lag
+    db = open_read_session()
+    try:
+        while True:
+            query = _filter_attendance(select(*columns), employee_id, start_date, end_date)
+            if last_key is not None:
+                # The plain date bound lets Postgres skip the partitions already exported
+                query = query.where(
+                    Attendance.date >= last_key[0],
+                    tuple_(Attendance.date, Attendance.id) > last_key
+                )
+            query = query.order_by(Attendance.date, Attendance.id).limit(settings.EXPORT_CHUNK_SIZE)
+            rows = (await db.execute(query)).all()
+            if not rows:
+                break
+            yield rows
+            if len(rows) < settings.EXPORT_CHUNK_SIZE:
+                break
+            last_key = (rows[-1].date, rows[-1].id)
+    finally:
+        await db.close()
+
+async def _stream_ndjson(chunks: AsyncIterator[list]) -> AsyncIterator[str]:
+    async for rows in chunks:
+        yield "".join(
+            json.dumps({key: _export_value(value) for key, value in row._mapping.items()}) + "\n"
+            for row in rows
+        )
+
+async def _stream_csv(chunks: AsyncIterator[list]) -> AsyncIterator[str]:
+    columns = [column.name for column in Attendance.__table__.columns]
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    async for rows in chunks:
+        writer.writerows([_export_value(value) for value in row] for row in rows)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue()
+
+@router.get("/export")
+async def export_attendance_records(
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+    employee_id: UUID = None,
+    start_date: date = None,
+    end_date: date = None,
+    current_user: User = Depends(get_current_user)
+):
+    """Stream attendance records as NDJSON or CSV, ordered by date."""
+    chunks = _iter_attendance_chunks(employee_id, start_date, end_date)
+    if format == "csv":
+        body, media_type = _stream_csv(chunks), "text/csv"
+    else:
+        body, media_type = _stream_ndjson(chunks), "application/x-ndjson"
+    
+    return StreamingResponse(
+        body,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="attendance.{format}"'}
+    )
 
 @router.post("/check-in", response_model=AttendanceResponse)
 async def check_in(
     attendance_data: AttendanceCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     """Employee check-in."""
     # Check if already checked in today
-    existing_record = db.query(Attendance).filter(
+    existing_record = await db.scalar(select(Attendance).where(
         Attendance.employee_id == attendance_data.employee_id,
         Attendance.date == attendance_data.date
-    ).first()
+    ))
     
     if existing_record:
         raise HTTPException(
@@ -53,29 +203,258 @@ async def check_in(
     
     db_attendance = Attendance(**attendance_data.model_dump())
     db.add(db_attendance)
-    db.commit()
-    db.refresh(db_attendance)
+    rollup_deltas = {}
+    record_change(
+        rollup_deltas, db_attendance.employee_id, db_attendance.date, new=(db_attendance.status, None)
+    )
+    await apply_rollup_deltas(db, rollup_deltas)
+    await db.commit()
+    await db.refresh(db_attendance)
     
     return db_attendance
 
+def _hours_between(start, end):
+    """SQL expression for the hours elapsed between two timestamp expressions."""
+    if engine.dialect.name == "postgresql":
+        return func.extract("epoch", end - start) / 3600
+    return (func.julianday(end) - func.julianday(start)) * 24
+
+def _as_utc(value: datetime) -> datetime:
+    """Aware UTC datetime; naive values (SQLite, terminals without an offset) are taken as UTC."""
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value.astimezone(timezone.utc)
+
+async def _event_days(db, events: List[tuple]) -> dict:
+    """Attendance date of each (index, event), by index.
+    
+    Check-ins use their date, defaulting to the timestamp's. A check-out
+    without a date belongs to the employee's latest check-in before it, from
+    the batch or already stored, so a shift crossing midnight stays one row.
+    Check-outs with no check-in in the preceding ATTENDANCE_MAX_SHIFT_HOURS
+    are left out.
+    """
+    max_shift = timedelta(hours=settings.ATTENDANCE_MAX_SHIFT_HOURS)
+    days = {}
+    check_ins = {}
+    unpaired = []
+    for index, event in events:
+        if event.event_type == "check_out" and event.date is None:
+            unpaired.append((index, event))
+            continue
+        days[index] = event.date or event.timestamp.date()
+        if event.event_type == "check_in":
+            check_ins.setdefault(event.employee_id, []).append((_as_utc(event.timestamp), days[index]))
+    if not unpaired:
+        return days
+    
+    # Stored check-ins that could open these shifts; the date range (a day
+    # wider for local dates) keeps the scan to a few partitions
+    earliest = min(_as_utc(event.timestamp) for _, event in unpaired) - max_shift
+    latest = max(_as_utc(event.timestamp) for _, event in unpaired)
+    stored = await db.execute(
+        select(Attendance.employee_id, Attendance.check_in_time, Attendance.date).where(
+            Attendance.employee_id.in_({event.employee_id for _, event in unpaired}),
+            Attendance.date.between(earliest.date() - timedelta(days=1), latest.date() + timedelta(days=1)),
+            Attendance.check_in_time.is_not(None)
+        )
+    )
+    for employee_id, check_in_time, day in stored.all():
+        check_ins.setdefault(employee_id, []).append((_as_utc(check_in_time), day))
+    
+    for index, event in unpaired:
+        checked_out = _as_utc(event.timestamp)
+        candidates = [
+            (checked_in, day) for checked_in, day in check_ins.get(event.employee_id, [])
+            if checked_out - max_shift <= checked_in <= checked_out
+        ]
+        if candidates:
+            days[index] = max(candidates)[1]
+    return days
+
+def _merge_events(events: List[AttendanceEvent]) -> dict:
+    """Collapse the events for one (employee, date) into a single attendance row."""
+    check_ins = [event for event in events if event.event_type == "check_in"]
+    check_outs = [event for event in events if event.event_type == "check_out"]
+    first_in = min(check_ins, key=lambda event: event.timestamp) if check_ins else None
+    last_out = max(check_outs, key=lambda event: event.timestamp) if check_outs else None
+    breaks = [event.break_duration for event in events if event.break_duration is not None]
+    return {
+        "check_in_time": first_in.timestamp if first_in else None,
+        "check_out_time": last_out.timestamp if last_out else None,
+        "break_duration": max(breaks) if breaks else 0,
+        "status": (first_in or events[0]).status,
+        "location_check_in": first_in.location if first_in else None,
+        "location_check_out": last_out.location if last_out else None,
+    }
+
+def _attendance_returning(stmt):
+    table = Attendance.__table__
+    return stmt.returning(table.c.id, table.c.employee_id, table.c.date, table.c.status, table.c.total_hours)
+
+def _attendance_insert(rows: List[dict]):
+    """INSERT ... ON CONFLICT DO NOTHING for rows, returning only the rows it created."""
+    table = Attendance.__table__
+    return _attendance_returning(
+        upsert(table).values(rows).on_conflict_do_nothing(index_elements=[table.c.employee_id, table.c.date])
+    )
+
+def _attendance_upsert(rows: List[dict]):
+    """Build one INSERT ... ON CONFLICT (employee_id, date) statement for rows.
+    
+    Replays are idempotent: the earliest check-in, latest check-out and longest
+    break win, and total hours are recomputed from the merged times.
+    """
+    table = Attendance.__table__
+    stmt = upsert(table).values(rows)
+    existing, incoming = table.c, stmt.excluded
+    
+    check_in = case(
+        (existing.check_in_time.is_(None), incoming.check_in_time),
+        (incoming.check_in_time < existing.check_in_time, incoming.check_in_time),
+        else_=existing.check_in_time
+    )
+    check_out = case(
+        (existing.check_out_time.is_(None), incoming.check_out_time),
+        (incoming.check_out_time > existing.check_out_time, incoming.check_out_time),
+        else_=existing.check_out_time
+    )
+    break_duration = case(
+        (incoming.break_duration > func.coalesce(existing.break_duration, 0), incoming.break_duration),
+        else_=existing.break_duration
+    )
+    total_hours = case(
+        (
+            and_(check_in.is_not(None), check_out > check_in),
+            func.round(cast(_hours_between(check_in, check_out) - break_duration / 60.0, Numeric), 2)
+        ),
+        else_=existing.total_hours
+    )
+    
+    return _attendance_returning(stmt.on_conflict_do_update(
+        index_elements=[table.c.employee_id, table.c.date],
+        set_={
+            "check_in_time": check_in,
+            "check_out_time": check_out,
+            "break_duration": break_duration,
+            "total_hours": total_hours,
+            "location_check_in": func.coalesce(existing.location_check_in, incoming.location_check_in),
+            "location_check_out": func.coalesce(incoming.location_check_out, existing.location_check_out),
+            "updated_at": func.now(),
+        }
+    ))
+
+@router.post("/bulk", response_model=AttendanceBulkResponse)
+async def bulk_ingest_attendance(
+    bulk_data: AttendanceBulkRequest,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Ingest buffered check-in/check-out events from badge terminals.
+    
+    Events are grouped by (employee_id, date), a check-out without a date
+    joining the shift of the check-in before it, and written with set-based
+    upserts in a single transaction, together with the attendance rollups.
+    Each event gets its own result, so one bad event does not reject the batch.
+    """
+    results = {}
+    
+    # Reject events for unknown employees with a single lookup
+    employee_ids = {event.employee_id for event in bulk_data.events}
+    known_ids = set((await db.execute(
+        select(Employee.id).where(Employee.id.in_(employee_ids))
+    )).scalars())
+    
+    events = []
+    for index, event in enumerate(bulk_data.events):
+        if event.employee_id not in known_ids:
+            results[index] = {"index": index, "success": False, "detail": "Employee not found"}
+            continue
+        events.append((index, event))
+    
+    days = await _event_days(db, events)
+    groups = {}
+    for index, event in events:
+        if index not in days:
+            results[index] = {"index": index, "success": False, "detail": "No check-in found for check-out"}
+            continue
+        groups.setdefault((event.employee_id, days[index]), []).append((index, event))
+    
+    rows = []
+    row_indexes = {}
+    for (employee_id, day), items in groups.items():
+        row = _merge_events([event for _, event in items])
+        if row["check_in_time"] and row["check_out_time"] and row["check_out_time"] < row["check_in_time"]:
+            for index, _ in items:
+                results[index] = {"index": index, "success": False, "detail": "Check-out precedes check-in"}
+            continue
+        if row["check_in_time"] and row["check_out_time"]:
+            elapsed = (row["check_out_time"] - row["check_in_time"]).total_seconds() / 3600
+            row["total_hours"] = round(elapsed - row["break_duration"] / 60, 2)
+        else:
+            row["total_hours"] = None
+        rows.append({"id": uuid4(), "employee_id": employee_id, "date": day, **row})
+        row_indexes[(employee_id, day)] = [index for index, _ in items]
+    
+    rollup_deltas = {}
+    
+    def record_written(written, old_values):
+        for attendance_id, employee_id, day, status, hours in written:
+            record_change(
+                rollup_deltas, employee_id, day, old=old_values.get((employee_id, day)), new=(status, hours)
+            )
+            for index in row_indexes[(employee_id, day)]:
+                results[index] = {"index": index, "success": True, "attendance_id": attendance_id}
+    
+    for start in range(0, len(rows), UPSERT_CHUNK_SIZE):
+        chunk = rows[start:start + UPSERT_CHUNK_SIZE]
+        # Create the new rows first. A concurrent batch inserting the same key
+        # makes this wait for its commit and then skip the row, so every row is
+        # counted as new by exactly one batch
+        inserted = (await db.execute(_attendance_insert(chunk))).all()
+        record_written(inserted, {})
+        created = {(employee_id, day) for _, employee_id, day, _, _ in inserted}
+        existing = [row for row in chunk if (row["employee_id"], row["date"]) not in created]
+        if not existing:
+            continue
+        
+        # Rows being merged into, locked until commit so their old values stay current
+        previous = await db.execute(
+            select(Attendance.employee_id, Attendance.date, Attendance.status, Attendance.total_hours)
+            .where(tuple_(Attendance.employee_id, Attendance.date).in_(
+                [(row["employee_id"], row["date"]) for row in existing]
+            ))
+            .with_for_update()
+        )
+        old_values = {(employee_id, day): (status, hours) for employee_id, day, status, hours in previous.all()}
+        record_written((await db.execute(_attendance_upsert(existing))).all(), old_values)
+    await apply_rollup_deltas(db, rollup_deltas)
+    await db.commit()
+    
+    ordered = [results[index] for index in range(len(bulk_data.events))]
+    accepted = sum(1 for result in ordered if result["success"])
+    return {"accepted": accepted, "rejected": len(ordered) - accepted, "results": ordered}
+
 @router.put("/{attendance_id}/check-out", response_model=AttendanceResponse)
 async def check_out(
     attendance_id: UUID,
     attendance_data: AttendanceUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     """Employee check-out."""
-    attendance = db.query(Attendance).filter(Attendance.id == attendance_id).first()
+    # Locked until commit, so the old status and hours behind the rollup
+    # deltas cannot change under a concurrent check-out or bulk ingest
+    attendance = await db.get(Attendance, attendance_id, with_for_update=True, populate_existing=True)
     if not attendance:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Attendance record not found"
         )
     
+    previous = (attendance.status, attendance.total_hours)
+    
     # Calculate total hours
     if attendance.check_in_time and attendance_data.check_out_time:
-        time_diff = attendance_data.check_out_time - attendance.check_in_time
+        time_diff = _as_utc(attendance_data.check_out_time) - _as_utc(attendance.check_in_time)
         total_minutes = time_diff.total_seconds() / 60
         break_minutes = attendance_data.break_duration or 0
         total_hours = (total_minutes - break_minutes) / 60
@@ -85,7 +464,13 @@ async def check_out(
     for field, value in update_data.items():
         setattr(attendance, field, value)
     
-    db.commit()
-    db.refresh(attendance)
+    rollup_deltas = {}
+    record_change(
+        rollup_deltas, attendance.employee_id, attendance.date,
+        old=previous, new=(attendance.status, attendance.total_hours)
+    )
+    await apply_rollup_deltas(db, rollup_deltas)
+    await db.commit()
+    await db.refresh(attendance)
     
     return attendance
@@ -1,22 +1,27 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import timedelta
-from app.database import get_db
+from uuid import UUID
+from app.database import get_async_db
 from app.models import User, Employee
 from app.schemas import LoginRequest, Token, UserCreate, UserResponse, MessageResponse
-from app.auth import verify_password, create_access_token, verify_token, get_password_hash
+from app.auth import (
+    verify_password_async, create_access_token, verify_token, get_password_hash_async,
+    cache_user, get_cached_user
+)
 from app.config import settings
 
 router = APIRouter()
 security = HTTPBearer()
 
 @router.post("/login", response_model=Token)
-async def login(login_data: LoginRequest, db: Session = Depends(get_db)):
+async def login(login_data: LoginRequest, db: AsyncSession = Depends(get_async_db)):
     """Authenticate user and return access token."""
-    user = db.query(User).filter(User.username == login_data.username).first()
+    user = await db.scalar(select(User).where(User.username == login_data.username))
     
-    if not user or not verify_password(login_data.password, user.password_hash):
+    if not user or not await verify_password_async(login_data.password, user.password_hash):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect username or password",
@@ -38,7 +43,7 @@ async def login(login_data: LoginRequest, db: Session = Depends(get_db)):
     # Update last login
     from datetime import datetime
     user.last_login = datetime.utcnow()
-    db.commit()
+    await db.commit()
     
     return {
         "access_token": access_token,
@@ -47,10 +52,10 @@ async def login(login_data: LoginRequest, db: Session = Depends(get_db)):
     }
 
 @router.post("/register", response_model=UserResponse)
-async def register(user_data: UserCreate, db: Session = Depends(get_db)):
+async def register(user_data: UserCreate, db: AsyncSession = Depends(get_async_db)):
     """Register a new user."""
     # Check if username already exists
-    existing_user = db.query(User).filter(User.username == user_data.username).first()
+    existing_user = await db.scalar(select(User).where(User.username == user_data.username))
     if existing_user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -58,7 +63,7 @@ async def register(user_data: UserCreate, db: Session = Depends(get_db)):
         )
     
     # Check if email already exists
-    existing_email = db.query(User).filter(User.email == user_data.email).first()
+    existing_email = await db.scalar(select(User).where(User.email == user_data.email))
     if existing_email:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -66,7 +71,7 @@ async def register(user_data: UserCreate, db: Session = Depends(get_db)):
         )
     
     # Check if employee exists
-    employee = db.query(Employee).filter(Employee.id == user_data.employee_id).first()
+    employee = await db.get(Employee, user_data.employee_id)
     if not employee:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -74,7 +79,9 @@ async def register(user_data: UserCreate, db: Session = Depends(get_db)):
         )
     
     # Check if employee already has a user account
-    existing_user_for_employee = db.query(User).filter(User.employee_id == user_data.employee_id).first()
+    existing_user_for_employee = await db.scalar(
+        select(User).where(User.employee_id == user_data.employee_id)
+    )
     if existing_user_for_employee:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -82,7 +89,7 @@ async def register(user_data: UserCreate, db: Session = Depends(get_db)):
         )
     
     # Create new user
-    hashed_password = get_password_hash(user_data.password)
+    hashed_password = await get_password_hash_async(user_data.password)
     db_user = User(
         username=user_data.username,
         email=user_data.email,
@@ -92,28 +99,34 @@ async def register(user_data: UserCreate, db: Session = Depends(get_db)):
     )
     
     db.add(db_user)
-    db.commit()
-    db.refresh(db_user)
+    await db.commit()
+    await db.refresh(db_user)
     
     return db_user
 
 async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ) -> User:
     """Get current authenticated user."""
     token = credentials.credentials
     payload = verify_token(token)
     
-    user_id = payload.get("sub")
-    if user_id is None:
+    try:
+        user_id = UUID(payload["sub"])
+    except (KeyError, TypeError, ValueError):
+        # Missing, or not a user id even though the signature is valid
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Could not validate credentials",
             headers={"WWW-Authenticate": "Bearer"},
         )
     
-    user = db.query(User).filter(User.id == user_id).first()
+    cached_user = get_cached_user(user_id)
+    if cached_user is not None:
+        return cached_user
+    
+    user = await db.get(User, user_id)
     if user is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -127,6 +140,11 @@ async def get_current_user(
             detail="Inactive user"
         )
     
+    cache_user(user)
+    # Give the connection back now instead of at the end of the request, so a
+    # streaming response or a second session never holds two at once
+    db.expunge(user)
+    await db.rollback()
     return user
 
 @router.get("/me", response_model=UserResponse)
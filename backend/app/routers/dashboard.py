@@ -0,0 +1,40 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from uuid import UUID
+from app.config import settings
+from app.dashboard import get_summary
+from app.database import get_async_db
+from app.models import Organization
+from app.schemas import DashboardSummaryResponse
+from app.routers.auth import get_current_user
+from app.models import User
+
+router = APIRouter()
+
+@router.get("/summary", response_model=DashboardSummaryResponse)
+async def get_dashboard_summary(
+    organization_id: UUID,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Get headcount, today's attendance, pending leave and open applications for an organization.
+    
+    Served from the precomputed summary, which workers keep refreshed. A
+    summary that is missing or older than DASHBOARD_MAX_STALENESS_SECONDS is
+    not served: the response is 503 with Retry-After and a refresh is queued.
+    """
+    organization = await db.get(Organization, organization_id)
+    if not organization:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Organization not found"
+        )
+    
+    summary = await get_summary(db, organization_id)
+    if summary is None:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Dashboard summary is being refreshed",
+            headers={"Retry-After": str(round(settings.JOB_POLL_INTERVAL_SECONDS) + 1)}
+        )
+    return summary
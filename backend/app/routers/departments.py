@@ -1,54 +1,176 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from pydantic import TypeAdapter
+from sqlalchemy import event, inspect, select, func
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased, object_session, selectinload
+from typing import List, Optional
 from uuid import UUID
-from app.database import get_db
+from app.database import get_async_db, get_read_db, on_commit
 from app.models import Department, Organization, Employee
-from app.schemas import DepartmentCreate, DepartmentUpdate, DepartmentResponse, MessageResponse
+from app.schemas import DepartmentCreate, DepartmentUpdate, DepartmentResponse, EmployeeSummary, MessageResponse
 from app.routers.auth import get_current_user
 from app.models import User
+from app.http_cache import cached_reference_response, etag_matches, json_response, not_modified, reference_cache, serialize, weak_etag
+from app.statement_budget import statement_budget
 
 router = APIRouter()
 
-@router.get("/", response_model=List[DepartmentResponse])
+# Managers embedded in DepartmentResponse, fetched in one IN query per listing
+DEPARTMENT_LOAD_OPTIONS = (selectinload(Department.manager),)
+
+async def _get_department(db: AsyncSession, department_id: UUID) -> Optional[Department]:
+    """Load a department with the relationships DepartmentResponse embeds."""
+    return await db.get(
+        Department, department_id, options=DEPARTMENT_LOAD_OPTIONS, populate_existing=True
+    )
+
+DEPARTMENT_LIST_ADAPTER = TypeAdapter(List[DepartmentResponse])
+DEPARTMENT_ADAPTER = TypeAdapter(DepartmentResponse)
+
+Manager = aliased(Employee)
+
+# The ETag validators below are computed either in SQL (to answer a
+# conditional request without loading rows) or from the loaded rows, and both
+# forms must produce the same values. The embedded manager is covered by its
+# updated_at; a manager removed by ON DELETE SET NULL changes the manager count.
+
+def _departments_etag(departments: List[Department]) -> str:
+    return weak_etag(
+        len(departments),
+        max((department.updated_at for department in departments), default=None),
+        sum(department.manager_id is not None for department in departments),
+        max((department.manager.updated_at for department in departments if department.manager), default=None)
+    )
+
+async def _current_departments_etag(db: AsyncSession, organization_id: Optional[UUID]) -> str:
+    query = select(
+        func.count(Department.id),
+        func.max(Department.updated_at),
+        func.count(Department.manager_id),
+        func.max(Manager.updated_at)
+    ).outerjoin(Manager, Manager.id == Department.manager_id)
+    if organization_id:
+        query = query.where(Department.organization_id == organization_id)
+    return weak_etag(*(await db.execute(query)).one())
+
+def _department_etag(department: Department) -> str:
+    return weak_etag(department.updated_at, department.manager.updated_at if department.manager else None)
+
+async def _current_department_etag(db: AsyncSession, department_id: UUID) -> Optional[str]:
+    row = (await db.execute(
+        select(Department.updated_at, Manager.updated_at)
+        .outerjoin(Manager, Manager.id == Department.manager_id)
+        .where(Department.id == department_id)
+    )).one_or_none()
+    return weak_etag(*row) if row else None
+
+def _invalidate_cached_department(department: Department) -> None:
+    reference_cache.invalidate(("department", department.id))
+    reference_cache.invalidate(("departments", department.organization_id))
+    reference_cache.invalidate(("departments", None))
+
+# Cached department bodies embed their manager's EmployeeSummary, so they go
+# once a manager's summary changes or the manager is deleted (which sets
+# manager_id to NULL without touching the department row)
+
+@event.listens_for(Employee, "after_update")
+def _manager_updated(mapper, connection, target) -> None:
+    state = inspect(target)
+    if any(state.attrs[field].history.has_changes() for field in EmployeeSummary.model_fields):
+        _invalidate_managed_departments(connection, target)
+
+@event.listens_for(Employee, "before_delete")
+def _manager_deleted(mapper, connection, target) -> None:
+    _invalidate_managed_departments(connection, target)
+
+def _invalidate_managed_departments(connection, manager: Employee) -> None:
+    departments = connection.execute(
+        select(Department.id, Department.organization_id).where(Department.manager_id == manager.id)
+    ).all()
+    if not departments:
+        return
+
+    def invalidate():
+        for department in departments:
+            _invalidate_cached_department(department)
+    session = object_session(manager)
+    if session is None:
+        invalidate()
+    else:
+        on_commit(session, invalidate)
+
+@router.get("/", response_model=List[DepartmentResponse], dependencies=[Depends(statement_budget(3))])
 async def get_departments(
+    request: Request,
     organization_id: UUID = None,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ):
-    """Get list of departments."""
-    query = db.query(Department)
+    """Get list of departments.
+    
+    Supports If-None-Match; unchanged lists return 304 without being loaded.
+    """
+    cache_key = ("departments", organization_id)
+    cached = cached_reference_response(request, cache_key)
+    if cached is not None:
+        return cached
+    
+    if "if-none-match" in request.headers:
+        etag = await _current_departments_etag(db, organization_id)
+        if etag_matches(request, etag):
+            return not_modified(etag)
+    
+    query = select(Department).options(*DEPARTMENT_LOAD_OPTIONS)
     if organization_id:
-        query = query.filter(Department.organization_id == organization_id)
-    departments = query.all()
-    return departments
+        query = query.where(Department.organization_id == organization_id)
+    result = await db.execute(query)
+    departments = result.scalars().all()
+    
+    # ETag from the rows actually served, so a concurrent write cannot pair it with other data
+    etag = _departments_etag(departments)
+    body = serialize(DEPARTMENT_LIST_ADAPTER, departments)
+    reference_cache.set(cache_key, (etag, body))
+    return json_response(body, etag)
 
 @router.get("/{department_id}", response_model=DepartmentResponse)
 async def get_department(
     department_id: UUID,
-    db: Session = Depends(get_db),
+    request: Request,
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ):
-    """Get department by ID."""
-    department = db.query(Department).filter(Department.id == department_id).first()
+    """Get department by ID. Supports If-None-Match."""
+    cache_key = ("department", department_id)
+    cached = cached_reference_response(request, cache_key)
+    if cached is not None:
+        return cached
+    
+    if "if-none-match" in request.headers:
+        etag = await _current_department_etag(db, department_id)
+        if etag and etag_matches(request, etag):
+            return not_modified(etag)
+    
+    department = await _get_department(db, department_id)
     if not department:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Department not found"
         )
-    return department
+    
+    etag = _department_etag(department)
+    body = serialize(DEPARTMENT_ADAPTER, department)
+    reference_cache.set(cache_key, (etag, body))
+    return json_response(body, etag)
 
 @router.post("/", response_model=DepartmentResponse)
 async def create_department(
     department_data: DepartmentCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     """Create a new department."""
     # Verify organization exists
-    organization = db.query(Organization).filter(
-        Organization.id == department_data.organization_id
-    ).first()
+    organization = await db.get(Organization, department_data.organization_id)
     if not organization:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -57,9 +179,7 @@ async def create_department(
     
     # Verify manager exists if provided
     if department_data.manager_id:
-        manager = db.query(Employee).filter(
-            Employee.id == department_data.manager_id
-        ).first()
+        manager = await db.get(Employee, department_data.manager_id)
         if not manager:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -68,20 +188,20 @@ async def create_department(
     
     db_department = Department(**department_data.model_dump())
     db.add(db_department)
-    db.commit()
-    db.refresh(db_department)
+    await db.commit()
+    _invalidate_cached_department(db_department)
     
-    return db_department
+    return await _get_department(db, db_department.id)
 
 @router.put("/{department_id}", response_model=DepartmentResponse)
 async def update_department(
     department_id: UUID,
     department_data: DepartmentUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     """Update department information."""
-    department = db.query(Department).filter(Department.id == department_id).first()
+    department = await db.get(Department, department_id)
     if not department:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -90,9 +210,7 @@ async def update_department(
     
     # Verify manager exists if provided
     if department_data.manager_id:
-        manager = db.query(Employee).filter(
-            Employee.id == department_data.manager_id
-        ).first()
+        manager = await db.get(Employee, department_data.manager_id)
         if not manager:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -103,19 +221,19 @@ async def update_department(
     for field, value in update_data.items():
         setattr(department, field, value)
     
-    db.commit()
-    db.refresh(department)
+    await db.commit()
+    _invalidate_cached_department(department)
     
-    return department
+    return await _get_department(db, department_id)
 
 @router.delete("/{department_id}", response_model=MessageResponse)
 async def delete_department(
     department_id: UUID,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     """Delete department."""
-    department = db.query(Department).filter(Department.id == department_id).first()
+    department = await db.get(Department, department_id)
     if not department:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -123,14 +241,17 @@ async def delete_department(
         )
     
     # Check if department has employees
-    employees_count = db.query(Employee).filter(Employee.department_id == department_id).count()
+    employees_count = await db.scalar(
+        select(func.count()).select_from(Employee).where(Employee.department_id == department_id)
+    )
     if employees_count > 0:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"Cannot delete department with {employees_count} employees. Please reassign employees first."
         )
     
-    db.delete(department)
-    db.commit()
+    await db.delete(department)
+    await db.commit()
+    _invalidate_cached_department(department)
     
     return {"message": "Department deleted successfully", "success": True}
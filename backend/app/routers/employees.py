@@ -1,59 +1,205 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_
+from fastapi import APIRouter, Depends, HTTPException, status, Query, UploadFile, File
+from sqlalchemy import and_, or_, case, select, func, text, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload, selectinload
 from typing import List, Optional
 from uuid import UUID
-from app.database import get_db
-from app.models import Employee, Department, Position, Organization
+from app.database import engine, get_async_db, get_read_db
+from app.models import Employee, EmployeeHierarchy, Department, Position, Organization
+from app.org_chart import is_in_chain
 from app.schemas import (
-    EmployeeCreate, EmployeeUpdate, EmployeeResponse, 
-    MessageResponse, PaginatedResponse
+    EmployeeCreate, EmployeeUpdate, EmployeeResponse, EmployeeImportReport,
+    EmployeeSubtreeNode, ReportingChainResponse, MessageResponse, PaginatedResponse
 )
+from app.employee_import import import_employees, iter_import_rows
+from app.pagination import encode_cursor, decode_cursor
+from app.serialization import FastJSONResponse, dump_rows
+from app.search import (
+    SEARCH_FIELDS, employee_search_document, ensure_search_index, like_escape
+)
+from app.statement_budget import statement_budget
 from app.routers.auth import get_current_user
 from app.models import User
 
 router = APIRouter()
 
-@router.get("/", response_model=List[EmployeeResponse])
+# Relationships embedded in EmployeeResponse, loaded with the rows instead of
+# one lazy query per row. Department and position are joined into the row
+# query; managers are fetched in one extra IN query per page.
+EMPLOYEE_LOAD_OPTIONS = (
+    joinedload(Employee.department),
+    joinedload(Employee.position),
+    selectinload(Employee.manager),
+)
+
+async def _get_employee(db: AsyncSession, employee_id: UUID) -> Optional[Employee]:
+    """Load an employee with the relationships EmployeeResponse embeds."""
+    return await db.get(
+        Employee, employee_id, options=EMPLOYEE_LOAD_OPTIONS, populate_existing=True
+    )
+
+def _filter_employees(
+    query,
+    department_id: Optional[UUID] = None,
+    employment_status: Optional[str] = None,
+    search: Optional[str] = None
+):
+    """Apply the directory filters shared by the employee listing endpoints."""
+    if department_id:
+        query = query.where(Employee.department_id == department_id)
+    
+    if employment_status:
+        query = query.where(Employee.employment_status == employment_status)
+    
+    if search:
+        # Served by the trigram index on the search document in Postgres
+        query = query.where(
+            employee_search_document().ilike(f"%{like_escape(search)}%", escape="\\")
+        )
+    
+    return query
+
+@router.get("/", response_model=List[EmployeeResponse], dependencies=[Depends(statement_budget(4))])
 async def get_employees(
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
     department_id: Optional[UUID] = None,
     employment_status: Optional[str] = None,
     search: Optional[str] = None,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ):
     """Get list of employees with filtering and pagination."""
-    query = db.query(Employee)
+    query = _filter_employees(
+        select(Employee).options(*EMPLOYEE_LOAD_OPTIONS), department_id, employment_status, search
+    )
     
-    # Apply filters
-    if department_id:
-        query = query.filter(Employee.department_id == department_id)
+    result = await db.execute(query.offset(skip).limit(limit))
+    # Up to 1000 rows: skip per-row model validation and encode with orjson
+    return FastJSONResponse(dump_rows(EmployeeResponse, result.scalars().all()))
+
+@router.get("/page", response_model=PaginatedResponse[EmployeeResponse], dependencies=[Depends(statement_budget(5))])
+async def get_employees_page(
+    cursor: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=1000),
+    department_id: Optional[UUID] = None,
+    employment_status: Optional[str] = None,
+    search: Optional[str] = None,
+    include_total: bool = False,
+    db: AsyncSession = Depends(get_read_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Get a page of employees ordered by (last_name, id) using keyset pagination.
     
-    if employment_status:
-        query = query.filter(Employee.employment_status == employment_status)
+    Pass the returned `next_cursor` back as `cursor` to fetch the following page.
+    """
+    query = _filter_employees(
+        select(Employee).options(*EMPLOYEE_LOAD_OPTIONS), department_id, employment_status, search
+    )
     
-    if search:
-        search_filter = or_(
-            Employee.first_name.ilike(f"%{search}%"),
-            Employee.last_name.ilike(f"%{search}%"),
-            Employee.email.ilike(f"%{search}%"),
-            Employee.employee_id.ilike(f"%{search}%")
+    if cursor:
+        last_name, last_id = decode_cursor(cursor, 2)
+        try:
+            last_id = UUID(last_id)
+        except ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid cursor"
+            )
+        query = query.where(tuple_(Employee.last_name, Employee.id) > (last_name, last_id))
+    
+    query = query.order_by(Employee.last_name, Employee.id).limit(limit + 1)
+    employees = (await db.execute(query)).scalars().all()
+    
+    next_cursor = None
+    if len(employees) > limit:
+        employees = employees[:limit]
+        next_cursor = encode_cursor([employees[-1].last_name, employees[-1].id])
+    
+    total = None
+    if include_total:
+        total = await _approximate_employee_count(db, department_id, employment_status, search)
+    
+    return FastJSONResponse({
+        "items": dump_rows(EmployeeResponse, employees),
+        "total": total,
+        "per_page": limit,
+        "next_cursor": next_cursor
+    })
+
+@router.get("/search", response_model=List[EmployeeResponse], dependencies=[Depends(statement_budget(5))])
+async def search_employees(
+    q: str = Query(..., min_length=1, max_length=100),
+    limit: int = Query(20, ge=1, le=100),
+    department_id: Optional[UUID] = None,
+    employment_status: Optional[str] = None,
+    db: AsyncSession = Depends(get_read_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Search employees by name, email or employee ID, best matches first.
+    
+    Prefix matches rank above fuzzy (trigram) matches. Postgres uses the
+    pg_trgm index; other databases use the in-process search index.
+    """
+    term = q.strip()
+    
+    if engine.dialect.name == "postgresql":
+        document = employee_search_document()
+        escaped = like_escape(term)
+        prefix_match = or_(*(
+            getattr(Employee, field).ilike(f"{escaped}%", escape="\\") for field in SEARCH_FIELDS
+        ))
+        rank = case((prefix_match, 1.0), else_=0.0) + func.word_similarity(term, document)
+        query = _filter_employees(
+            select(Employee).options(*EMPLOYEE_LOAD_OPTIONS), department_id, employment_status
         )
-        query = query.filter(search_filter)
+        query = query.where(or_(
+            document.ilike(f"%{escaped}%", escape="\\"),
+            document.op("%>")(term)
+        )).order_by(rank.desc(), Employee.last_name, Employee.id).limit(limit)
+        result = await db.execute(query)
+        return result.scalars().all()
     
-    employees = query.offset(skip).limit(limit).all()
-    return employees
+    index = await ensure_search_index(db)
+    filtered = bool(department_id or employment_status)
+    ranked_ids = [doc_id for doc_id, _ in index.search(term, None if filtered else limit)]
+    if not ranked_ids:
+        return []
+    query = _filter_employees(
+        select(Employee).options(*EMPLOYEE_LOAD_OPTIONS).where(Employee.id.in_(ranked_ids)),
+        department_id, employment_status
+    )
+    employees = {employee.id: employee for employee in (await db.execute(query)).scalars()}
+    return [employees[doc_id] for doc_id in ranked_ids if doc_id in employees][:limit]
+
+async def _approximate_employee_count(
+    db: AsyncSession,
+    department_id: Optional[UUID],
+    employment_status: Optional[str],
+    search: Optional[str]
+) -> int:
+    """Count matching employees, using the planner estimate for the unfiltered table."""
+    if not (department_id or employment_status or search) and engine.dialect.name == "postgresql":
+        estimate = await db.scalar(
+            text("SELECT reltuples::bigint FROM pg_class WHERE oid = 'employees'::regclass")
+        )
+        # reltuples is -1 until the table has been analyzed
+        if estimate is not None and estimate >= 0:
+            return estimate
+    
+    query = _filter_employees(
+        select(func.count()).select_from(Employee), department_id, employment_status, search
+    )
+    return await db.scalar(query)
 
 @router.get("/{employee_id}", response_model=EmployeeResponse)
 async def get_employee(
     employee_id: UUID,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ):
     """Get employee by ID."""
-    employee = db.query(Employee).filter(Employee.id == employee_id).first()
+    employee = await _get_employee(db, employee_id)
     if not employee:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -64,14 +210,14 @@ async def get_employee(
 @router.post("/", response_model=EmployeeResponse)
 async def create_employee(
     employee_data: EmployeeCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     """Create a new employee."""
     # Check if employee ID already exists
-    existing_employee = db.query(Employee).filter(
+    existing_employee = await db.scalar(select(Employee).where(
         Employee.employee_id == employee_data.employee_id
-    ).first()
+    ))
     if existing_employee:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -79,9 +225,9 @@ async def create_employee(
         )
     
     # Check if email already exists
-    existing_email = db.query(Employee).filter(
+    existing_email = await db.scalar(select(Employee).where(
         Employee.email == employee_data.email
-    ).first()
+    ))
     if existing_email:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -89,9 +235,7 @@ async def create_employee(
         )
     
     # Verify organization exists
-    organization = db.query(Organization).filter(
-        Organization.id == employee_data.organization_id
-    ).first()
+    organization = await db.get(Organization, employee_data.organization_id)
     if not organization:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -100,9 +244,7 @@ async def create_employee(
     
     # Verify department exists if provided
     if employee_data.department_id:
-        department = db.query(Department).filter(
-            Department.id == employee_data.department_id
-        ).first()
+        department = await db.get(Department, employee_data.department_id)
         if not department:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -111,9 +253,7 @@ async def create_employee(
     
     # Verify position exists if provided
     if employee_data.position_id:
-        position = db.query(Position).filter(
-            Position.id == employee_data.position_id
-        ).first()
+        position = await db.get(Position, employee_data.position_id)
         if not position:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -123,20 +263,40 @@ async def create_employee(
     # Create employee
     db_employee = Employee(**employee_data.model_dump())
     db.add(db_employee)
-    db.commit()
-    db.refresh(db_employee)
+    await db.commit()
+    
+    return await _get_employee(db, db_employee.id)
+
+@router.post("/import", response_model=EmployeeImportReport)
+async def import_employees_file(
+    file: UploadFile = File(...),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Bulk import employees from a CSV or XLSX file.
     
-    return db_employee
+    Columns match the employee create fields, plus an optional
+    `manager_employee_id` referring to a manager by employee ID. Valid rows are
+    imported and invalid rows are listed in the report with their errors.
+    """
+    try:
+        rows = iter_import_rows(file.file, file.filename or "")
+        return await import_employees(db, rows)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
 
 @router.put("/{employee_id}", response_model=EmployeeResponse)
 async def update_employee(
     employee_id: UUID,
     employee_data: EmployeeUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     """Update employee information."""
-    employee = db.query(Employee).filter(Employee.id == employee_id).first()
+    employee = await db.get(Employee, employee_id)
     if not employee:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -145,33 +305,40 @@ async def update_employee(
     
     # Check if email is being updated and already exists
     if employee_data.email and employee_data.email != employee.email:
-        existing_email = db.query(Employee).filter(
+        existing_email = await db.scalar(select(Employee).where(
             and_(Employee.email == employee_data.email, Employee.id != employee_id)
-        ).first()
+        ))
         if existing_email:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Email already exists"
             )
     
+    # Reject manager changes that would create a reporting cycle
+    if employee_data.manager_id and employee_data.manager_id != employee.manager_id:
+        if employee_data.manager_id == employee_id or await is_in_chain(db, employee_data.manager_id, employee_id):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Manager cannot report to this employee"
+            )
+    
     # Update employee fields
     update_data = employee_data.model_dump(exclude_unset=True)
     for field, value in update_data.items():
         setattr(employee, field, value)
     
-    db.commit()
-    db.refresh(employee)
+    await db.commit()
     
-    return employee
+    return await _get_employee(db, employee_id)
 
 @router.delete("/{employee_id}", response_model=MessageResponse)
 async def delete_employee(
     employee_id: UUID,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     """Delete employee (soft delete by setting employment_status to terminated)."""
-    employee = db.query(Employee).filter(Employee.id == employee_id).first()
+    employee = await db.get(Employee, employee_id)
     if not employee:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -184,26 +351,74 @@ async def delete_employee(
     employee.employment_status = EmploymentStatus.terminated
     employee.termination_date = date.today()
     
-    db.commit()
+    await db.commit()
     
     return {"message": "Employee terminated successfully", "success": True}
 
 @router.get("/search/by-manager/{manager_id}", response_model=List[EmployeeResponse])
 async def get_employees_by_manager(
     manager_id: UUID,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ):
     """Get all employees under a specific manager."""
-    employees = db.query(Employee).filter(Employee.manager_id == manager_id).all()
-    return employees
+    result = await db.execute(
+        select(Employee).options(*EMPLOYEE_LOAD_OPTIONS).where(Employee.manager_id == manager_id)
+    )
+    return result.scalars().all()
+
+@router.get("/{employee_id}/subtree", response_model=List[EmployeeSubtreeNode])
+async def get_employee_subtree(
+    employee_id: UUID,
+    max_depth: int = Query(10, ge=1, le=100),
+    db: AsyncSession = Depends(get_read_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Get everyone reporting to an employee, directly or indirectly, up to max_depth levels."""
+    employee = await db.get(Employee, employee_id)
+    if not employee:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Employee not found"
+        )
+    
+    result = await db.execute(
+        select(Employee, EmployeeHierarchy.depth)
+        .options(*EMPLOYEE_LOAD_OPTIONS)
+        .join(EmployeeHierarchy, EmployeeHierarchy.descendant_id == Employee.id)
+        .where(
+            EmployeeHierarchy.ancestor_id == employee_id,
+            EmployeeHierarchy.depth.between(1, max_depth)
+        )
+        .order_by(EmployeeHierarchy.depth, Employee.last_name, Employee.id)
+    )
+    return [
+        {**EmployeeResponse.model_validate(report).model_dump(), "depth": depth}
+        for report, depth in result.all()
+    ]
+
+@router.get("/{employee_id}/reports-to/{manager_id}", response_model=ReportingChainResponse)
+async def check_reporting_chain(
+    employee_id: UUID,
+    manager_id: UUID,
+    db: AsyncSession = Depends(get_read_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Check whether an employee is anywhere in a manager's reporting chain."""
+    return {
+        "employee_id": employee_id,
+        "manager_id": manager_id,
+        "reports_to": await is_in_chain(db, employee_id, manager_id)
+    }
 
-@router.get("/department/{department_id}", response_model=List[EmployeeResponse])
+@router.get("/department/{department_id}", response_model=List[EmployeeResponse], dependencies=[Depends(statement_budget(4))])
 async def get_employees_by_department(
     department_id: UUID,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ):
     """Get all employees in a specific department."""
-    employees = db.query(Employee).filter(Employee.department_id == department_id).all()
-    return employees
+    result = await db.execute(
+        select(Employee).options(*EMPLOYEE_LOAD_OPTIONS).where(Employee.department_id == department_id)
+    )
+    return FastJSONResponse(dump_rows(EmployeeResponse, result.scalars().all()))
@@ -0,0 +1,27 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from uuid import UUID
+from app.database import get_async_db
+from app.jobs import job_status
+from app.models import Job
+from app.schemas import JobResponse
+from app.routers.auth import get_current_user
+from app.models import User
+
+router = APIRouter()
+
+# Reads the primary: progress polled from a lagging replica would jump backwards
+@router.get("/{job_id}", response_model=JobResponse)
+async def get_job(
+    job_id: UUID,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Get a background job's status, progress and, once finished, its result or error."""
+    job = await db.get(Job, job_id)
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Job not found"
+        )
+    return job_status(job)
@@ -1,8 +1,361 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends, HTTPException, Request, status, Query
+from pydantic import TypeAdapter
+from sqlalchemy import func, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
+from uuid import UUID
+from datetime import date, datetime
+from decimal import Decimal
+from app.database import get_async_db, get_read_db
+from app.leave import (
+    ACTIVE_STATUSES, TRANSITIONS, accrue_leave, adjust_balance, carry_forward_leave, ensure_balance,
+    leave_days, leave_period_overlaps, transition_deltas
+)
+from app.models import (
+    Employee, EmployeeHierarchy, LeaveBalance, LeaveRequest, LeaveStatus, LeaveType, Organization
+)
+from app.schemas import (
+    LeaveAccrualRequest, LeaveBalanceJobResponse, LeaveBalanceResponse, LeaveCalendarEntry,
+    LeaveCarryForwardRequest, LeaveRequestCreate, LeaveRequestResponse, LeaveRequestUpdate, LeaveTypeResponse
+)
+from app.http_cache import (
+    cached_reference_response, etag_matches, json_response, not_modified, reference_cache, serialize, weak_etag
+)
+from app.routers.auth import get_current_user
+from app.models import User
 
 router = APIRouter()
 
-# Leave management endpoints will be implemented here
-@router.get("/")
-async def get_leave_requests():
-    return {"message": "Leave management endpoints coming soon"}
+LEAVE_TYPE_LIST_ADAPTER = TypeAdapter(List[LeaveTypeResponse])
+
+def _active_leave_types(query, organization_id: UUID):
+    return query.where(LeaveType.organization_id == organization_id, LeaveType.is_active.is_(True))
+
+async def _get_organization(db: AsyncSession, organization_id: UUID) -> Organization:
+    organization = await db.get(Organization, organization_id)
+    if not organization:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Organization not found"
+        )
+    return organization
+
+@router.get("/", response_model=List[LeaveRequestResponse])
+async def get_leave_requests(
+    employee_id: Optional[UUID] = None,
+    leave_type_id: Optional[UUID] = None,
+    leave_status: Optional[LeaveStatus] = Query(None, alias="status"),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
+    db: AsyncSession = Depends(get_read_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Get leave requests with filtering."""
+    query = select(LeaveRequest)
+    if employee_id:
+        query = query.where(LeaveRequest.employee_id == employee_id)
+    if leave_type_id:
+        query = query.where(LeaveRequest.leave_type_id == leave_type_id)
+    if leave_status:
+        query = query.where(LeaveRequest.status == leave_status)
+
+    query = query.order_by(LeaveRequest.start_date.desc(), LeaveRequest.id)
+    result = await db.execute(query.offset(skip).limit(limit))
+    return result.scalars().all()
+
+@router.get("/types", response_model=List[LeaveTypeResponse])
+async def get_leave_types(
+    organization_id: UUID,
+    request: Request,
+    db: AsyncSession = Depends(get_read_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Get the active leave types of an organization. Supports If-None-Match."""
+    cache_key = ("leave_types", organization_id)
+    cached = cached_reference_response(request, cache_key)
+    if cached is not None:
+        return cached
+
+    if "if-none-match" in request.headers:
+        counts = await db.execute(_active_leave_types(
+            select(func.count(LeaveType.id), func.max(LeaveType.updated_at)), organization_id
+        ))
+        etag = weak_etag(*counts.one())
+        if etag_matches(request, etag):
+            return not_modified(etag)
+
+    result = await db.execute(
+        _active_leave_types(select(LeaveType), organization_id).order_by(LeaveType.name)
+    )
+    leave_types = result.scalars().all()
+    etag = weak_etag(
+        len(leave_types), max((leave_type.updated_at for leave_type in leave_types), default=None)
+    )
+    body = serialize(LEAVE_TYPE_LIST_ADAPTER, leave_types)
+    reference_cache.set(cache_key, (etag, body))
+    return json_response(body, etag)
+
+@router.get("/calendar", response_model=List[LeaveCalendarEntry])
+async def get_leave_calendar(
+    start_date: date,
+    end_date: date,
+    department_id: Optional[UUID] = None,
+    manager_id: Optional[UUID] = None,
+    include_pending: bool = False,
+    db: AsyncSession = Depends(get_read_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Who is out between two dates, optionally limited to a department or a manager's reporting tree."""
+    if end_date < start_date:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="End date must not be before start date"
+        )
+
+    query = select(
+        LeaveRequest.id.label("leave_request_id"),
+        LeaveRequest.employee_id,
+        Employee.first_name,
+        Employee.last_name,
+        LeaveRequest.leave_type_id,
+        LeaveRequest.start_date,
+        LeaveRequest.end_date,
+        LeaveRequest.status
+    ).join(Employee, Employee.id == LeaveRequest.employee_id).where(
+        LeaveRequest.status.in_(ACTIVE_STATUSES if include_pending else (LeaveStatus.approved,)),
+        leave_period_overlaps(start_date, end_date)
+    )
+    if department_id:
+        query = query.where(Employee.department_id == department_id)
+    if manager_id:
+        query = query.join(
+            EmployeeHierarchy, EmployeeHierarchy.descendant_id == LeaveRequest.employee_id
+        ).where(
+            EmployeeHierarchy.ancestor_id == manager_id,
+            EmployeeHierarchy.depth > 0
+        )
+
+    result = await db.execute(
+        query.order_by(LeaveRequest.start_date, Employee.last_name, LeaveRequest.id)
+    )
+    return result.mappings().all()
+
+@router.get("/balances", response_model=List[LeaveBalanceResponse])
+async def get_leave_balances(
+    employee_id: UUID,
+    year: Optional[int] = None,
+    db: AsyncSession = Depends(get_read_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Get an employee's balance for every leave type in a year (default current year)."""
+    result = await db.execute(
+        select(LeaveBalance).where(
+            LeaveBalance.employee_id == employee_id,
+            LeaveBalance.year == (year or date.today().year)
+        )
+    )
+    return result.scalars().all()
+
+@router.get("/balances/{employee_id}/{leave_type_id}", response_model=LeaveBalanceResponse)
+async def get_leave_balance(
+    employee_id: UUID,
+    leave_type_id: UUID,
+    year: Optional[int] = None,
+    db: AsyncSession = Depends(get_read_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Get one leave balance (default current year)."""
+    balance = await db.scalar(
+        select(LeaveBalance).where(
+            LeaveBalance.employee_id == employee_id,
+            LeaveBalance.leave_type_id == leave_type_id,
+            LeaveBalance.year == (year or date.today().year)
+        )
+    )
+    if not balance:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Leave balance not found"
+        )
+    return balance
+
+@router.post("/balances/accrue", response_model=LeaveBalanceJobResponse)
+async def run_leave_accrual(
+    accrual_data: LeaveAccrualRequest,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Recompute accrued days for every employee and leave type of an organization."""
+    await _get_organization(db, accrual_data.organization_id)
+    return await accrue_leave(db, accrual_data.organization_id, accrual_data.year, accrual_data.as_of)
+
+@router.post("/balances/carry-forward", response_model=LeaveBalanceJobResponse)
+async def run_leave_carry_forward(
+    carry_data: LeaveCarryForwardRequest,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Carry unused days of a year into the next one for an organization."""
+    await _get_organization(db, carry_data.organization_id)
+    return await carry_forward_leave(db, carry_data.organization_id, carry_data.from_year, carry_data.max_days)
+
+@router.get("/{request_id}", response_model=LeaveRequestResponse)
+async def get_leave_request(
+    request_id: UUID,
+    db: AsyncSession = Depends(get_read_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Get leave request by ID."""
+    leave_request = await db.get(LeaveRequest, request_id)
+    if not leave_request:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Leave request not found"
+        )
+    return leave_request
+
+@router.post("/", response_model=LeaveRequestResponse)
+async def create_leave_request(
+    leave_data: LeaveRequestCreate,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Create a leave request, holding its days against the employee's balance."""
+    if leave_data.end_date < leave_data.start_date:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="End date must not be before start date"
+        )
+
+    # The balance is charged what the dates cover, never what the client claims
+    total_days = leave_days(leave_data.start_date, leave_data.end_date)
+    if total_days == 0:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Leave request covers no working days"
+        )
+    if leave_data.total_days is not None and leave_data.total_days != total_days:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"total_days must be {total_days}, the working days from start date to end date"
+        )
+
+    employee = await db.get(Employee, leave_data.employee_id)
+    if not employee:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Employee not found"
+        )
+
+    leave_type = await db.get(LeaveType, leave_data.leave_type_id)
+    if not leave_type or not leave_type.is_active:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Leave type not found"
+        )
+
+    overlapping = await db.scalar(
+        select(LeaveRequest.id).where(
+            LeaveRequest.employee_id == employee.id,
+            LeaveRequest.status.in_(ACTIVE_STATUSES),
+            leave_period_overlaps(leave_data.start_date, leave_data.end_date)
+        ).limit(1)
+    )
+    if overlapping:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Leave request overlaps an existing leave request"
+        )
+
+    new_status = LeaveStatus.pending if leave_type.requires_approval else LeaveStatus.approved
+    year = leave_data.start_date.year
+
+    # Leave types without a yearly allowance are tracked but never run out
+    await ensure_balance(db, employee, leave_type, year)
+    held = await adjust_balance(
+        db, employee.id, leave_type.id, year,
+        transition_deltas(total_days, None, new_status),
+        require_available=Decimal(total_days) if leave_type.max_days_per_year is not None else None
+    )
+    if not held:
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Insufficient leave balance"
+        )
+
+    leave_request = LeaveRequest(
+        **leave_data.model_dump(exclude={"total_days"}), total_days=total_days, status=new_status
+    )
+    if new_status == LeaveStatus.approved:
+        leave_request.approved_at = datetime.utcnow()
+    db.add(leave_request)
+    try:
+        await db.commit()
+    except IntegrityError:
+        # A concurrent overlapping request won the exclusion constraint
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Leave request overlaps an existing leave request"
+        )
+    await db.refresh(leave_request)
+
+    return leave_request
+
+@router.put("/{request_id}", response_model=LeaveRequestResponse)
+async def update_leave_request(
+    request_id: UUID,
+    leave_data: LeaveRequestUpdate,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Approve, reject or cancel a leave request, updating the balance in the same transaction."""
+    leave_request = await db.get(LeaveRequest, request_id)
+    if not leave_request:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Leave request not found"
+        )
+
+    old_status, new_status = leave_request.status, leave_data.status
+    values = leave_data.model_dump(exclude_unset=True, exclude={"status"})
+    if new_status and new_status != old_status:
+        if new_status not in TRANSITIONS.get(old_status, ()):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Cannot change a {old_status.value} leave request to {new_status.value}"
+            )
+        values["status"] = new_status
+        if new_status == LeaveStatus.approved:
+            values["approved_by"] = current_user.employee_id
+            values["approved_at"] = datetime.utcnow()
+
+    if values:
+        # Conditional on the status read above so concurrent reviews cannot both apply
+        table = LeaveRequest.__table__
+        result = await db.execute(
+            update(table)
+            .where(table.c.id == request_id, table.c.status == old_status)
+            .values(**values)
+        )
+        if result.rowcount != 1:
+            await db.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="Leave request was changed by another request, please retry"
+            )
+        if "status" in values:
+            employee = await db.get(Employee, leave_request.employee_id)
+            leave_type = await db.get(LeaveType, leave_request.leave_type_id)
+            await ensure_balance(db, employee, leave_type, leave_request.start_date.year)
+            await adjust_balance(
+                db, leave_request.employee_id, leave_request.leave_type_id,
+                leave_request.start_date.year,
+                transition_deltas(leave_request.total_days, old_status, new_status)
+            )
+        await db.commit()
+
+    await db.refresh(leave_request)
+    return leave_request
@@ -1,8 +1,105 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends, HTTPException, status, Query
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
+from uuid import UUID
+from datetime import date
+from app.database import get_async_db, get_read_db
+from app.models import Organization, Payroll
+from app.jobs import enqueue, job_status
+from app.payroll import run_payroll
+from app.schemas import JobResponse, PayrollResponse, PayrollRunRequest, PayrollRunResponse
+from app.routers.auth import get_current_user
+from app.models import User
 
 router = APIRouter()
 
-# Payroll management endpoints will be implemented here
-@router.get("/")
-async def get_payroll_records():
-    return {"message": "Payroll endpoints coming soon"}
+@router.get("/", response_model=List[PayrollResponse])
+async def get_payroll_records(
+    employee_id: Optional[UUID] = None,
+    pay_period_start: Optional[date] = None,
+    pay_period_end: Optional[date] = None,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
+    db: AsyncSession = Depends(get_read_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Get payroll records with filtering."""
+    query = select(Payroll)
+    if employee_id:
+        query = query.where(Payroll.employee_id == employee_id)
+    if pay_period_start:
+        query = query.where(Payroll.pay_period_start == pay_period_start)
+    if pay_period_end:
+        query = query.where(Payroll.pay_period_end == pay_period_end)
+    
+    query = query.order_by(Payroll.pay_period_start.desc(), Payroll.employee_id)
+    result = await db.execute(query.offset(skip).limit(limit))
+    return result.scalars().all()
+
+@router.post("/run", response_model=PayrollRunResponse)
+async def create_payroll_run(
+    run_data: PayrollRunRequest,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Compute payroll for every eligible employee of an organization for one pay period.
+    
+    Safe to repeat: draft payslips for the period are recomputed in place and
+    processed payslips are left untouched.
+    """
+    if run_data.pay_period_end < run_data.pay_period_start:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Pay period end must not be before its start"
+        )
+    
+    organization = await db.get(Organization, run_data.organization_id)
+    if not organization:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Organization not found"
+        )
+    
+    return await run_payroll(
+        db,
+        run_data.organization_id,
+        run_data.pay_period_start,
+        run_data.pay_period_end,
+        recompute_drafts=run_data.recompute_drafts
+    )
+
+@router.post("/run/background", response_model=JobResponse, status_code=status.HTTP_202_ACCEPTED)
+async def queue_payroll_run(
+    run_data: PayrollRunRequest,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Queue a payroll run for a worker; poll /api/jobs/{id} for progress and the run summary.
+    
+    While a run for the same organization and period is queued or running,
+    that job is returned instead of a new one.
+    """
+    if run_data.pay_period_end < run_data.pay_period_start:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Pay period end must not be before its start"
+        )
+    
+    organization = await db.get(Organization, run_data.organization_id)
+    if not organization:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Organization not found"
+        )
+    
+    job = await enqueue(
+        db,
+        "payroll.run",
+        run_data.model_dump(mode="json"),
+        unique_key=(
+            f"payroll:{run_data.organization_id}:{run_data.pay_period_start}:{run_data.pay_period_end}"
+        ),
+        created_by=current_user.id
+    )
+    return job_status(job)
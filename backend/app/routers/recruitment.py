@@ -1,8 +1,76 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends, HTTPException, status, Query
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
+from uuid import UUID
+from app.config import settings
+from app.database import get_async_db, get_read_db
+from app.models import JobApplication, JobPosting, RecruitmentStatus
+from app.jobs import enqueue, job_status
+from app.schemas import JobApplicationResponse, JobResponse
+from app.routers.auth import get_current_user
+from app.models import User
 
 router = APIRouter()
 
-# Recruitment endpoints will be implemented here
-@router.get("/")
-async def get_job_applications():
-    return {"message": "Recruitment endpoints coming soon"}
+@router.get("/", response_model=List[JobApplicationResponse])
+async def get_job_applications(
+    job_posting_id: Optional[UUID] = None,
+    application_status: Optional[RecruitmentStatus] = Query(None, alias="status"),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
+    db: AsyncSession = Depends(get_read_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Get job applications, best screening scores first."""
+    query = select(JobApplication)
+    if job_posting_id:
+        query = query.where(JobApplication.job_posting_id == job_posting_id)
+    if application_status:
+        query = query.where(JobApplication.status == application_status)
+    
+    query = query.order_by(
+        JobApplication.ai_screening_score.desc().nulls_last(), JobApplication.applied_date, JobApplication.id
+    )
+    result = await db.execute(query.offset(skip).limit(limit))
+    return result.scalars().all()
+
+@router.post(
+    "/postings/{job_posting_id}/screen",
+    response_model=JobResponse,
+    status_code=status.HTTP_202_ACCEPTED
+)
+async def screen_job_posting(
+    job_posting_id: UUID,
+    rescreen: bool = False,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Queue AI screening of a posting's pending applications.
+    
+    A worker scores them on its screening process pool; poll
+    /api/jobs/{id} for progress. Results appear in ai_screening_score and
+    ai_screening_notes. While a screening of the posting is queued or
+    running, that job is returned instead of a new one.
+    """
+    if not settings.AI_SCREENING_ENABLED:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="AI screening is disabled"
+        )
+    
+    posting = await db.get(JobPosting, job_posting_id)
+    if not posting:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Job posting not found"
+        )
+    
+    job = await enqueue(
+        db,
+        "screening.posting",
+        {"job_posting_id": job_posting_id, "rescreen": rescreen},
+        unique_key=f"screening:{job_posting_id}",
+        created_by=current_user.id
+    )
+    return job_status(job)
@@ -0,0 +1,52 @@
+"""Schema version check.
+
+The schema is managed only by the Alembic migrations in backend/alembic.
+Processes never create or reflect tables when they start: they read the
+database's revision from alembic_version (one query) and refuse to start
+unless it is the newest migration. Apply migrations from the backend
+directory before starting new code:
+    alembic upgrade head
+"""
+from functools import lru_cache
+from pathlib import Path
+from typing import Optional
+from alembic import command
+from alembic.config import Config
+from alembic.runtime.migration import MigrationContext
+from alembic.script import ScriptDirectory
+from app.database import engine
+
+ALEMBIC_INI = Path(__file__).resolve().parent.parent / "alembic.ini"
+
+class SchemaVersionError(RuntimeError):
+    """The database is not at the migration head this code expects."""
+
+def alembic_config() -> Config:
+    config = Config(str(ALEMBIC_INI))
+    # Keep the application's logging configuration
+    config.attributes["configure_logger"] = False
+    return config
+
+@lru_cache(maxsize=1)
+def head_revision() -> str:
+    """Newest migration shipped with the code."""
+    return ScriptDirectory.from_config(alembic_config()).get_current_head()
+
+def current_revision() -> Optional[str]:
+    """Revision the database was migrated to, or None when it was never migrated."""
+    with engine.connect() as connection:
+        return MigrationContext.configure(connection).get_current_revision()
+
+def check_schema() -> str:
+    """Return the database revision; raise SchemaVersionError unless it is the head."""
+    expected, current = head_revision(), current_revision()
+    if current != expected:
+        raise SchemaVersionError(
+            f"Database schema is at revision {current or '(none)'}, this code expects {expected}; "
+            "run `alembic upgrade head` from the backend directory"
+        )
+    return current
+
+def upgrade_to_head() -> None:
+    """Apply pending migrations (for tooling such as benchmarks/seed.py)."""
+    command.upgrade(alembic_config(), "head")
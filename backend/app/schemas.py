@@ -1,12 +1,14 @@
 from pydantic import BaseModel, EmailStr, Field, ConfigDict
-from typing import Optional, List
+from typing import Any, Optional, List, Dict, Generic, Literal, TypeVar
 from datetime import datetime, date
 from uuid import UUID
 from app.models import (
     EmploymentStatus, EmploymentType, Gender, MaritalStatus,
-    LeaveStatus, AttendanceStatus, RecruitmentStatus, PerformanceRating
+    LeaveStatus, AttendanceStatus, RecruitmentStatus, PerformanceRating, JobStatus
 )
 
+T = TypeVar("T")
+
 # Base schemas
 class TimestampMixin(BaseModel):
     created_at: datetime
@@ -38,6 +40,24 @@ class OrganizationResponse(OrganizationBase, TimestampMixin):
     id: UUID
     model_config = ConfigDict(from_attributes=True)
 
+# Summaries of related objects embedded in responses
+class EmployeeSummary(BaseModel):
+    id: UUID
+    employee_id: str
+    first_name: str
+    last_name: str
+    model_config = ConfigDict(from_attributes=True)
+
+class DepartmentSummary(BaseModel):
+    id: UUID
+    name: str
+    model_config = ConfigDict(from_attributes=True)
+
+class PositionSummary(BaseModel):
+    id: UUID
+    title: str
+    model_config = ConfigDict(from_attributes=True)
+
 # Department schemas
 class DepartmentBase(BaseModel):
     name: str = Field(..., min_length=1, max_length=255)
@@ -58,6 +78,7 @@ class DepartmentResponse(DepartmentBase, TimestampMixin):
     id: UUID
     organization_id: UUID
     manager_id: Optional[UUID] = None
+    manager: Optional[EmployeeSummary] = None
     model_config = ConfigDict(from_attributes=True)
 
 # Employee schemas
@@ -89,6 +110,7 @@ class EmployeeCreate(EmployeeBase):
     manager_id: Optional[UUID] = None
     hire_date: date
     employment_type: EmploymentType
+    base_salary: Optional[float] = Field(None, ge=0)
 
 class EmployeeUpdate(BaseModel):
     first_name: Optional[str] = None
@@ -111,6 +133,7 @@ class EmployeeUpdate(BaseModel):
     employment_status: Optional[EmploymentStatus] = None
     termination_date: Optional[date] = None
     termination_reason: Optional[str] = None
+    base_salary: Optional[float] = Field(None, ge=0)
     emergency_contact_name: Optional[str] = None
     emergency_contact_phone: Optional[str] = None
     emergency_contact_relationship: Optional[str] = None
@@ -129,8 +152,29 @@ class EmployeeResponse(EmployeeBase, TimestampMixin):
     employment_status: EmploymentStatus
     termination_date: Optional[date] = None
     termination_reason: Optional[str] = None
+    department: Optional[DepartmentSummary] = None
+    position: Optional[PositionSummary] = None
+    manager: Optional[EmployeeSummary] = None
     model_config = ConfigDict(from_attributes=True)
 
+class EmployeeSubtreeNode(EmployeeResponse):
+    depth: int
+
+class ReportingChainResponse(BaseModel):
+    employee_id: UUID
+    manager_id: UUID
+    reports_to: bool
+
+class EmployeeImportError(BaseModel):
+    row: int
+    errors: List[str]
+
+class EmployeeImportReport(BaseModel):
+    total_rows: int
+    imported: int
+    failed: int
+    errors: List[EmployeeImportError]
+
 # User schemas
 class UserBase(BaseModel):
     username: str = Field(..., min_length=3, max_length=100)
@@ -195,6 +239,80 @@ class AttendanceResponse(AttendanceBase, TimestampMixin):
     total_hours: Optional[float] = None
     model_config = ConfigDict(from_attributes=True)
 
+class AttendanceEvent(BaseModel):
+    employee_id: UUID
+    event_type: Literal["check_in", "check_out"]
+    timestamp: datetime
+    date: Optional[date] = None  # defaults to the timestamp's date
+    status: AttendanceStatus = AttendanceStatus.present
+    break_duration: Optional[int] = Field(None, ge=0)
+    location: Optional[str] = None
+
+class AttendanceBulkRequest(BaseModel):
+    events: List[AttendanceEvent] = Field(..., min_length=1, max_length=10000)
+
+class AttendanceBulkItemResult(BaseModel):
+    index: int
+    success: bool
+    attendance_id: Optional[UUID] = None
+    detail: Optional[str] = None
+
+class AttendanceBulkResponse(BaseModel):
+    accepted: int
+    rejected: int
+    results: List[AttendanceBulkItemResult]
+
+class AttendanceSummaryResponse(BaseModel):
+    employee_id: UUID
+    month: date  # first day of the month
+    days_recorded: int
+    present_days: int
+    late_days: int
+    absent_days: int
+    half_days: int
+    remote_days: int
+    total_hours: float
+    model_config = ConfigDict(from_attributes=True)
+
+# Payroll schemas
+class PayrollRunRequest(BaseModel):
+    organization_id: UUID
+    pay_period_start: date
+    pay_period_end: date
+    recompute_drafts: bool = True  # False resumes a run, skipping employees already computed
+
+class PayrollRunResponse(BaseModel):
+    organization_id: UUID
+    pay_period_start: date
+    pay_period_end: date
+    employees: int
+    written: int
+    skipped_processed: int
+    chunks: int
+    total_gross: float
+    total_net: float
+
+class PayrollResponse(TimestampMixin):
+    id: UUID
+    employee_id: UUID
+    pay_period_start: date
+    pay_period_end: date
+    basic_salary: float
+    allowances: float
+    overtime_pay: float
+    bonus: float
+    gross_pay: float
+    tax_deduction: float
+    insurance_deduction: float
+    retirement_deduction: float
+    other_deductions: float
+    total_deductions: float
+    net_pay: float
+    is_processed: bool
+    processed_at: Optional[datetime] = None
+    processed_by: Optional[UUID] = None
+    model_config = ConfigDict(from_attributes=True)
+
 # Leave schemas
 class LeaveTypeBase(BaseModel):
     name: str = Field(..., min_length=1, max_length=100)
@@ -216,12 +334,13 @@ class LeaveTypeResponse(LeaveTypeBase, TimestampMixin):
 class LeaveRequestBase(BaseModel):
     start_date: date
     end_date: date
-    total_days: int
     reason: str = Field(..., min_length=1)
 
 class LeaveRequestCreate(LeaveRequestBase):
     employee_id: UUID
     leave_type_id: UUID
+    # Counted by the server from the dates; a request with a different value is rejected
+    total_days: Optional[int] = Field(None, gt=0)
 
 class LeaveRequestUpdate(BaseModel):
     status: Optional[LeaveStatus] = None
@@ -231,12 +350,50 @@ class LeaveRequestResponse(LeaveRequestBase, TimestampMixin):
     id: UUID
     employee_id: UUID
     leave_type_id: UUID
+    total_days: int
     status: LeaveStatus
     approved_by: Optional[UUID] = None
     approved_at: Optional[datetime] = None
     rejection_reason: Optional[str] = None
     model_config = ConfigDict(from_attributes=True)
 
+class LeaveCalendarEntry(BaseModel):
+    leave_request_id: UUID
+    employee_id: UUID
+    first_name: str
+    last_name: str
+    leave_type_id: UUID
+    start_date: date
+    end_date: date
+    status: LeaveStatus
+
+class LeaveBalanceResponse(BaseModel):
+    employee_id: UUID
+    leave_type_id: UUID
+    year: int
+    accrued_days: float
+    carried_forward_days: float
+    used_days: float
+    pending_days: float
+    available_days: float
+    updated_at: Optional[datetime] = None
+    model_config = ConfigDict(from_attributes=True)
+
+class LeaveAccrualRequest(BaseModel):
+    organization_id: UUID
+    year: int
+    as_of: Optional[date] = None  # Monthly accrual counts months up to this date (default today)
+
+class LeaveCarryForwardRequest(BaseModel):
+    organization_id: UUID
+    from_year: int
+    max_days: Optional[float] = Field(None, ge=0)  # Defaults to LEAVE_CARRY_FORWARD_MAX_DAYS
+
+class LeaveBalanceJobResponse(BaseModel):
+    organization_id: UUID
+    year: int
+    balances: int
+
 # Job Application schemas
 class JobApplicationBase(BaseModel):
     first_name: str = Field(..., min_length=1, max_length=100)
@@ -309,14 +466,47 @@ class PerformanceReviewResponse(PerformanceReviewBase, TimestampMixin):
     completed_date: Optional[date] = None
     model_config = ConfigDict(from_attributes=True)
 
+# Dashboard schemas
+class DepartmentHeadcount(BaseModel):
+    department_id: Optional[UUID] = None
+    department_name: Optional[str] = None
+    employees: int
+
+class DashboardSummaryResponse(BaseModel):
+    date: date
+    total_employees: int
+    headcount_by_department: List[DepartmentHeadcount]
+    attendance_today: Dict[str, int]  # status -> count, plus "not_recorded"
+    pending_leave_requests: int
+    open_job_applications: int
+    refreshed_at: datetime
+
 # Generic response schemas
 class MessageResponse(BaseModel):
     message: str
     success: bool = True
 
-class PaginatedResponse(BaseModel):
-    items: List
-    total: int
-    page: int
+class PaginatedResponse(BaseModel, Generic[T]):
+    items: List[T]
+    total: Optional[int] = None
+    page: Optional[int] = None
     per_page: int
-    pages: int
+    pages: Optional[int] = None
+    next_cursor: Optional[str] = None
+
+# Background job schemas
+class JobResponse(BaseModel):
+    id: UUID
+    kind: str
+    status: JobStatus
+    attempts: int
+    max_attempts: int
+    progress: int  # percent
+    progress_message: Optional[str] = None
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None  # last failure, kept while a retry is pending
+    run_after: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    created_by: Optional[UUID] = None
+    created_at: datetime
@@ -0,0 +1,234 @@
+"""Resume screening for job applications.
+
+All pending applications of a posting are scored in one pass: the posting
+and the resumes are vectorized into a TF-IDF sparse matrix (in batches of
+AI_SCREENING_BATCH_SIZE resumes) and each batch is scored against the
+posting with a single sparse matrix product. Rows are L2-normalized, so the
+product is the cosine similarity, stored as a 0-100 score together with the
+terms that contributed most.
+
+Vectorizing runs on a process pool, so screening never holds the GIL of a
+worker serving requests. With AI_MODEL_PATH set, a TfidfVectorizer fitted
+offline on a larger corpus (saved with joblib) supplies the vocabulary and
+IDF weights; otherwise they are fitted per posting.
+
+The API queues screening as a "screening.posting" job (see app/jobs.py);
+screen a posting directly from the backend directory with:
+    python -m app.screening <job_posting_id> [--rescreen]
+"""
+import argparse
+import asyncio
+import json
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from functools import lru_cache
+from pathlib import Path
+from typing import Awaitable, Callable, List, Optional, Tuple
+from uuid import UUID
+import numpy as np
+from sqlalchemy import Numeric, Text, Uuid, bindparam, cast, column, select, update, values
+from app.config import settings
+from app.database import engine
+from app.jobs import PermanentJobError, job_handler
+from app.models import JobApplication, JobPosting, RecruitmentStatus
+
+# Applications screened and written per UPDATE batch
+UPDATE_CHUNK_SIZE = 1000
+
+# Contributing terms listed in ai_screening_notes
+NOTE_TERMS = 8
+
+# Resume files read from UPLOAD_DIRECTORY; anything else falls back to the cover letter
+TEXT_RESUME_SUFFIXES = {".txt", ".md"}
+
+_executor: Optional[ProcessPoolExecutor] = None
+
+def get_executor() -> ProcessPoolExecutor:
+    """The screening process pool, started on first use."""
+    global _executor
+    if _executor is None:
+        # spawn, not fork: forking a server process with live threads and sockets is unsafe
+        _executor = ProcessPoolExecutor(
+            max_workers=settings.AI_SCREENING_WORKERS, mp_context=multiprocessing.get_context("spawn")
+        )
+    return _executor
+
+def shutdown_executor() -> None:
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+
+@lru_cache(maxsize=1)
+def _pretrained_vectorizer(model_path: str):
+    import joblib
+    return joblib.load(model_path)
+
+def _vectorizer(model_path: Optional[str]):
+    if model_path:
+        return _pretrained_vectorizer(model_path), False
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    return TfidfVectorizer(
+        stop_words="english", sublinear_tf=True, ngram_range=(1, 2), min_df=1, dtype=np.float32
+    ), True
+
+def score_resumes(
+    job_text: str,
+    resumes: List[str],
+    batch_size: int,
+    model_path: Optional[str] = None
+) -> List[Tuple[float, str]]:
+    """Score resumes against a job description. Runs in a screening worker process.
+
+    Returns (score 0-100, notes) per resume, in input order.
+    """
+    if not resumes:
+        return []
+    vectorizer, fit = _vectorizer(model_path)
+    if fit:
+        # IDF over the posting's own corpus; unseen terms cannot match anyway
+        vectorizer.fit([job_text, *resumes])
+    terms = vectorizer.get_feature_names_out()
+    job_vector = vectorizer.transform([job_text])
+
+    results = []
+    for start in range(0, len(resumes), batch_size):
+        batch = vectorizer.transform(resumes[start:start + batch_size])
+        # One sparse product per batch: cosine similarity of every resume with the posting
+        similarity = np.asarray((batch @ job_vector.T).todense()).ravel()
+        contributions = batch.multiply(job_vector).tocsr()
+        for row, score in enumerate(similarity):
+            values = contributions.data[contributions.indptr[row]:contributions.indptr[row + 1]]
+            columns = contributions.indices[contributions.indptr[row]:contributions.indptr[row + 1]]
+            top = columns[np.argsort(values)[::-1][:NOTE_TERMS]]
+            notes = f"Matched terms: {', '.join(terms[top])}" if len(top) else "No matching terms"
+            results.append((round(float(score) * 100, 2), notes))
+    return results
+
+def posting_text(posting: JobPosting) -> str:
+    return "\n".join(part for part in (posting.title, posting.description, posting.requirements) if part)
+
+def resume_text(application) -> str:
+    """Resume text of an application: a text resume under UPLOAD_DIRECTORY, else the cover letter."""
+    if application.resume_url:
+        upload_dir = Path(settings.UPLOAD_DIRECTORY).resolve()
+        path = (upload_dir / application.resume_url.lstrip("/")).resolve()
+        if path.suffix.lower() in TEXT_RESUME_SUFFIXES and upload_dir in path.parents and path.is_file():
+            return path.read_text(encoding="utf-8", errors="ignore")
+    return application.cover_letter or ""
+
+async def _write_scores(db, rows: List[dict], screened_at: datetime) -> None:
+    table = JobApplication.__table__
+    if engine.dialect.name == "postgresql":
+        # One UPDATE ... FROM (VALUES ...) statement per chunk
+        scores = values(
+            column("application_id", Uuid), column("score", Numeric), column("notes", Text), name="scores"
+        ).data([(row["application_id"], row["score"], row["screening_notes"]) for row in rows])
+        await db.execute(
+            update(table)
+            .where(table.c.id == scores.c.application_id)
+            .values(
+                # VALUES parameters carry no type for asyncpg; cast to the column type
+                ai_screening_score=cast(scores.c.score, table.c.ai_screening_score.type),
+                ai_screening_notes=scores.c.notes,
+                ai_screening_date=screened_at
+            )
+        )
+        return
+    await db.execute(
+        update(table).where(table.c.id == bindparam("application_id")).values(
+            ai_screening_score=bindparam("score"),
+            ai_screening_notes=bindparam("screening_notes"),
+            ai_screening_date=screened_at,
+        ),
+        rows
+    )
+
+async def screen_posting(
+    db,
+    job_posting_id: UUID,
+    rescreen: bool = False,
+    progress: Optional[Callable[..., Awaitable[None]]] = None
+) -> dict:
+    """Score the pending applications of a posting and store the results.
+
+    Pending means still in the applied stage and, unless rescreen is set,
+    not screened before. progress(done, total, message) is awaited once the
+    resumes are scored. Raises LookupError if the posting does not exist.
+    """
+    posting = await db.get(JobPosting, job_posting_id)
+    if posting is None:
+        raise LookupError(f"Job posting {job_posting_id} not found")
+    job_text = posting_text(posting)
+    query = select(
+        JobApplication.id, JobApplication.resume_url, JobApplication.cover_letter
+    ).where(
+        JobApplication.job_posting_id == job_posting_id,
+        JobApplication.status == RecruitmentStatus.applied
+    )
+    if not rescreen:
+        query = query.where(JobApplication.ai_screening_date.is_(None))
+    applications = (await db.execute(query.order_by(JobApplication.id))).all()
+    resumes = [resume_text(application) for application in applications]
+    # Release the connection while the pool works
+    await db.rollback()
+
+    loop = asyncio.get_running_loop()
+    scores = await loop.run_in_executor(
+        get_executor(),
+        score_resumes,
+        job_text,
+        resumes,
+        settings.AI_SCREENING_BATCH_SIZE,
+        settings.AI_MODEL_PATH,
+    )
+
+    if progress:
+        # Before the UPDATEs: progress is written in a transaction of its own
+        await progress(9, 10, f"Writing {len(scores)} scores")
+
+    screened_at = datetime.now(timezone.utc)
+    rows = [
+        {"application_id": application.id, "score": score, "screening_notes": notes}
+        for application, (score, notes) in zip(applications, scores)
+    ]
+    for start in range(0, len(rows), UPDATE_CHUNK_SIZE):
+        await _write_scores(db, rows[start:start + UPDATE_CHUNK_SIZE], screened_at)
+    await db.commit()
+
+    return {
+        "job_posting_id": job_posting_id,
+        "screened": len(rows),
+        "top_score": max((score for score, _ in scores), default=None),
+        "screened_at": screened_at,
+    }
+
+@job_handler("screening.posting")
+async def screen_posting_job(db, payload: dict, context) -> dict:
+    try:
+        return await screen_posting(
+            db, UUID(payload["job_posting_id"]), payload.get("rescreen", False), progress=context.progress
+        )
+    except LookupError as exc:
+        # Deleted after the job was queued; retrying cannot bring it back
+        raise PermanentJobError(str(exc)) from exc
+
+async def _run(args) -> dict:
+    from app.database import open_async_session
+    db = open_async_session()
+    try:
+        return await screen_posting(db, args.job_posting_id, args.rescreen)
+    finally:
+        await db.close()
+        shutdown_executor()
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Screen the pending applications of a job posting.")
+    parser.add_argument("job_posting_id", type=UUID)
+    parser.add_argument("--rescreen", action="store_true", help="also rescore applications screened before")
+    report = asyncio.run(_run(parser.parse_args(argv)))
+    print(json.dumps(report, indent=2, default=str))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+import re
+import threading
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from sqlalchemy import event, literal_column, select
+from sqlalchemy.orm import object_session
+from app.database import on_commit
+from app.models import Employee
+
+# Same threshold pg_trgm uses for the `%>` word-similarity operator
+WORD_SIMILARITY_THRESHOLD = 0.6
+
+SEARCH_FIELDS = ("first_name", "last_name", "email", "employee_id")
+
+def employee_search_document():
+    """SQL expression matching the trigram index idx_employees_search_trgm.
+
+    The separator is rendered inline so the expression stays identical to the
+    indexed one under server-side prepared statements.
+    """
+    separator = literal_column("' '")
+    return (
+        Employee.first_name + separator + Employee.last_name + separator
+        + Employee.email + separator + Employee.employee_id
+    )
+
+def like_escape(term: str) -> str:
+    """Escape LIKE wildcards in user input (use with escape="\\")."""
+    return term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+def trigrams(text: str) -> Set[str]:
+    """Split text into pg_trgm-style trigrams of its lowercased words."""
+    grams = set()
+    for word in re.findall(r"[0-9a-z]+", text.lower()):
+        padded = f"  {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+class EmployeeSearchIndex:
+    """In-memory trigram index used for employee search when Postgres is unavailable.
+
+    Ranking mirrors the SQL path: a prefix match on any field scores 1.0 and
+    the trigram overlap with the query (an approximation of pg_trgm
+    word_similarity) is added on top.
+    """
+
+    def __init__(self):
+        self.loaded = False
+        self._docs: Dict[object, Tuple[Tuple[str, ...], str, Set[str]]] = {}
+        self._postings: Dict[str, Set[object]] = defaultdict(set)
+        self._lock = threading.Lock()
+
+    def load(self, rows: Iterable[Tuple]) -> None:
+        """Replace the index contents with (id, *SEARCH_FIELDS) rows."""
+        with self._lock:
+            self._docs.clear()
+            self._postings.clear()
+            for row in rows:
+                self._add(row[0], tuple(row[1:]))
+            self.loaded = True
+
+    def add(self, doc_id, fields: Tuple[str, ...]) -> None:
+        with self._lock:
+            self._remove(doc_id)
+            self._add(doc_id, fields)
+
+    def remove(self, doc_id) -> None:
+        with self._lock:
+            self._remove(doc_id)
+
+    def _add(self, doc_id, fields: Tuple[str, ...]) -> None:
+        fields = tuple((value or "").lower() for value in fields)
+        document = " ".join(fields)
+        grams = trigrams(document)
+        self._docs[doc_id] = (fields, document, grams)
+        for gram in grams:
+            self._postings[gram].add(doc_id)
+
+    def _remove(self, doc_id) -> None:
+        entry = self._docs.pop(doc_id, None)
+        if entry is None:
+            return
+        for gram in entry[2]:
+            postings = self._postings.get(gram)
+            if postings is not None:
+                postings.discard(doc_id)
+                if not postings:
+                    del self._postings[gram]
+
+    def search(self, term: str, limit: Optional[int] = None) -> List[Tuple[object, float]]:
+        """Return (id, score) pairs for matching documents, best first."""
+        term = term.strip().lower()
+        if not term:
+            return []
+        query_grams = trigrams(term)
+        with self._lock:
+            overlap: Dict[object, int] = defaultdict(int)
+            for gram in query_grams:
+                for doc_id in self._postings.get(gram, ()):
+                    overlap[doc_id] += 1
+            # A document containing a 3+ character word of the query shares that
+            # word's inner trigrams; shorter terms need a scan to find substrings
+            if any(len(word) >= 3 for word in re.findall(r"[0-9a-z]+", term)):
+                candidates = overlap.keys()
+            else:
+                candidates = self._docs.keys()
+            results = []
+            for doc_id in candidates:
+                fields, document, _ = self._docs[doc_id]
+                similarity = overlap.get(doc_id, 0) / len(query_grams) if query_grams else 0.0
+                if term not in document and similarity < WORD_SIMILARITY_THRESHOLD:
+                    continue
+                prefix = 1.0 if any(value.startswith(term) for value in fields) else 0.0
+                results.append((doc_id, prefix + similarity, fields[1]))
+        results.sort(key=lambda item: (-item[1], item[2], str(item[0])))
+        if limit is not None:
+            results = results[:limit]
+        return [(doc_id, score) for doc_id, score, _ in results]
+
+employee_search_index = EmployeeSearchIndex()
+
+async def ensure_search_index(db) -> EmployeeSearchIndex:
+    """Build the in-memory index from the database on first use."""
+    if not employee_search_index.loaded:
+        columns = [getattr(Employee, field) for field in SEARCH_FIELDS]
+        result = await db.execute(select(Employee.id, *columns))
+        employee_search_index.load(result.all())
+    return employee_search_index
+
+def _after_commit(target, change) -> None:
+    # Applied once the flush commits, so a rolled back write never shows up in
+    # search results
+    session = object_session(target)
+    if session is None:
+        change()
+    else:
+        on_commit(session, change)
+
+@event.listens_for(Employee, "after_insert")
+@event.listens_for(Employee, "after_update")
+def _index_employee(mapper, connection, target) -> None:
+    doc_id, fields = target.id, tuple(getattr(target, field) for field in SEARCH_FIELDS)
+
+    def add():
+        if employee_search_index.loaded:
+            employee_search_index.add(doc_id, fields)
+    _after_commit(target, add)
+
+@event.listens_for(Employee, "after_delete")
+def _unindex_employee(mapper, connection, target) -> None:
+    doc_id = target.id
+
+    def remove():
+        if employee_search_index.loaded:
+            employee_search_index.remove(doc_id)
+    _after_commit(target, remove)
@@ -0,0 +1,88 @@
+"""Fast JSON path for large list responses.
+
+FastAPI's default path validates each ORM object into its response model
+(from_attributes), converts the models back to Python data and encodes them
+with the stdlib json module. For trusted database output, routes can instead
+return `FastJSONResponse(dump_rows(Schema, rows))`: rows are read straight
+into dicts shaped like the schema and encoded with orjson (or pydantic-core
+when orjson is not installed).
+
+Keep `response_model` on the route for the OpenAPI schema; FastAPI skips
+response validation when a route returns a Response itself.
+"""
+import typing
+from decimal import Decimal
+from enum import Enum
+from functools import lru_cache
+from typing import Any, Callable, Iterable, List, Optional, Type
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+import pydantic_core
+
+try:
+    import orjson
+except ImportError:  # optional speedup
+    orjson = None
+
+def _unwrap_optional(annotation) -> Any:
+    if typing.get_origin(annotation) is typing.Union:
+        args = [arg for arg in typing.get_args(annotation) if arg is not type(None)]
+        if len(args) == 1:
+            return args[0]
+    return annotation
+
+def _field_converter(annotation) -> Optional[Callable[[Any], Any]]:
+    """Conversion needed so a column value serializes like the schema field, or None."""
+    annotation = _unwrap_optional(annotation)
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        nested = row_serializer(annotation)
+        return lambda value: None if value is None else nested(value)
+    if annotation is float:
+        # Numeric columns load as Decimal
+        return lambda value: None if value is None else float(value)
+    return None
+
+@lru_cache(maxsize=None)
+def row_serializer(schema: Type[BaseModel]) -> Callable[[Any], dict]:
+    """Build a function reading a schema's fields off an ORM object or row, without validation."""
+    plain = []
+    converted = []
+    for name, field in schema.model_fields.items():
+        converter = _field_converter(field.annotation)
+        if converter is None:
+            plain.append(name)
+        else:
+            converted.append((name, converter))
+
+    def serialize(obj) -> dict:
+        data = {name: getattr(obj, name) for name in plain}
+        for name, converter in converted:
+            data[name] = converter(getattr(obj, name))
+        return data
+
+    return serialize
+
+def dump_rows(schema: Type[BaseModel], rows: Iterable[Any]) -> List[dict]:
+    """Shape trusted ORM objects (or Core rows) as the schema would serialize them."""
+    serialize = row_serializer(schema)
+    return [serialize(row) for row in rows]
+
+def _default(value):
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, Enum):
+        return value.value
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+def dumps(content: Any) -> bytes:
+    """Encode content to JSON bytes, formatting values like pydantic's JSON mode."""
+    if orjson is not None:
+        # OPT_UTC_Z writes UTC offsets as "Z", as pydantic does
+        return orjson.dumps(content, default=_default, option=orjson.OPT_UTC_Z)
+    return pydantic_core.to_json(content, fallback=_default)
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse rendered with orjson, for data already shaped by dump_rows."""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
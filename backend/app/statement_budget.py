@@ -0,0 +1,100 @@
+"""SQL statement counting for catching N+1 queries.
+
+Every statement executed through any engine is counted against the
+StatementCounter active in the current context. With SQL_STATEMENT_BUDGET set
+(development/test), the middleware counts each request, reports the total in
+the X-SQL-Statements header and flags requests that exceed their budget:
+a warning outside tests, a 500 response when ENVIRONMENT is "test" so the
+offending test fails. Endpoints can declare a tighter budget with
+`dependencies=[Depends(statement_budget(n))]`.
+
+HTTP tests can also assert on the X-SQL-Statements header. Code called
+directly from a test (not through a TestClient, which runs the app in another
+thread) can be checked with `assert_max_statements(n)`:
+    with assert_max_statements(3):
+        await compute_summary(db, organization_id, today)
+"""
+import logging
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, List, Optional
+from fastapi import Request
+from fastapi.responses import JSONResponse
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Statements kept per counter for the budget-exceeded report
+MAX_RECORDED_STATEMENTS = 50
+
+class StatementBudgetExceeded(AssertionError):
+    pass
+
+class StatementCounter:
+    def __init__(self, budget: Optional[int] = None):
+        self.budget = budget
+        self.count = 0
+        self.statements: List[str] = []
+
+    @property
+    def exceeded(self) -> bool:
+        return self.budget is not None and self.count > self.budget
+
+    def report(self) -> str:
+        lines = [f"{self.count} SQL statements issued, budget is {self.budget}:"]
+        lines.extend(f"  {statement}" for statement in self.statements)
+        return "\n".join(lines)
+
+_current_counter: ContextVar[Optional[StatementCounter]] = ContextVar("sql_statement_counter", default=None)
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _count_statement(conn, cursor, statement, parameters, context, executemany) -> None:
+    # Context variables follow requests into threadpool calls and async greenlets
+    counter = _current_counter.get()
+    if counter is not None:
+        counter.count += 1
+        if len(counter.statements) < MAX_RECORDED_STATEMENTS:
+            counter.statements.append(" ".join(statement.split()))
+
+@contextmanager
+def count_statements(budget: Optional[int] = None) -> Iterator[StatementCounter]:
+    """Count the SQL statements issued inside the block."""
+    counter = StatementCounter(budget)
+    token = _current_counter.set(counter)
+    try:
+        yield counter
+    finally:
+        _current_counter.reset(token)
+
+@contextmanager
+def assert_max_statements(budget: int) -> Iterator[StatementCounter]:
+    """Fail if the block issues more than `budget` SQL statements."""
+    with count_statements(budget) as counter:
+        yield counter
+    if counter.exceeded:
+        raise StatementBudgetExceeded(counter.report())
+
+def statement_budget(budget: int):
+    """Dependency setting the statement budget of the current request."""
+    def set_budget() -> None:
+        counter = _current_counter.get()
+        if counter is not None:
+            counter.budget = budget
+    return set_budget
+
+async def statement_budget_middleware(request: Request, call_next):
+    with count_statements(settings.SQL_STATEMENT_BUDGET) as counter:
+        response = await call_next(request)
+    response.headers["X-SQL-Statements"] = str(counter.count)
+    if counter.exceeded:
+        message = f"{request.method} {request.url.path}: {counter.report()}"
+        if settings.ENVIRONMENT == "test":
+            return JSONResponse(
+                status_code=500,
+                content={"detail": f"SQL statement budget exceeded. {message}"},
+                headers={"X-SQL-Statements": str(counter.count)}
+            )
+        logger.warning("SQL statement budget exceeded. %s", message)
+    return response
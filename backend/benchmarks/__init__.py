@@ -0,0 +1 @@
+"""Performance benchmarks for the HRMS backend. Run modules with `python -m benchmarks.<name>`."""
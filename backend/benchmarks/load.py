@@ -0,0 +1,304 @@
+"""Load benchmark driving the real API against a seeded database.
+
+Scenarios (run in order, each with its own request count):
+    login      POST /api/auth/login (bcrypt on the password hashing pool)
+    search     GET /api/employees/search with random name prefixes
+    check_in   POST /api/attendance/check-in storm, one per employee for today
+    export     GET /api/attendance/export of one seeded day for the whole organization
+
+By default the app runs in-process behind httpx's ASGI transport. With
+--workers N it is started under uvicorn with N worker processes, and --url
+targets a server that is already running against the same DATABASE_URL.
+Results are printed as throughput and latency percentiles, written to
+--output, and compared against --baseline; a scenario whose p95 latency
+rises or throughput drops by more than --tolerance fails the run.
+
+Seed first with `python -m benchmarks.seed`, then from the backend directory:
+    python -m benchmarks.load --save-baseline
+    python -m benchmarks.load --workers 4 --concurrency 64
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import socket
+import subprocess
+import sys
+import time
+from dataclasses import dataclass, field
+from datetime import date, datetime, timezone
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+import httpx
+from sqlalchemy import delete, func, select
+from app.config import settings
+from app.database import SessionLocal
+from app.models import Attendance, Employee, Organization
+from benchmarks.seed import BENCH_ORGANIZATION, BENCH_PASSWORD, BENCH_USERNAME, LAST_NAMES
+
+BENCHMARKS_DIR = Path(__file__).resolve().parent
+DEFAULT_BASELINE = BENCHMARKS_DIR / "baseline.json"
+DEFAULT_OUTPUT = BENCHMARKS_DIR / "results" / "latest.json"
+
+# Requests per scenario unless overridden with --requests
+DEFAULT_REQUESTS = {"login": 200, "search": 2000, "check_in": 2000, "export": 20}
+
+@dataclass
+class BenchContext:
+    client: httpx.AsyncClient
+    headers: Dict[str, str]
+    employee_ids: List[str]
+    export_day: date
+    rng: random.Random = field(default_factory=lambda: random.Random(7))
+
+@dataclass
+class ScenarioResult:
+    requests: int
+    errors: int
+    seconds: float
+    latencies_ms: List[float]
+    bytes_received: int = 0
+
+    def percentile(self, pct: float) -> float:
+        if not self.latencies_ms:
+            return 0.0
+        ordered = sorted(self.latencies_ms)
+        return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+    def summary(self) -> dict:
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "throughput_rps": round(self.requests / self.seconds, 2) if self.seconds else 0.0,
+            "p50_ms": round(self.percentile(50), 2),
+            "p90_ms": round(self.percentile(90), 2),
+            "p95_ms": round(self.percentile(95), 2),
+            "p99_ms": round(self.percentile(99), 2),
+            "max_ms": round(max(self.latencies_ms, default=0.0), 2),
+            "mb_received": round(self.bytes_received / 1e6, 2),
+        }
+
+# Each scenario issues request number `index` and returns the response
+async def _login(ctx: BenchContext, index: int) -> httpx.Response:
+    return await ctx.client.post(
+        "/api/auth/login", json={"username": BENCH_USERNAME, "password": BENCH_PASSWORD}
+    )
+
+async def _search(ctx: BenchContext, index: int) -> httpx.Response:
+    term = ctx.rng.choice(LAST_NAMES)[:ctx.rng.randint(3, 5)]
+    return await ctx.client.get("/api/employees/search", params={"q": term}, headers=ctx.headers)
+
+async def _check_in(ctx: BenchContext, index: int) -> httpx.Response:
+    now = datetime.now(timezone.utc)
+    return await ctx.client.post("/api/attendance/check-in", headers=ctx.headers, json={
+        "employee_id": ctx.employee_ids[index],
+        "date": now.date().isoformat(),
+        "check_in_time": now.isoformat(),
+        "status": "present",
+    })
+
+async def _export(ctx: BenchContext, index: int) -> httpx.Response:
+    day = ctx.export_day.isoformat()
+    return await ctx.client.get(
+        "/api/attendance/export",
+        params={"format": "ndjson", "start_date": day, "end_date": day},
+        headers=ctx.headers,
+    )
+
+SCENARIOS: Dict[str, Callable[[BenchContext, int], Awaitable[httpx.Response]]] = {
+    "login": _login,
+    "search": _search,
+    "check_in": _check_in,
+    "export": _export,
+}
+
+async def run_scenario(
+    ctx: BenchContext,
+    scenario: Callable[[BenchContext, int], Awaitable[httpx.Response]],
+    requests: int,
+    concurrency: int
+) -> ScenarioResult:
+    """Issue `requests` calls from `concurrency` concurrent clients."""
+    result = ScenarioResult(requests=requests, errors=0, seconds=0.0, latencies_ms=[])
+    indexes = iter(range(requests))
+
+    async def client_loop() -> None:
+        for index in indexes:
+            start = time.perf_counter()
+            try:
+                response = await scenario(ctx, index)
+                ok = response.status_code < 400
+                result.bytes_received += len(response.content)
+            except httpx.HTTPError:
+                ok = False
+            result.latencies_ms.append((time.perf_counter() - start) * 1000)
+            if not ok:
+                result.errors += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client_loop() for _ in range(min(concurrency, requests))))
+    result.seconds = time.perf_counter() - start
+    return result
+
+def load_fixture() -> dict:
+    """Look up the seeded organization and reset today's check-ins for the storm."""
+    with SessionLocal() as db:
+        organization_id = db.scalar(select(Organization.id).where(Organization.name == BENCH_ORGANIZATION))
+        if organization_id is None:
+            raise SystemExit("No benchmark data; run `python -m benchmarks.seed` first")
+        employee_ids = db.scalars(
+            select(Employee.id).where(Employee.organization_id == organization_id).order_by(Employee.employee_id)
+        ).all()
+        export_day = db.scalar(
+            select(func.max(Attendance.date)).where(Attendance.date < date.today())
+        )
+        db.execute(delete(Attendance).where(
+            Attendance.date == date.today(),
+            Attendance.employee_id.in_(select(Employee.id).where(Employee.organization_id == organization_id))
+        ))
+        db.commit()
+    return {
+        "organization_id": organization_id,
+        "employee_ids": [str(employee_id) for employee_id in employee_ids],
+        "export_day": export_day or date.today(),
+    }
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+def start_server(workers: int) -> Tuple[subprocess.Popen, str]:
+    """Start uvicorn with several workers and wait until /health answers."""
+    port = _free_port()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--host", "127.0.0.1", "--port", str(port),
+         "--workers", str(workers), "--log-level", "warning"],
+        cwd=BENCHMARKS_DIR.parent,
+        env={**os.environ, "DB_ECHO": "false"},
+    )
+    url = f"http://127.0.0.1:{port}"
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise SystemExit("uvicorn exited during startup")
+        try:
+            if httpx.get(f"{url}/health", timeout=1).status_code < 500:
+                return process, url
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.25)
+    process.terminate()
+    raise SystemExit("uvicorn did not become healthy within 60s")
+
+def compare(results: dict, baseline: dict, tolerance: float) -> List[str]:
+    """Regressions of p95 latency or throughput beyond the tolerance, as messages."""
+    regressions = []
+    for name, current in results["scenarios"].items():
+        previous = baseline.get("scenarios", {}).get(name)
+        if not previous:
+            continue
+        if previous["p95_ms"] and current["p95_ms"] > previous["p95_ms"] * (1 + tolerance):
+            regressions.append(f"{name}: p95 {previous['p95_ms']} -> {current['p95_ms']} ms")
+        if current["throughput_rps"] < previous["throughput_rps"] * (1 - tolerance):
+            regressions.append(f"{name}: throughput {previous['throughput_rps']} -> {current['throughput_rps']} req/s")
+        if current["errors"] > previous["errors"]:
+            regressions.append(f"{name}: errors {previous['errors']} -> {current['errors']}")
+    return regressions
+
+def print_report(results: dict, baseline: Optional[dict]) -> None:
+    print(f"{'scenario':<10} {'requests':>8} {'errors':>6} {'req/s':>9} {'p50':>8} {'p95':>8} {'p99':>8} {'max':>8}")
+    for name, row in results["scenarios"].items():
+        line = (
+            f"{name:<10} {row['requests']:>8} {row['errors']:>6} {row['throughput_rps']:>9.1f} "
+            f"{row['p50_ms']:>8.1f} {row['p95_ms']:>8.1f} {row['p99_ms']:>8.1f} {row['max_ms']:>8.1f}"
+        )
+        previous = (baseline or {}).get("scenarios", {}).get(name)
+        if previous and previous["p95_ms"]:
+            line += f"   p95 {100 * (row['p95_ms'] / previous['p95_ms'] - 1):+.0f}% vs baseline"
+        print(line)
+
+async def run(args) -> dict:
+    fixture = load_fixture()
+    server = None
+    if args.url:
+        transport, base_url = None, args.url
+    elif args.workers:
+        server, base_url = start_server(args.workers)
+        transport = None
+    else:
+        from main import app
+        transport, base_url = httpx.ASGITransport(app=app), "http://benchmark"
+
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    try:
+        async with httpx.AsyncClient(
+            transport=transport, base_url=base_url, timeout=args.timeout, limits=limits
+        ) as client:
+            ctx = BenchContext(client=client, headers={}, employee_ids=fixture["employee_ids"],
+                               export_day=fixture["export_day"])
+            response = await _login(ctx, 0)
+            response.raise_for_status()
+            ctx.headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+            scenarios = {}
+            for name in args.scenarios:
+                requests = args.requests or DEFAULT_REQUESTS[name]
+                if name == "check_in":
+                    requests = min(requests, len(ctx.employee_ids))
+                result = await run_scenario(ctx, SCENARIOS[name], requests, args.concurrency)
+                scenarios[name] = result.summary()
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait(timeout=30)
+
+    return {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "mode": "url" if args.url else f"uvicorn x{args.workers}" if args.workers else "in-process",
+            "database": settings.DATABASE_URL.split("://")[0],
+            "database_mode": settings.DATABASE_MODE,
+            "employees": len(fixture["employee_ids"]),
+            "concurrency": args.concurrency,
+            "python": platform.python_version(),
+            "machine": platform.node(),
+        },
+        "scenarios": scenarios,
+    }
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run the API load benchmark.")
+    parser.add_argument("--scenarios", nargs="+", choices=list(SCENARIOS), default=list(SCENARIOS))
+    parser.add_argument("--requests", type=int, help="requests per scenario (default depends on the scenario)")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--timeout", type=float, default=120.0, help="per-request timeout in seconds")
+    parser.add_argument("--workers", type=int, default=0, help="run under uvicorn with this many workers")
+    parser.add_argument("--url", help="benchmark an already running server instead")
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true", help="store this run as the baseline")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed relative regression (0.2 = 20%%)")
+    parser.add_argument("--output", type=Path, default=DEFAULT_OUTPUT)
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args))
+    baseline = json.loads(args.baseline.read_text()) if args.baseline.exists() else None
+    print_report(results, baseline)
+
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    args.output.write_text(json.dumps(results, indent=2))
+    if args.save_baseline:
+        args.baseline.write_text(json.dumps(results, indent=2))
+        print(f"baseline saved to {args.baseline}")
+        return
+    if baseline:
+        regressions = compare(results, baseline, args.tolerance)
+        for message in regressions:
+            print(f"REGRESSION {message}")
+        if regressions:
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
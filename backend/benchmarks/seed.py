@@ -0,0 +1,237 @@
+"""Seed a synthetic organization for the load benchmarks.
+
+Creates the "Benchmark Org" organization with departments, positions and
+employees (each department head manages the rest of the department), a
+login user, and weekday attendance (with its monthly rollups) for the days
+before today. Rows are generated deterministically from --seed and written
+with bulk inserts, or COPY on Postgres. The database is migrated to the
+newest revision first. Run from the backend directory against DATABASE_URL:
+    python -m benchmarks.seed --employees 50000 --days 100    # 5M attendance rows
+    python -m benchmarks.seed --employees 2000 --days 20 --reset
+"""
+import argparse
+import csv
+import io
+import random
+import time
+import uuid
+from datetime import date, datetime, timedelta, timezone
+from typing import Iterator, List
+from sqlalchemy import delete, insert, select
+from app.attendance_rollups import month_start, next_month, rebuild_month_statements
+from app.auth import get_password_hash
+from app.database import engine
+from app.models import (
+    Attendance, AttendanceRollup, AttendanceStatus, Department, Employee, EmployeeHierarchy,
+    EmploymentStatus, EmploymentType, Organization, Position, User
+)
+from app.org_chart import add_to_hierarchy
+from app.schema import upgrade_to_head
+
+BENCH_ORGANIZATION = "Benchmark Org"
+BENCH_USERNAME = "bench"
+BENCH_PASSWORD = "bench-password"
+
+# Rows per INSERT batch / COPY buffer
+CHUNK_SIZE = 10000
+
+FIRST_NAMES = [
+    "James", "Mary", "Robert", "Patricia", "John", "Jennifer", "Michael", "Linda", "David", "Elizabeth",
+    "William", "Barbara", "Richard", "Susan", "Joseph", "Jessica", "Thomas", "Sarah", "Charles", "Karen",
+    "Priya", "Wei", "Aisha", "Mateo", "Yuki", "Olga", "Kwame", "Fatima", "Lucas", "Ingrid",
+]
+LAST_NAMES = [
+    "Smith", "Johnson", "Williams", "Brown", "Jones", "Garcia", "Miller", "Davis", "Rodriguez", "Martinez",
+    "Hernandez", "Lopez", "Gonzalez", "Wilson", "Anderson", "Thomas", "Taylor", "Moore", "Jackson", "Martin",
+    "Lee", "Perez", "Thompson", "White", "Harris", "Sanchez", "Clark", "Ramirez", "Lewis", "Robinson",
+    "Patel", "Nguyen", "Kim", "Chen", "Okafor", "Novak", "Kowalski", "Larsen", "Silva", "Yamamoto",
+]
+DEPARTMENTS = [
+    "Engineering", "Sales", "Marketing", "Finance", "Human Resources", "Operations", "Support",
+    "Legal", "Product", "Design", "Data", "Security", "Facilities", "Procurement", "Research",
+    "Quality", "Logistics", "Training", "Communications", "Partnerships",
+]
+# Attendance status mix of a typical day
+STATUS_WEIGHTS = [
+    (AttendanceStatus.present, 80),
+    (AttendanceStatus.late, 8),
+    (AttendanceStatus.work_from_home, 6),
+    (AttendanceStatus.absent, 4),
+    (AttendanceStatus.half_day, 2),
+]
+
+def _chunks(rows: Iterator[dict], size: int = CHUNK_SIZE) -> Iterator[List[dict]]:
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+def delete_organization(connection, organization_id: uuid.UUID) -> None:
+    """Remove a seeded organization; SQLite does not enforce the ON DELETE CASCADEs."""
+    employee_ids = select(Employee.id).where(Employee.organization_id == organization_id)
+    connection.execute(delete(Attendance).where(Attendance.employee_id.in_(employee_ids)))
+    connection.execute(delete(AttendanceRollup).where(AttendanceRollup.employee_id.in_(employee_ids)))
+    connection.execute(delete(EmployeeHierarchy).where(EmployeeHierarchy.descendant_id.in_(employee_ids)))
+    connection.execute(delete(User).where(User.employee_id.in_(employee_ids)))
+    connection.execute(delete(Employee).where(Employee.organization_id == organization_id))
+    department_ids = select(Department.id).where(Department.organization_id == organization_id)
+    connection.execute(delete(Position).where(Position.department_id.in_(department_ids)))
+    connection.execute(delete(Department).where(Department.organization_id == organization_id))
+    connection.execute(delete(Organization).where(Organization.id == organization_id))
+
+def working_days(days: int, before: date) -> List[date]:
+    """The last `days` weekdays before a date, oldest first."""
+    result = []
+    day = before - timedelta(days=1)
+    while len(result) < days:
+        if day.weekday() < 5:
+            result.append(day)
+        day -= timedelta(days=1)
+    return result[::-1]
+
+def employee_rows(rng: random.Random, organization_id, departments: List[dict], count: int) -> List[dict]:
+    rows = []
+    for index in range(count):
+        department = departments[index % len(departments)]
+        first_name, last_name = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+        rows.append({
+            "id": uuid.uuid4(),
+            "employee_id": f"B{index:07d}",
+            "organization_id": organization_id,
+            "department_id": department["id"],
+            "position_id": department["position_id"],
+            "first_name": first_name,
+            "last_name": last_name,
+            "email": f"{first_name}.{last_name}.{index}@bench.example.com".lower(),
+            "hire_date": date(2015, 1, 1) + timedelta(days=rng.randrange(3000)),
+            "employment_type": EmploymentType.full_time,
+            "employment_status": EmploymentStatus.active,
+            "base_salary": rng.randrange(40000, 160000, 500),
+        })
+    # The first employee of each department heads it and manages the others
+    heads = {row["department_id"]: row["id"] for row in rows[:len(departments)]}
+    for row in rows[len(departments):]:
+        row["manager_id"] = heads[row["department_id"]]
+    return rows
+
+def attendance_rows(rng: random.Random, employee_ids: List[uuid.UUID], days: List[date]) -> Iterator[dict]:
+    statuses = [status for status, _ in STATUS_WEIGHTS]
+    weights = [weight for _, weight in STATUS_WEIGHTS]
+    for day in days:
+        for employee_id, status in zip(employee_ids, rng.choices(statuses, weights, k=len(employee_ids))):
+            row = {
+                "id": uuid.uuid4(),
+                "employee_id": employee_id,
+                "date": day,
+                "status": status,
+                "check_in_time": None,
+                "check_out_time": None,
+                "break_duration": 0,
+                "total_hours": None,
+            }
+            if status != AttendanceStatus.absent:
+                start = datetime(day.year, day.month, day.day, 8, tzinfo=timezone.utc) + timedelta(
+                    minutes=rng.randrange(90) + (60 if status == AttendanceStatus.late else 0)
+                )
+                hours = 4 if status == AttendanceStatus.half_day else 8 + rng.randrange(120) / 60
+                row.update(
+                    check_in_time=start,
+                    check_out_time=start + timedelta(hours=hours, minutes=30),
+                    break_duration=30,
+                    total_hours=round(hours, 2),
+                )
+            yield row
+
+def _copy_attendance(connection, rows: List[dict]) -> None:
+    """COPY a batch of attendance rows through the psycopg2 connection."""
+    columns = list(rows[0])
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for row in rows:
+        writer.writerow([
+            "" if row[column] is None else getattr(row[column], "value", row[column]) for column in columns
+        ])
+    buffer.seek(0)
+    cursor = connection.connection.dbapi_connection.cursor()
+    cursor.copy_expert(f"COPY attendance ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)", buffer)
+
+def seed(employees: int, days: int, seed_value: int = 42, reset: bool = False) -> dict:
+    rng = random.Random(seed_value)
+    upgrade_to_head()
+    started = time.perf_counter()
+    with engine.begin() as connection:
+        existing = connection.scalar(select(Organization.id).where(Organization.name == BENCH_ORGANIZATION))
+        if existing:
+            if not reset:
+                raise SystemExit(f"{BENCH_ORGANIZATION} already exists; pass --reset to replace it")
+            delete_organization(connection, existing)
+
+        organization_id = uuid.uuid4()
+        connection.execute(insert(Organization).values(id=organization_id, name=BENCH_ORGANIZATION))
+        departments = [
+            {"id": uuid.uuid4(), "position_id": uuid.uuid4(), "name": name}
+            for name in DEPARTMENTS[:max(1, min(len(DEPARTMENTS), employees))]
+        ]
+        connection.execute(insert(Department), [
+            {"id": row["id"], "organization_id": organization_id, "name": row["name"]} for row in departments
+        ])
+        connection.execute(insert(Position), [
+            {"id": row["position_id"], "department_id": row["id"], "title": f"{row['name']} Specialist"}
+            for row in departments
+        ])
+
+        rows = employee_rows(rng, organization_id, departments, employees)
+        for batch in _chunks(iter(rows)):
+            connection.execute(insert(Employee), [{"manager_id": None, **row} for row in batch])
+            add_to_hierarchy(connection, [row["id"] for row in batch])
+
+        connection.execute(insert(User).values(
+            username=BENCH_USERNAME,
+            email="bench@bench.example.com",
+            password_hash=get_password_hash(BENCH_PASSWORD),
+            employee_id=rows[0]["id"],
+        ))
+    print(f"organization and {employees} employees: {time.perf_counter() - started:.1f}s")
+
+    employee_ids = [row["id"] for row in rows]
+    attendance_days = working_days(days, date.today())
+    started = time.perf_counter()
+    written = 0
+    with engine.begin() as connection:
+        for batch in _chunks(attendance_rows(rng, employee_ids, attendance_days)):
+            if engine.dialect.name == "postgresql":
+                _copy_attendance(connection, batch)
+            else:
+                connection.execute(insert(Attendance), batch)
+            written += len(batch)
+    print(f"{written} attendance rows: {time.perf_counter() - started:.1f}s")
+
+    # Attendance bypassed the API, so build its monthly rollups in bulk
+    started = time.perf_counter()
+    month = month_start(attendance_days[0])
+    with engine.begin() as connection:
+        while month <= attendance_days[-1]:
+            for statement in rebuild_month_statements(month):
+                connection.execute(statement)
+            month = next_month(month)
+        if engine.dialect.name == "postgresql":
+            connection.exec_driver_sql("ANALYZE")
+    print(f"attendance rollups: {time.perf_counter() - started:.1f}s")
+
+    return {"organization_id": str(organization_id), "employees": employees, "attendance": written}
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Seed a synthetic organization for benchmarks.")
+    parser.add_argument("--employees", type=int, default=50000)
+    parser.add_argument("--days", type=int, default=100, help="weekdays of attendance per employee")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--reset", action="store_true", help="replace an existing benchmark organization")
+    args = parser.parse_args()
+    print(seed(args.employees, args.days, args.seed, args.reset))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""Compare FastAPI's default response serialization with the fast JSON path.
+
+Serializes synthetic employee and attendance listings (transient ORM
+objects, no database needed) both ways and reports the median time per
+response. Run from the backend directory:
+    python -m benchmarks.serialization --rows 1000 --repeat 50
+"""
+import argparse
+import asyncio
+import statistics
+import time
+import uuid
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+from typing import Callable, List
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+from app.models import (
+    Attendance, AttendanceStatus, Department, Employee, EmploymentStatus, EmploymentType, Position
+)
+from app.schemas import AttendanceResponse, EmployeeResponse
+from app.serialization import FastJSONResponse, dump_rows, orjson
+
+def make_employees(count: int) -> List[Employee]:
+    now = datetime.now(timezone.utc)
+    organization_id = uuid.uuid4()
+    department = Department(id=uuid.uuid4(), organization_id=organization_id, name="Engineering")
+    position = Position(id=uuid.uuid4(), department_id=department.id, title="Engineer")
+    manager = Employee(id=uuid.uuid4(), employee_id="M0001", first_name="Grace", last_name="Hopper")
+    return [
+        Employee(
+            id=uuid.uuid4(),
+            employee_id=f"E{index:06d}",
+            organization_id=organization_id,
+            first_name=f"First{index}",
+            last_name=f"Last{index}",
+            email=f"employee{index}@example.com",
+            phone="+1 555 0100",
+            city="Springfield",
+            country="US",
+            hire_date=date(2020, 1, 1) + timedelta(days=index % 1000),
+            employment_type=EmploymentType.full_time,
+            employment_status=EmploymentStatus.active,
+            base_salary=Decimal("85000.00"),
+            department_id=department.id,
+            department=department,
+            position_id=position.id,
+            position=position,
+            manager_id=manager.id,
+            manager=manager,
+            created_at=now,
+            updated_at=now,
+        )
+        for index in range(count)
+    ]
+
+def make_attendance(count: int) -> List[Attendance]:
+    now = datetime.now(timezone.utc)
+    employee_id = uuid.uuid4()
+    records = []
+    for index in range(count):
+        day = date(2024, 1, 1) + timedelta(days=index)
+        check_in = datetime(day.year, day.month, day.day, 9, tzinfo=timezone.utc)
+        records.append(Attendance(
+            id=uuid.uuid4(),
+            employee_id=employee_id,
+            date=day,
+            check_in_time=check_in,
+            check_out_time=check_in + timedelta(hours=8, minutes=30),
+            break_duration=30,
+            total_hours=Decimal("8.00"),
+            status=AttendanceStatus.present,
+            location_check_in="Office",
+            created_at=now,
+            updated_at=now,
+        ))
+    return records
+
+def default_path(field, rows) -> bytes:
+    """What FastAPI does for `response_model=List[schema]` when a route returns ORM objects."""
+    content = asyncio.run(serialize_response(field=field, response_content=rows))
+    return JSONResponse(content).body
+
+def fast_path(schema, rows) -> bytes:
+    return FastJSONResponse(dump_rows(schema, rows)).body
+
+def median_ms(fn: Callable[[], bytes], repeat: int) -> float:
+    fn()  # warm up caches
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings) * 1000
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    print(f"encoder: {'orjson' if orjson else 'pydantic-core'}, {args.rows} rows, median of {args.repeat}")
+    for name, schema, rows in (
+        ("employees", EmployeeResponse, make_employees(args.rows)),
+        ("attendance", AttendanceResponse, make_attendance(args.rows)),
+    ):
+        field = create_response_field(name="response", type_=List[schema])
+        default_ms = median_ms(lambda: default_path(field, rows), args.repeat)
+        fast_ms = median_ms(lambda: fast_path(schema, rows), args.repeat)
+        print(f"{name:<12} default {default_ms:8.2f} ms   fast {fast_ms:8.2f} ms   {default_ms / fast_ms:5.1f}x")
+
+if __name__ == "__main__":
+    main()
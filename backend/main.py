@@ -1,12 +1,13 @@
 from fastapi import FastAPI, HTTPException, Depends, status
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy.orm import Session
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
 from contextlib import asynccontextmanager
 import uvicorn
 
-from app.database import engine, get_db
-from app.models import Base
+from app.database import get_async_db, read_your_writes_middleware, replica_sessions
+from app.auth import password_executor
 from app.routers import (
     auth, 
     employees, 
@@ -17,19 +18,24 @@ from app.routers import (
     recruitment, 
     performance,
     training,
-    announcements
+    announcements,
+    dashboard,
+    jobs
 )
 from app.config import settings
-
-# Create tables
-Base.metadata.create_all(bind=engine)
+from app.schema import check_schema
+from app.metrics import MetricsMiddleware, metrics_response, pool_status
+from app.statement_budget import statement_budget_middleware
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    # Startup
-    print("🚀 HRMS Backend starting up...")
+    # Startup. Migrations are applied before deploying (alembic upgrade head);
+    # workers only check the revision, so they neither race nor reflect the schema
+    revision = check_schema()
+    print(f"🚀 HRMS Backend starting up (schema {revision})...")
     yield
     # Shutdown
+    password_executor.shutdown(wait=False)
     print("👋 HRMS Backend shutting down...")
 
 app = FastAPI(
@@ -48,6 +54,18 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Request latency, in-flight and per-request database metrics for /metrics
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+
+# Per-request SQL statement counting (development/test) to catch N+1 queries
+if settings.SQL_STATEMENT_BUDGET:
+    app.middleware("http")(statement_budget_middleware)
+
+# Read-your-writes: clients that just wrote read from the primary, not a lagging replica
+if replica_sessions:
+    app.middleware("http")(read_your_writes_middleware)
+
 # Include routers
 app.include_router(auth.router, prefix="/api/auth", tags=["Authentication"])
 app.include_router(employees.router, prefix="/api/employees", tags=["Employees"])
@@ -59,6 +77,8 @@ app.include_router(recruitment.router, prefix="/api/recruitment", tags=["Recruit
 app.include_router(performance.router, prefix="/api/performance", tags=["Performance"])
 app.include_router(training.router, prefix="/api/training", tags=["Training"])
 app.include_router(announcements.router, prefix="/api/announcements", tags=["Announcements"])
+app.include_router(dashboard.router, prefix="/api/dashboard", tags=["Dashboard"])
+app.include_router(jobs.router, prefix="/api/jobs", tags=["Jobs"])
 
 @app.get("/")
 async def root():
@@ -69,21 +89,29 @@ async def root():
         "status": "healthy"
     }
 
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    return metrics_response()
+
 @app.get("/health")
-async def health_check(db: Session = Depends(get_db)):
+async def health_check(db: AsyncSession = Depends(get_async_db)):
     try:
         # Simple database connectivity check
-        db.execute("SELECT 1")
-        return {
-            "status": "healthy",
-            "database": "connected",
-            "version": "1.0.0"
-        }
+        await db.execute(text("SELECT 1"))
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
             detail=f"Database connection failed: {str(e)}"
         )
+    
+    pools = pool_status()
+    return {
+        # Saturated pools make new requests queue for a connection
+        "status": "degraded" if any(pool.get("saturated") for pool in pools.values()) else "healthy",
+        "database": "connected",
+        "pools": pools,
+        "version": "1.0.0"
+    }
 
 if __name__ == "__main__":
     uvicorn.run(
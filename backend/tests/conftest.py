@@ -0,0 +1,96 @@
+"""Shared fixtures: a migrated SQLite database and an authenticated API client.
+
+Settings are read from the environment when app.config is first imported, so
+the test database and flags are set here, before any app module is loaded.
+Run from the backend directory with `python -m pytest`.
+"""
+import os
+import tempfile
+import uuid
+from datetime import date
+
+_database = os.path.join(tempfile.mkdtemp(prefix="hrms-tests-"), "test.db")
+os.environ["DATABASE_URL"] = f"sqlite:///{_database}"
+os.environ["ENVIRONMENT"] = "test"
+os.environ["DB_ECHO"] = "false"
+# Requests above their budget fail with a 500 (see app/statement_budget.py)
+os.environ["SQL_STATEMENT_BUDGET"] = "50"
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.models import Department, Employee, EmploymentType, Organization
+
+@pytest.fixture(scope="session")
+def client():
+    from app.schema import upgrade_to_head
+    upgrade_to_head()
+    import main
+    with TestClient(main.app) as test_client:
+        yield test_client
+
+@pytest.fixture
+def db(client):
+    from app.database import SessionLocal
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+def create_organization(db) -> Organization:
+    organization = Organization(name=f"Org {uuid.uuid4().hex[:8]}")
+    db.add(organization)
+    db.commit()
+    return organization
+
+def create_employee(db, organization_id, **values) -> Employee:
+    suffix = uuid.uuid4().hex[:10]
+    employee = Employee(**{
+        "employee_id": f"T{suffix}",
+        "organization_id": organization_id,
+        "first_name": "Test",
+        "last_name": f"Employee{suffix}",
+        "email": f"{suffix}@example.com",
+        "hire_date": date(2020, 1, 1),
+        "employment_type": EmploymentType.full_time,
+        **values,
+    })
+    db.add(employee)
+    db.commit()
+    return employee
+
+@pytest.fixture
+def organization(db) -> Organization:
+    return create_organization(db)
+
+@pytest.fixture
+def department(db, organization) -> Department:
+    department = Department(organization_id=organization.id, name="Engineering")
+    db.add(department)
+    db.commit()
+    return department
+
+@pytest.fixture
+def make_employee(db, organization):
+    """Create an employee of the test organization; keyword arguments override the defaults."""
+    return lambda **values: create_employee(db, organization.id, **values)
+
+def login(client, db, organization_id) -> dict:
+    """Register a user for a new employee and return its Authorization header."""
+    employee = create_employee(db, organization_id)
+    username = f"user{uuid.uuid4().hex[:10]}"
+    response = client.post("/api/auth/register", json={
+        "username": username,
+        "email": f"{username}@example.com",
+        "password": "password123",
+        "employee_id": str(employee.id),
+    })
+    assert response.status_code == 200, response.text
+    response = client.post("/api/auth/login", json={"username": username, "password": "password123"})
+    assert response.status_code == 200, response.text
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+@pytest.fixture
+def auth_headers(client, db, organization) -> dict:
+    return login(client, db, organization.id)
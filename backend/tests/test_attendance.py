@@ -0,0 +1,108 @@
+import asyncio
+from datetime import date
+
+from app.attendance_rollups import rebuild_rollups
+from app.database import open_async_session
+from app.models import AttendanceRollup
+
+def _event(employee, event_type: str, timestamp: str, **values) -> dict:
+    return {"employee_id": str(employee.id), "event_type": event_type, "timestamp": timestamp, **values}
+
+def _ingest(client, auth_headers, *events):
+    response = client.post("/api/attendance/bulk", headers=auth_headers, json={"events": list(events)})
+    assert response.status_code == 200, response.text
+    return response.json()
+
+def _summary(client, auth_headers, employee, month: str) -> list:
+    response = client.get(
+        f"/api/attendance/summary?employee_id={employee.id}&start_month={month}", headers=auth_headers
+    )
+    assert response.status_code == 200, response.text
+    return response.json()
+
+def test_overnight_shift_is_one_row(client, auth_headers, make_employee):
+    employee = make_employee()
+    result = _ingest(
+        client, auth_headers,
+        _event(employee, "check_in", "2026-10-05T22:00:00Z"),
+        _event(employee, "check_out", "2026-10-06T06:00:00Z", break_duration=30),
+    )
+    assert result["accepted"] == 2
+    assert result["results"][0]["attendance_id"] == result["results"][1]["attendance_id"]
+
+    [summary] = _summary(client, auth_headers, employee, "2026-10-01")
+    assert summary["days_recorded"] == 1
+    assert summary["present_days"] == 1
+    assert summary["total_hours"] == 7.5
+
+def test_check_out_pairs_with_a_stored_check_in(client, auth_headers, make_employee):
+    employee = make_employee()
+    _ingest(client, auth_headers, _event(employee, "check_in", "2026-10-30T23:00:00Z"))
+    result = _ingest(client, auth_headers, _event(employee, "check_out", "2026-10-31T07:00:00Z"))
+    assert result["accepted"] == 1
+
+    [summary] = _summary(client, auth_headers, employee, "2026-10-01")
+    assert summary["days_recorded"] == 1
+    assert summary["total_hours"] == 8
+
+def test_check_out_without_a_check_in_is_rejected(client, auth_headers, make_employee):
+    employee = make_employee()
+    result = _ingest(client, auth_headers, _event(employee, "check_out", "2026-10-07T17:00:00Z"))
+    assert result["rejected"] == 1
+    assert result["results"][0]["detail"] == "No check-in found for check-out"
+    assert _summary(client, auth_headers, employee, "2026-10-01") == []
+
+def test_replayed_batch_is_not_counted_twice(client, auth_headers, make_employee):
+    employee = make_employee()
+    events = (
+        _event(employee, "check_in", "2026-10-08T09:00:00Z"),
+        _event(employee, "check_out", "2026-10-08T17:00:00Z"),
+    )
+    _ingest(client, auth_headers, *events)
+    _ingest(client, auth_headers, *events)
+
+    [summary] = _summary(client, auth_headers, employee, "2026-10-01")
+    assert summary["days_recorded"] == 1
+    assert summary["total_hours"] == 8
+
+def test_check_out_replaces_the_rows_hours_in_the_rollup(client, auth_headers, make_employee):
+    employee = make_employee()
+    response = client.post("/api/attendance/check-in", headers=auth_headers, json={
+        "employee_id": str(employee.id), "date": "2026-10-12",
+        "check_in_time": "2026-10-12T09:00:00Z", "status": "present",
+    })
+    assert response.status_code == 200, response.text
+    attendance_id = response.json()["id"]
+
+    # A corrected check-out replaces the earlier hours rather than adding to them
+    for check_out_time in ("2026-10-12T17:00:00Z", "2026-10-12T18:00:00Z"):
+        response = client.put(
+            f"/api/attendance/{attendance_id}/check-out", headers=auth_headers,
+            json={"check_out_time": check_out_time}
+        )
+        assert response.status_code == 200, response.text
+
+    [summary] = _summary(client, auth_headers, employee, "2026-10-01")
+    assert summary["days_recorded"] == 1
+    assert summary["total_hours"] == 9
+
+def test_rebuild_matches_the_incremental_rollups(client, auth_headers, db, make_employee):
+    employee = make_employee()
+    _ingest(
+        client, auth_headers,
+        _event(employee, "check_in", "2026-10-13T09:00:00Z"),
+        _event(employee, "check_out", "2026-10-13T17:00:00Z"),
+        _event(employee, "check_in", "2026-10-14T09:00:00Z"),
+    )
+    incremental = _summary(client, auth_headers, employee, "2026-10-01")
+    db.query(AttendanceRollup).delete()
+    db.commit()
+
+    async def run():
+        session = open_async_session()
+        try:
+            return await rebuild_rollups(session, date(2026, 10, 1), date(2026, 10, 1))
+        finally:
+            await session.close()
+    assert asyncio.run(run())["months"] == 1
+    assert _summary(client, auth_headers, employee, "2026-10-01") == incremental
@@ -0,0 +1,41 @@
+from uuid import UUID
+
+import pytest
+
+from app.auth import create_access_token, user_cache, verify_token
+from app.models import User
+
+def _user_id(headers) -> UUID:
+    return UUID(verify_token(headers["Authorization"].removeprefix("Bearer "))["sub"])
+
+def test_cached_user_has_no_password_hash(client, auth_headers):
+    assert client.get("/api/auth/me", headers=auth_headers).status_code == 200
+    snapshot = user_cache.get(_user_id(auth_headers))
+    assert snapshot is not None
+    assert "password_hash" not in snapshot
+
+def test_cache_is_cleared_on_commit_not_on_flush(client, auth_headers, db):
+    user_id = _user_id(auth_headers)
+    assert client.get("/api/auth/me", headers=auth_headers).status_code == 200
+
+    user = db.get(User, user_id)
+    user.is_active = False
+    db.flush()
+    db.rollback()
+    # Nothing was committed, so the entry stays
+    assert user_cache.get(user_id) is not None
+
+    user = db.get(User, user_id)
+    user.is_active = False
+    db.commit()
+    assert user_cache.get(user_id) is None
+    response = client.get("/api/auth/me", headers=auth_headers)
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Inactive user"
+
+@pytest.mark.parametrize("claims", [{"sub": "not-a-uuid"}, {"sub": 42}, {"username": "nobody"}])
+def test_token_without_a_valid_subject_is_unauthorized(client, claims):
+    headers = {"Authorization": f"Bearer {create_access_token(claims)}"}
+    response = client.get("/api/auth/me", headers=headers)
+    assert response.status_code == 401
+    assert response.json()["detail"] == "Could not validate credentials"
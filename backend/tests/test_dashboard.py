@@ -0,0 +1,81 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+from app.config import settings
+from app.dashboard import queue_due_refreshes, refresh_summary_job
+from app.database import open_async_session
+from app.models import DashboardSummary, Employee, Job, JobStatus, Organization
+
+def _summary(client, auth_headers, organization):
+    return client.get(f"/api/dashboard/summary?organization_id={organization.id}", headers=auth_headers)
+
+def _queued_refreshes(db, organization) -> int:
+    return db.query(Job).filter_by(
+        unique_key=f"dashboard.refresh:{organization.id}", status=JobStatus.queued
+    ).count()
+
+def _run_refresh(organization) -> None:
+    async def run():
+        db = open_async_session()
+        try:
+            await refresh_summary_job(db, {"organization_id": str(organization.id)}, None)
+        finally:
+            await db.close()
+    asyncio.run(run())
+
+def test_reads_queue_one_refresh_instead_of_computing(client, auth_headers, db, organization, make_employee):
+    make_employee()
+    for _ in range(3):
+        response = _summary(client, auth_headers, organization)
+        assert response.status_code == 503
+        assert "Retry-After" in response.headers
+    assert _queued_refreshes(db, organization) == 1
+    assert db.get(DashboardSummary, organization.id) is None
+
+    _run_refresh(organization)
+    response = _summary(client, auth_headers, organization)
+    assert response.status_code == 200
+    employees = db.query(Employee).filter_by(organization_id=organization.id).count()
+    assert response.json()["total_employees"] == employees
+
+def _age_summary(db, organization, **age) -> None:
+    stored = db.get(DashboardSummary, organization.id)
+    stored.refreshed_at = datetime.now(timezone.utc) - timedelta(**age)
+    db.commit()
+
+def test_summary_past_the_staleness_bound_is_not_served(client, auth_headers, db, organization):
+    _run_refresh(organization)
+    assert _summary(client, auth_headers, organization).status_code == 200
+    _age_summary(db, organization, seconds=settings.DASHBOARD_MAX_STALENESS_SECONDS + 5)
+
+    response = _summary(client, auth_headers, organization)
+    assert response.status_code == 503
+    assert _queued_refreshes(db, organization) == 1
+
+def test_scheduler_queues_due_summaries_only(client, db, organization):
+    other = Organization(name="Other organization")
+    db.add(other)
+    db.commit()
+    _run_refresh(organization)
+    _run_refresh(other)
+    _age_summary(db, other, seconds=settings.DASHBOARD_REFRESH_INTERVAL_SECONDS + 5)
+
+    async def run():
+        session = open_async_session()
+        try:
+            return await queue_due_refreshes(session)
+        finally:
+            await session.close()
+    queued = asyncio.run(run())
+    assert other.id in queued
+    assert organization.id not in queued
+    assert _queued_refreshes(db, other) == 1
+
+def test_refresh_parameter_is_ignored(client, auth_headers, db, organization):
+    _run_refresh(organization)
+    refreshed_at = _summary(client, auth_headers, organization).json()["refreshed_at"]
+    response = client.get(
+        f"/api/dashboard/summary?organization_id={organization.id}&refresh=true", headers=auth_headers
+    )
+    assert response.status_code == 200
+    assert response.json()["refreshed_at"] == refreshed_at
@@ -0,0 +1,34 @@
+from app.http_cache import reference_cache
+
+def _manager_name(client, auth_headers, department) -> str:
+    response = client.get(f"/api/departments/{department.id}", headers=auth_headers)
+    assert response.status_code == 200, response.text
+    return response.json()["manager"]["first_name"]
+
+def test_manager_changes_clear_cached_departments_on_commit(client, auth_headers, db, department, make_employee):
+    manager = make_employee(first_name="Ada")
+    department.manager_id = manager.id
+    db.commit()
+    assert _manager_name(client, auth_headers, department) == "Ada"
+
+    manager.first_name = "Grace"
+    db.flush()
+    db.rollback()
+    # Nothing was committed, so the cached body stays
+    assert reference_cache.get(("department", department.id)) is not None
+
+    manager.first_name = "Grace"
+    db.commit()
+    assert reference_cache.get(("department", department.id)) is None
+    assert _manager_name(client, auth_headers, department) == "Grace"
+
+def test_deleting_the_manager_clears_cached_departments(client, auth_headers, db, department, make_employee):
+    manager = make_employee()
+    department.manager_id = manager.id
+    db.commit()
+    assert _manager_name(client, auth_headers, department) == manager.first_name
+
+    db.delete(manager)
+    db.commit()
+    response = client.get(f"/api/departments/{department.id}", headers=auth_headers)
+    assert response.json()["manager"] is None
@@ -0,0 +1,75 @@
+import io
+import random
+
+import pytest
+
+from app.models import Employee
+
+openpyxl = pytest.importorskip("openpyxl")
+
+HEADER = [
+    "employee_id", "organization_id", "first_name", "last_name", "email", "phone",
+    "hire_date", "employment_type", "manager_employee_id",
+]
+
+def _xlsx(rows) -> bytes:
+    workbook = openpyxl.Workbook()
+    sheet = workbook.active
+    sheet.append(HEADER)
+    for row in rows:
+        sheet.append(row)
+    buffer = io.BytesIO()
+    workbook.save(buffer)
+    return buffer.getvalue()
+
+def test_numeric_xlsx_cells_import_as_text(client, auth_headers, db, organization):
+    manager_code = random.randrange(10**8, 10**9)
+    report_code = manager_code + 1
+    content = _xlsx([
+        [manager_code, str(organization.id), "Ada", "Lovelace", f"{manager_code}@example.com",
+         5551234, "2024-01-15", "full_time", None],
+        [float(report_code), str(organization.id), "Grace", "Hopper", f"{report_code}@example.com",
+         5551235.0, "2024-02-01", "full_time", manager_code],
+    ])
+    response = client.post(
+        "/api/employees/import", headers=auth_headers,
+        files={"file": ("employees.xlsx", content, "application/octet-stream")}
+    )
+    assert response.status_code == 200, response.text
+    assert response.json()["errors"] == []
+    assert response.json()["imported"] == 2
+
+    manager = db.query(Employee).filter_by(employee_id=str(manager_code)).one()
+    report = db.query(Employee).filter_by(employee_id=str(report_code)).one()
+    assert (manager.phone, report.phone) == ("5551234", "5551235")
+    assert report.manager_id == manager.id
+
+def test_rows_taken_by_a_concurrent_write_are_reported(client, auth_headers, db, organization, make_employee, monkeypatch):
+    from app import employee_import
+
+    taken = make_employee()
+    existing = employee_import._existing
+    calls = []
+
+    async def racing_existing(session, column, values):
+        # The chunk's employee_id check runs before the concurrent insert commits
+        if column is Employee.employee_id and not calls:
+            calls.append(column)
+            return set()
+        return await existing(session, column, values)
+
+    monkeypatch.setattr(employee_import, "_existing", racing_existing)
+    code = random.randrange(10**8, 10**9)
+    content = (
+        "employee_id,organization_id,first_name,last_name,email,hire_date,employment_type\n"
+        f"{taken.employee_id},{organization.id},Ada,Lovelace,{code}a@example.com,2024-01-15,full_time\n"
+        f"{code},{organization.id},Grace,Hopper,{code}b@example.com,2024-02-01,full_time\n"
+    ).encode()
+    response = client.post(
+        "/api/employees/import", headers=auth_headers, files={"file": ("employees.csv", content, "text/csv")}
+    )
+    assert response.status_code == 200, response.text
+    report = response.json()
+    assert report["imported"] == 1
+    assert report["errors"] == [{"row": 2, "errors": ["employee_id: Employee ID already exists"]}]
+    assert db.query(Employee).filter_by(employee_id=str(code)).count() == 1
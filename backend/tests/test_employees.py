@@ -0,0 +1,41 @@
+import pytest
+
+@pytest.mark.parametrize("path", [
+    "/api/employees/?department_id={department}",
+    "/api/employees/department/{department}",
+    "/api/employees/{employee}",
+    "/api/employees/{employee}/subtree",
+])
+def test_employee_responses_do_not_expose_salary(client, auth_headers, department, make_employee, path):
+    employee = make_employee(department_id=department.id, base_salary=134500)
+    response = client.get(path.format(department=department.id, employee=employee.id), headers=auth_headers)
+    assert response.status_code == 200, response.text
+    body = response.json()
+    for item in body if isinstance(body, list) else [body]:
+        assert "base_salary" not in item
+
+def test_search_uses_the_in_process_index_off_postgres(client, auth_headers, make_employee):
+    """The SQLite fallback of /search (needs the portable Uuid column type)."""
+    employee = make_employee(last_name="Quixotica")
+    make_employee(last_name="Quixote")
+    response = client.get("/api/employees/search?q=quixotic", headers=auth_headers)
+    assert response.status_code == 200, response.text
+    assert response.json()[0]["id"] == str(employee.id)
+
+def test_search_index_only_applies_committed_changes(client, auth_headers, db, make_employee):
+    employee = make_employee(last_name="Quillfeather")
+    # Loads the in-process index
+    assert client.get("/api/employees/search?q=quillfeather", headers=auth_headers).status_code == 200
+
+    employee.last_name = "Zanzibarova"
+    db.flush()
+    db.rollback()
+    response = client.get("/api/employees/search?q=zanzibarova", headers=auth_headers)
+    assert response.json() == []
+    response = client.get("/api/employees/search?q=quillfeather", headers=auth_headers)
+    assert [item["id"] for item in response.json()] == [str(employee.id)]
+
+    employee.last_name = "Zanzibarova"
+    db.commit()
+    response = client.get("/api/employees/search?q=zanzibarova", headers=auth_headers)
+    assert [item["id"] for item in response.json()] == [str(employee.id)]
@@ -0,0 +1,73 @@
+from datetime import date
+
+import pytest
+
+from app.leave import leave_days
+from app.models import LeaveType
+
+@pytest.fixture
+def annual_leave(db, organization) -> LeaveType:
+    leave_type = LeaveType(organization_id=organization.id, name="Annual Leave", max_days_per_year=21)
+    db.add(leave_type)
+    db.commit()
+    return leave_type
+
+def _request(employee, leave_type, start: str, end: str, **values) -> dict:
+    return {
+        "employee_id": str(employee.id),
+        "leave_type_id": str(leave_type.id),
+        "start_date": start,
+        "end_date": end,
+        "reason": "Holiday",
+        **values,
+    }
+
+@pytest.mark.parametrize("start, end, days", [
+    (date(2026, 11, 2), date(2026, 11, 20), 15),  # Monday to Friday, three weeks
+    (date(2026, 11, 6), date(2026, 11, 9), 2),  # Friday to Monday
+    (date(2026, 11, 7), date(2026, 11, 8), 0),  # a weekend
+    (date(2026, 11, 4), date(2026, 11, 4), 1),
+])
+def test_leave_days_counts_working_days(start, end, days):
+    assert leave_days(start, end) == days
+
+def test_understated_total_days_is_rejected(client, auth_headers, make_employee, annual_leave):
+    employee = make_employee()
+    response = client.post(
+        "/api/leave/", headers=auth_headers,
+        json=_request(employee, annual_leave, "2026-11-02", "2026-11-20", total_days=1)
+    )
+    assert response.status_code == 400
+    assert "total_days must be 15" in response.json()["detail"]
+
+    # Rejected before any balance row was touched
+    balance = client.get(f"/api/leave/balances/{employee.id}/{annual_leave.id}?year=2026", headers=auth_headers)
+    assert balance.status_code == 404
+
+def test_balance_holds_the_days_the_dates_cover(client, auth_headers, make_employee, annual_leave):
+    employee = make_employee()
+    response = client.post(
+        "/api/leave/", headers=auth_headers, json=_request(employee, annual_leave, "2026-11-02", "2026-11-20")
+    )
+    assert response.status_code == 200, response.text
+    assert response.json()["total_days"] == 15
+
+    balance = client.get(f"/api/leave/balances/{employee.id}/{annual_leave.id}?year=2026", headers=auth_headers)
+    assert balance.status_code == 200, balance.text
+    assert balance.json()["pending_days"] == 15
+    assert balance.json()["available_days"] == 6
+
+    # The remaining 6 days do not cover another two weeks
+    response = client.post(
+        "/api/leave/", headers=auth_headers, json=_request(employee, annual_leave, "2026-12-07", "2026-12-18")
+    )
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Insufficient leave balance"
+
+def test_request_without_working_days_is_rejected(client, auth_headers, make_employee, annual_leave):
+    response = client.post(
+        "/api/leave/", headers=auth_headers,
+        json=_request(make_employee(), annual_leave, "2026-11-07", "2026-11-08")
+    )
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Leave request covers no working days"
@@ -0,0 +1,18 @@
+import re
+
+def _sample(body: str, name: str, cache: str) -> float:
+    match = re.search(rf'^{name}{{cache="{cache}"}} (\S+)$', body, re.MULTILINE)
+    assert match, f"{name} for {cache} not reported"
+    return float(match.group(1))
+
+def test_cache_hits_and_misses_are_exported(client, auth_headers):
+    before = client.get("/metrics").text
+    # Each authenticated request looks its user up in the cache
+    for _ in range(3):
+        assert client.get("/api/employees/", headers=auth_headers).status_code == 200
+    after = client.get("/metrics").text
+
+    assert _sample(after, "hrms_cache_hits_total", "users") >= _sample(before, "hrms_cache_hits_total", "users") + 2
+    assert _sample(after, "hrms_cache_misses_total", "users") >= _sample(before, "hrms_cache_misses_total", "users")
+    assert _sample(after, "hrms_cache_entries", "users") >= 1
+    assert _sample(after, "hrms_cache_hits_total", "reference") >= 0
@@ -0,0 +1,57 @@
+from datetime import date
+from uuid import uuid4
+
+import pandas as pd
+import pytest
+
+from app.config import settings
+from app.payroll import compute_payroll
+
+SEPTEMBER = (date(2026, 9, 1), date(2026, 9, 30))
+
+def _compute(*employees, period=SEPTEMBER):
+    frame = pd.DataFrame(employees, columns=["employee_id", "annual_salary", "hire_date", "termination_date"])
+    overtime = pd.DataFrame(columns=["employee_id", "overtime_hours"])
+    unpaid_leave = pd.DataFrame(columns=["employee_id", "start_date", "end_date"])
+    return compute_payroll(frame, overtime, unpaid_leave, *period).set_index("employee_id")
+
+@pytest.mark.parametrize("hire_date, termination_date, days", [
+    (date(2020, 1, 1), None, 30),  # employed the whole month
+    (date(2026, 9, 30), None, 1),  # hired on the last day
+    (date(2020, 1, 1), date(2026, 9, 10), 10),  # left on the 10th
+    (date(2026, 9, 11), date(2026, 9, 20), 10),
+])
+def test_basic_salary_covers_employed_days(hire_date, termination_date, days):
+    employee_id = uuid4()
+    payslip = _compute((employee_id, 134500, hire_date, termination_date)).loc[employee_id]
+    assert payslip["basic_salary"] == round(134500 / 12 * days / 30, 2)
+    assert payslip["retirement_deduction"] == round(
+        134500 / 12 * days / 30 * settings.PAYROLL_RETIREMENT_RATE, 2
+    )
+
+def test_employees_in_one_chunk_are_prorated_separately():
+    full_month, new_hire = uuid4(), uuid4()
+    payslips = _compute(
+        (full_month, 134500, date(2020, 1, 1), None),
+        (new_hire, 134500, date(2026, 9, 30), None),
+    )
+    assert payslips.loc[full_month, "basic_salary"] == 11208.33
+    assert payslips.loc[new_hire, "basic_salary"] == 373.61
+
+@pytest.mark.parametrize("period", [
+    (date(2026, 2, 1), date(2026, 2, 28)),
+    (date(2026, 3, 1), date(2026, 3, 31)),
+    (date(2026, 7, 1), date(2026, 7, 31)),
+])
+def test_full_month_pays_a_twelfth_whatever_its_length(period):
+    employee_id = uuid4()
+    payslip = _compute((employee_id, 134500, date(2020, 1, 1), None), period=period).loc[employee_id]
+    assert payslip["basic_salary"] == 11208.33
+
+def test_quarter_and_partial_periods():
+    employee_id = uuid4()
+    employee = (employee_id, 134500, date(2020, 1, 1), None)
+    quarter = _compute(employee, period=(date(2026, 1, 1), date(2026, 3, 31))).loc[employee_id]
+    assert quarter["basic_salary"] == 33625.0
+    fortnight = _compute(employee, period=(date(2026, 3, 2), date(2026, 3, 15))).loc[employee_id]
+    assert fortnight["basic_salary"] == round(134500 * 14 / 365, 2)
@@ -0,0 +1,36 @@
+import asyncio
+import json
+from types import SimpleNamespace
+from uuid import uuid4
+
+import app.screening  # registers the screening.posting handler
+from app.config import settings
+from app.database import open_async_session
+from app.jobs import Worker, enqueue
+from app.models import Job, JobStatus
+
+def test_screening_a_missing_posting_is_not_found(client, auth_headers, monkeypatch):
+    monkeypatch.setattr(settings, "AI_SCREENING_ENABLED", True)
+    response = client.post(f"/api/recruitment/postings/{uuid4()}/screen", headers=auth_headers)
+    assert response.status_code == 404
+    assert response.json()["detail"] == "Job posting not found"
+
+def test_screening_job_for_a_deleted_posting_fails_without_retries(client, db):
+    async def queue():
+        session = open_async_session()
+        try:
+            return (await enqueue(session, "screening.posting", {"job_posting_id": uuid4()})).id
+        finally:
+            await session.close()
+    job = db.get(Job, asyncio.run(queue()))
+    # Claimed by this worker on its first attempt
+    worker = Worker(worker_id="test-worker")
+    job.status, job.locked_by, job.attempts = JobStatus.running, worker.worker_id, 1
+    db.commit()
+
+    asyncio.run(worker._execute(SimpleNamespace(
+        id=job.id, kind=job.kind, payload=job.payload, attempts=1, max_attempts=job.max_attempts
+    )))
+    db.refresh(job)
+    assert job.status == JobStatus.failed
+    assert job.error == f"Job posting {json.loads(job.payload)['job_posting_id']} not found"
@@ -0,0 +1,64 @@
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+
+from app.database import engine
+from app.statement_budget import (
+    StatementBudgetExceeded, assert_max_statements, statement_budget, statement_budget_middleware
+)
+
+def _run_statements(count: int) -> None:
+    with engine.connect() as connection:
+        for _ in range(count):
+            connection.execute(text("SELECT 1"))
+
+def test_assert_max_statements_within_budget(client):
+    with assert_max_statements(3) as counter:
+        _run_statements(3)
+    assert counter.count == 3
+
+def test_assert_max_statements_over_budget(client):
+    with pytest.raises(StatementBudgetExceeded, match="4 SQL statements issued, budget is 3"):
+        with assert_max_statements(3):
+            _run_statements(4)
+
+def test_middleware_fails_requests_over_their_budget(client):
+    app = FastAPI()
+    app.middleware("http")(statement_budget_middleware)
+
+    @app.get("/two", dependencies=[Depends(statement_budget(2))])
+    def two():
+        _run_statements(2)
+        return {}
+
+    @app.get("/three", dependencies=[Depends(statement_budget(2))])
+    def three():
+        _run_statements(3)
+        return {}
+
+    with TestClient(app) as test_client:
+        response = test_client.get("/two")
+        assert response.status_code == 200
+        assert response.headers["X-SQL-Statements"] == "2"
+        response = test_client.get("/three")
+        assert response.status_code == 500
+        assert "SQL statement budget exceeded" in response.json()["detail"]
+
+@pytest.mark.parametrize("path", ["/api/employees/?department_id={department}", "/api/employees/page?department_id={department}", "/api/employees/department/{department}"])
+def test_employee_listings_stay_within_budget(client, auth_headers, department, make_employee, path):
+    """Statement counts do not grow with the rows listed (no per-row lazy loads)."""
+    manager = make_employee(department_id=department.id)
+    url = path.format(department=department.id)
+    # Warm the authenticated-user cache so only the listing is counted
+    client.get(url, headers=auth_headers)
+
+    counts = []
+    for _ in range(2):
+        for _ in range(5):
+            make_employee(department_id=department.id, manager_id=manager.id)
+        response = client.get(url, headers=auth_headers)
+        # Over the route's budget the middleware answers 500 in tests
+        assert response.status_code == 200, response.text
+        counts.append(int(response.headers["X-SQL-Statements"]))
+    assert counts[0] == counts[1]
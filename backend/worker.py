@@ -0,0 +1,43 @@
+"""Background job worker.
+
+Runs queued jobs (see app/jobs.py) next to the API, with the same settings
+and database, and queues the periodic dashboard summary refreshes. Start one
+or more with:
+    python worker.py [--concurrency N]
+SIGTERM / Ctrl-C stops claiming jobs and waits for the running ones.
+"""
+import argparse
+import asyncio
+import logging
+import signal
+
+from app.dashboard import run_refresh_scheduler
+from app.jobs import Worker
+from app.schema import check_schema
+from app.screening import shutdown_executor as shutdown_screening_executor
+# Imported for their @job_handler registrations
+import app.payroll  # noqa: F401
+import app.screening  # noqa: F401
+
+async def run(concurrency=None) -> None:
+    worker = Worker(concurrency)
+    loop = asyncio.get_running_loop()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(signum, worker.stop)
+    scheduler = asyncio.create_task(run_refresh_scheduler())
+    try:
+        await worker.run()
+    finally:
+        scheduler.cancel()
+        shutdown_screening_executor()
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run background jobs.")
+    parser.add_argument("--concurrency", type=int, help="jobs run at once (default JOB_WORKER_CONCURRENCY)")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    check_schema()
+    asyncio.run(run(args.concurrency))
+
+if __name__ == "__main__":
+    main()
@@ -1,473 +1,13 @@
--- HRMS Database Schema
--- Comprehensive HR Management System Database Design
-
--- Create database and user (already handled by docker-compose)
--- This file contains the table creation scripts
-
--- Enable UUID extension
-CREATE EXTENSION IF NOT EXISTS "uuid-ossp";
-
--- Enum types for better data integrity
-CREATE TYPE employment_status AS ENUM ('active', 'inactive', 'terminated', 'suspended');
-CREATE TYPE employment_type AS ENUM ('full_time', 'part_time', 'contract', 'intern', 'consultant');
-CREATE TYPE gender_type AS ENUM ('male', 'female', 'other', 'prefer_not_to_say');
-CREATE TYPE marital_status AS ENUM ('single', 'married', 'divorced', 'widowed');
-CREATE TYPE leave_status AS ENUM ('pending', 'approved', 'rejected', 'cancelled');
-CREATE TYPE leave_type AS ENUM ('annual', 'sick', 'maternity', 'paternity', 'emergency', 'personal');
-CREATE TYPE attendance_status AS ENUM ('present', 'absent', 'late', 'half_day', 'work_from_home');
-CREATE TYPE recruitment_status AS ENUM ('applied', 'screening', 'interview_scheduled', 'interviewed', 'selected', 'rejected', 'offer_sent', 'offer_accepted', 'joined');
-CREATE TYPE interview_type AS ENUM ('phone', 'video', 'in_person', 'technical', 'hr', 'final');
-CREATE TYPE performance_rating AS ENUM ('outstanding', 'exceeds_expectations', 'meets_expectations', 'below_expectations', 'unsatisfactory');
-CREATE TYPE priority_level AS ENUM ('low', 'medium', 'high', 'critical');
-
--- 1. Organizations Table
-CREATE TABLE organizations (
-    id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
-    name VARCHAR(255) NOT NULL,
-    description TEXT,
-    address TEXT,
-    phone VARCHAR(20),
-    email VARCHAR(255),
-    website VARCHAR(255),
-    logo_url VARCHAR(500),
-    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-);
-
--- 2. Departments Table
-CREATE TABLE departments (
-    id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
-    organization_id UUID REFERENCES organizations(id) ON DELETE CASCADE,
-    name VARCHAR(255) NOT NULL,
-    description TEXT,
-    manager_id UUID, -- Self-referencing to employees table
-    budget DECIMAL(15,2),
-    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-);
-
--- 3. Positions/Job Titles Table
-CREATE TABLE positions (
-    id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
-    department_id UUID REFERENCES departments(id) ON DELETE CASCADE,
-    title VARCHAR(255) NOT NULL,
-    description TEXT,
-    requirements TEXT,
-    min_salary DECIMAL(12,2),
-    max_salary DECIMAL(12,2),
-    is_active BOOLEAN DEFAULT true,
-    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-);
-
--- 4. Employees Table (Core table)
-CREATE TABLE employees (
-    id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
-    employee_id VARCHAR(50) UNIQUE NOT NULL, -- Company employee ID
-    organization_id UUID REFERENCES organizations(id) ON DELETE CASCADE,
-    department_id UUID REFERENCES departments(id) ON DELETE SET NULL,
-    position_id UUID REFERENCES positions(id) ON DELETE SET NULL,
-    manager_id UUID REFERENCES employees(id) ON DELETE SET NULL,
-    
-    -- Personal Information
-    first_name VARCHAR(100) NOT NULL,
-    last_name VARCHAR(100) NOT NULL,
-    email VARCHAR(255) UNIQUE NOT NULL,
-    phone VARCHAR(20),
-    date_of_birth DATE,
-    gender gender_type,
-    marital_status marital_status,
-    nationality VARCHAR(100),
-    
-    -- Address Information
-    address TEXT,
-    city VARCHAR(100),
-    state VARCHAR(100),
-    postal_code VARCHAR(20),
-    country VARCHAR(100),
-    
-    -- Employment Information
-    hire_date DATE NOT NULL,
-    employment_type employment_type NOT NULL,
-    employment_status employment_status DEFAULT 'active',
-    termination_date DATE,
-    termination_reason TEXT,
-    
-    -- Emergency Contact
-    emergency_contact_name VARCHAR(200),
-    emergency_contact_phone VARCHAR(20),
-    emergency_contact_relationship VARCHAR(100),
-    
-    -- Profile
-    profile_picture_url VARCHAR(500),
-    bio TEXT,
-    
-    -- System fields
-    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-);
-
--- 5. Users Table (for authentication)
-CREATE TABLE users (
-    id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
-    employee_id UUID REFERENCES employees(id) ON DELETE CASCADE,
-    username VARCHAR(100) UNIQUE NOT NULL,
-    email VARCHAR(255) UNIQUE NOT NULL,
-    password_hash VARCHAR(255) NOT NULL,
-    is_active BOOLEAN DEFAULT true,
-    last_login TIMESTAMP,
-    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-);
-
--- 6. Roles Table
-CREATE TABLE roles (
-    id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
-    name VARCHAR(100) UNIQUE NOT NULL,
-    description TEXT,
-    permissions JSONB, -- Store permissions as JSON
-    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-);
-
--- 7. User Roles Table (Many-to-many)
-CREATE TABLE user_roles (
-    id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
-    user_id UUID REFERENCES users(id) ON DELETE CASCADE,
-    role_id UUID REFERENCES roles(id) ON DELETE CASCADE,
-    assigned_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-    assigned_by UUID REFERENCES users(id) ON DELETE SET NULL,
-    UNIQUE(user_id, role_id)
-);
-
--- 8. Payroll Table
-CREATE TABLE payroll (
-    id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
-    employee_id UUID REFERENCES employees(id) ON DELETE CASCADE,
-    pay_period_start DATE NOT NULL,
-    pay_period_end DATE NOT NULL,
-    
-    -- Salary Components
-    basic_salary DECIMAL(12,2) NOT NULL,
-    allowances DECIMAL(12,2) DEFAULT 0,
-    overtime_pay DECIMAL(12,2) DEFAULT 0,
-    bonus DECIMAL(12,2) DEFAULT 0,
-    gross_pay DECIMAL(12,2) NOT NULL,
-    
-    -- Deductions
-    tax_deduction DECIMAL(12,2) DEFAULT 0,
-    insurance_deduction DECIMAL(12,2) DEFAULT 0,
-    retirement_deduction DECIMAL(12,2) DEFAULT 0,
-    other_deductions DECIMAL(12,2) DEFAULT 0,
-    total_deductions DECIMAL(12,2) NOT NULL,
-    
-    -- Net Pay
-    net_pay DECIMAL(12,2) NOT NULL,
-    
-    -- Status
-    is_processed BOOLEAN DEFAULT false,
-    processed_at TIMESTAMP,
-    processed_by UUID REFERENCES users(id) ON DELETE SET NULL,
-    
-    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-);
-
--- 9. Attendance Table
-CREATE TABLE attendance (
-    id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
-    employee_id UUID REFERENCES employees(id) ON DELETE CASCADE,
-    date DATE NOT NULL,
-    check_in_time TIMESTAMP,
-    check_out_time TIMESTAMP,
-    break_duration INTEGER DEFAULT 0, -- in minutes
-    total_hours DECIMAL(4,2),
-    status attendance_status NOT NULL,
-    notes TEXT,
-    location_check_in VARCHAR(255),
-    location_check_out VARCHAR(255),
-    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-    UNIQUE(employee_id, date)
-);
-
--- 10. Leave Types Table
-CREATE TABLE leave_types (
-    id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
-    organization_id UUID REFERENCES organizations(id) ON DELETE CASCADE,
-    name VARCHAR(100) NOT NULL,
-    description TEXT,
-    max_days_per_year INTEGER,
-    is_paid BOOLEAN DEFAULT true,
-    requires_approval BOOLEAN DEFAULT true,
-    advance_notice_days INTEGER DEFAULT 7,
-    is_active BOOLEAN DEFAULT true,
-    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-);
-
--- 11. Leave Requests Table
-CREATE TABLE leave_requests (
-    id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
-    employee_id UUID REFERENCES employees(id) ON DELETE CASCADE,
-    leave_type_id UUID REFERENCES leave_types(id) ON DELETE RESTRICT,
-    start_date DATE NOT NULL,
-    end_date DATE NOT NULL,
-    total_days INTEGER NOT NULL,
-    reason TEXT NOT NULL,
-    status leave_status DEFAULT 'pending',
-    approved_by UUID REFERENCES employees(id) ON DELETE SET NULL,
-    approved_at TIMESTAMP,
-    rejection_reason TEXT,
-    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-);
-
--- 12. Job Postings Table
-CREATE TABLE job_postings (
-    id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
-    organization_id UUID REFERENCES organizations(id) ON DELETE CASCADE,
-    position_id UUID REFERENCES positions(id) ON DELETE CASCADE,
-    title VARCHAR(255) NOT NULL,
-    description TEXT NOT NULL,
-    requirements TEXT,
-    location VARCHAR(255),
-    employment_type employment_type NOT NULL,
-    salary_min DECIMAL(12,2),
-    salary_max DECIMAL(12,2),
-    is_active BOOLEAN DEFAULT true,
-    posted_date DATE DEFAULT CURRENT_DATE,
-    closing_date DATE,
-    posted_by UUID REFERENCES users(id) ON DELETE SET NULL,
-    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-);
-
--- 13. Job Applications Table
-CREATE TABLE job_applications (
-    id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
-    job_posting_id UUID REFERENCES job_postings(id) ON DELETE CASCADE,
-    
-    -- Applicant Information
-    first_name VARCHAR(100) NOT NULL,
-    last_name VARCHAR(100) NOT NULL,
-    email VARCHAR(255) NOT NULL,
-    phone VARCHAR(20),
-    resume_url VARCHAR(500),
-    cover_letter TEXT,
-    
-    -- Application Status
-    status recruitment_status DEFAULT 'applied',
-    applied_date DATE DEFAULT CURRENT_DATE,
-    
-    -- AI Screening Results
-    ai_screening_score DECIMAL(5,2), -- 0.00 to 100.00
-    ai_screening_notes TEXT,
-    ai_screening_date TIMESTAMP,
-    
-    -- Additional Info
-    expected_salary DECIMAL(12,2),
-    available_start_date DATE,
-    notes TEXT,
-    
-    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-);
-
--- 14. Interviews Table
-CREATE TABLE interviews (
-    id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
-    job_application_id UUID REFERENCES job_applications(id) ON DELETE CASCADE,
-    interviewer_id UUID REFERENCES employees(id) ON DELETE SET NULL,
-    interview_type interview_type NOT NULL,
-    scheduled_date TIMESTAMP NOT NULL,
-    duration_minutes INTEGER DEFAULT 60,
-    location VARCHAR(255),
-    meeting_link VARCHAR(500),
-    
-    -- Interview Results
-    conducted BOOLEAN DEFAULT false,
-    actual_start_time TIMESTAMP,
-    actual_end_time TIMESTAMP,
-    rating performance_rating,
-    feedback TEXT,
-    technical_score DECIMAL(5,2),
-    communication_score DECIMAL(5,2),
-    overall_score DECIMAL(5,2),
-    recommendation TEXT,
-    
-    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-);
-
--- 15. Performance Reviews Table
-CREATE TABLE performance_reviews (
-    id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
-    employee_id UUID REFERENCES employees(id) ON DELETE CASCADE,
-    reviewer_id UUID REFERENCES employees(id) ON DELETE SET NULL,
-    review_period_start DATE NOT NULL,
-    review_period_end DATE NOT NULL,
-    
-    -- Ratings
-    overall_rating performance_rating NOT NULL,
-    technical_skills_rating performance_rating,
-    communication_rating performance_rating,
-    teamwork_rating performance_rating,
-    leadership_rating performance_rating,
-    
-    -- Goals and Feedback
-    achievements TEXT,
-    areas_for_improvement TEXT,
-    goals_next_period TEXT,
-    manager_feedback TEXT,
-    employee_comments TEXT,
-    
-    -- Status
-    is_completed BOOLEAN DEFAULT false,
-    completed_date DATE,
-    
-    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-);
-
--- 16. Training Programs Table
-CREATE TABLE training_programs (
-    id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
-    organization_id UUID REFERENCES organizations(id) ON DELETE CASCADE,
-    title VARCHAR(255) NOT NULL,
-    description TEXT,
-    duration_hours INTEGER,
-    max_participants INTEGER,
-    cost_per_participant DECIMAL(10,2),
-    trainer_name VARCHAR(255),
-    is_active BOOLEAN DEFAULT true,
-    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-);
-
--- 17. Employee Training Table
-CREATE TABLE employee_training (
-    id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
-    employee_id UUID REFERENCES employees(id) ON DELETE CASCADE,
-    training_program_id UUID REFERENCES training_programs(id) ON DELETE CASCADE,
-    enrollment_date DATE DEFAULT CURRENT_DATE,
-    completion_date DATE,
-    score DECIMAL(5,2),
-    certificate_url VARCHAR(500),
-    is_completed BOOLEAN DEFAULT false,
-    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-);
-
--- 18. Employee Benefits Table
-CREATE TABLE employee_benefits (
-    id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
-    employee_id UUID REFERENCES employees(id) ON DELETE CASCADE,
-    benefit_type VARCHAR(100) NOT NULL, -- health_insurance, retirement, etc.
-    benefit_name VARCHAR(255) NOT NULL,
-    description TEXT,
-    monthly_cost DECIMAL(10,2),
-    employee_contribution DECIMAL(10,2),
-    company_contribution DECIMAL(10,2),
-    start_date DATE,
-    end_date DATE,
-    is_active BOOLEAN DEFAULT true,
-    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-);
-
--- 19. Announcements Table
-CREATE TABLE announcements (
-    id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
-    organization_id UUID REFERENCES organizations(id) ON DELETE CASCADE,
-    title VARCHAR(255) NOT NULL,
-    content TEXT NOT NULL,
-    priority priority_level DEFAULT 'medium',
-    target_audience VARCHAR(100), -- all, department, specific_employees
-    target_department_id UUID REFERENCES departments(id) ON DELETE SET NULL,
-    is_active BOOLEAN DEFAULT true,
-    publish_date DATE DEFAULT CURRENT_DATE,
-    expiry_date DATE,
-    created_by UUID REFERENCES users(id) ON DELETE SET NULL,
-    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-);
-
--- 20. Employee Documents Table
-CREATE TABLE employee_documents (
-    id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
-    employee_id UUID REFERENCES employees(id) ON DELETE CASCADE,
-    document_type VARCHAR(100) NOT NULL, -- contract, id_copy, certificate, etc.
-    document_name VARCHAR(255) NOT NULL,
-    file_url VARCHAR(500) NOT NULL,
-    uploaded_by UUID REFERENCES users(id) ON DELETE SET NULL,
-    is_confidential BOOLEAN DEFAULT false,
-    expiry_date DATE,
-    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-);
-
--- Create indexes for better performance
-CREATE INDEX idx_employees_organization_id ON employees(organization_id);
-CREATE INDEX idx_employees_department_id ON employees(department_id);
-CREATE INDEX idx_employees_manager_id ON employees(manager_id);
-CREATE INDEX idx_employees_employee_id ON employees(employee_id);
-CREATE INDEX idx_employees_email ON employees(email);
-CREATE INDEX idx_employees_employment_status ON employees(employment_status);
-
-CREATE INDEX idx_users_employee_id ON users(employee_id);
-CREATE INDEX idx_users_username ON users(username);
-CREATE INDEX idx_users_email ON users(email);
-
-CREATE INDEX idx_attendance_employee_id ON attendance(employee_id);
-CREATE INDEX idx_attendance_date ON attendance(date);
-CREATE INDEX idx_attendance_employee_date ON attendance(employee_id, date);
-
-CREATE INDEX idx_payroll_employee_id ON payroll(employee_id);
-CREATE INDEX idx_payroll_pay_period ON payroll(pay_period_start, pay_period_end);
-
-CREATE INDEX idx_leave_requests_employee_id ON leave_requests(employee_id);
-CREATE INDEX idx_leave_requests_status ON leave_requests(status);
-CREATE INDEX idx_leave_requests_dates ON leave_requests(start_date, end_date);
-
-CREATE INDEX idx_job_applications_job_posting_id ON job_applications(job_posting_id);
-CREATE INDEX idx_job_applications_status ON job_applications(status);
-CREATE INDEX idx_job_applications_email ON job_applications(email);
-
-CREATE INDEX idx_interviews_application_id ON interviews(job_application_id);
-CREATE INDEX idx_interviews_interviewer_id ON interviews(interviewer_id);
-CREATE INDEX idx_interviews_scheduled_date ON interviews(scheduled_date);
-
-CREATE INDEX idx_performance_reviews_employee_id ON performance_reviews(employee_id);
-CREATE INDEX idx_performance_reviews_reviewer_id ON performance_reviews(reviewer_id);
-
--- Add foreign key constraint for department manager
-ALTER TABLE departments ADD CONSTRAINT fk_departments_manager 
-FOREIGN KEY (manager_id) REFERENCES employees(id) ON DELETE SET NULL;
-
--- Insert default roles
-INSERT INTO roles (name, description, permissions) VALUES
-('Super Admin', 'Full system access', '{"all": true}'),
-('HR Manager', 'HR management access', '{"employees": ["read", "write"], "payroll": ["read", "write"], "recruitment": ["read", "write"], "performance": ["read", "write"]}'),
-('Department Manager', 'Department management access', '{"employees": ["read"], "attendance": ["read"], "performance": ["read", "write"]}'),
-('Employee', 'Basic employee access', '{"profile": ["read", "write"], "attendance": ["read"], "leave": ["read", "write"]}');
-
--- Insert default leave types
-INSERT INTO leave_types (organization_id, name, description, max_days_per_year, is_paid, requires_approval) 
-SELECT 
-    o.id,
-    leave_type.name,
-    leave_type.description,
-    leave_type.max_days,
-    leave_type.is_paid,
-    leave_type.requires_approval
-FROM organizations o
-CROSS JOIN (
-    VALUES 
-    ('Annual Leave', 'Yearly vacation leave', 21, true, true),
-    ('Sick Leave', 'Medical leave for illness', 10, true, false),
-    ('Maternity Leave', 'Leave for new mothers', 90, true, true),
-    ('Paternity Leave', 'Leave for new fathers', 14, true, true),
-    ('Emergency Leave', 'Urgent personal matters', 5, false, true),
-    ('Personal Leave', 'Personal time off', 5, false, true)
-) AS leave_type(name, description, max_days, is_paid, requires_approval);
+-- HRMS Database Setup
+-- Runs once, when the Postgres container initializes an empty data directory.
+--
+-- The schema itself is managed only by the Alembic migrations in
+-- backend/alembic (run `alembic upgrade head` from the backend directory).
+-- This file only enables the extensions they use, as the superuser, in case
+-- the application role may not create extensions.
+
+-- Enable trigram matching for employee search
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+-- Enable GiST operator classes for scalar columns (leave overlap constraint)
+CREATE EXTENSION IF NOT EXISTS btree_gist;
@@ -1,5 +1,5 @@
 import axios, { AxiosResponse } from 'axios';
-import { LoginRequest, LoginResponse, User, Employee, Department } from '../types';
+import { LoginRequest, LoginResponse, User, Employee, Department, PaginatedResponse } from '../types';
 
 // API configuration
 const API_BASE_URL = process.env.REACT_APP_API_URL || 'http://localhost:5000';
@@ -11,6 +11,11 @@ const api = axios.create({
   },
 });
 
+// Reads shortly after a write go to the primary database instead of a lagging
+// read replica (matches READ_YOUR_WRITES_SECONDS on the backend)
+const READ_YOUR_WRITES_MS = 5000;
+let lastWriteAt = 0;
+
 // Request interceptor to add auth token
 api.interceptors.request.use(
   (config) => {
@@ -18,6 +23,9 @@ api.interceptors.request.use(
     if (token) {
       config.headers.Authorization = `Bearer ${token}`;
     }
+    if (config.method === 'get' && Date.now() - lastWriteAt < READ_YOUR_WRITES_MS) {
+      config.headers['X-Read-Primary'] = '1';
+    }
     return config;
   },
   (error) => {
@@ -27,7 +35,12 @@ api.interceptors.request.use(
 
 // Response interceptor to handle token expiration
 api.interceptors.response.use(
-  (response) => response,
+  (response) => {
+    if (response.config.method !== 'get') {
+      lastWriteAt = Date.now();
+    }
+    return response;
+  },
   (error) => {
     if (error.response?.status === 401) {
       localStorage.removeItem('access_token');
@@ -68,6 +81,27 @@ export const employeesAPI = {
     return response.data;
   },
 
+  getPage: async (params?: {
+    cursor?: string;
+    limit?: number;
+    department_id?: string;
+    employment_status?: string;
+    search?: string;
+    include_total?: boolean;
+  }): Promise<PaginatedResponse<Employee>> => {
+    const response: AxiosResponse<PaginatedResponse<Employee>> = await api.get('/employees/page', { params });
+    return response.data;
+  },
+
+  search: async (q: string, params?: {
+    limit?: number;
+    department_id?: string;
+    employment_status?: string;
+  }): Promise<Employee[]> => {
+    const response: AxiosResponse<Employee[]> = await api.get('/employees/search', { params: { q, ...params } });
+    return response.data;
+  },
+
   getById: async (id: string): Promise<Employee> => {
     const response: AxiosResponse<Employee> = await api.get(`/employees/${id}`);
     return response.data;
@@ -144,10 +178,38 @@ export const attendanceAPI = {
   },
 };
 
-// Leave API (placeholder)
+// Dashboard API
+export const dashboardAPI = {
+  getSummary: async (organizationId: string) => {
+    const response = await api.get('/dashboard/summary', { params: { organization_id: organizationId } });
+    return response.data;
+  },
+};
+
+// Leave API
 export const leaveAPI = {
-  getRequests: async () => {
-    const response = await api.get('/leave');
+  getRequests: async (params?: any) => {
+    const response = await api.get('/leave', { params });
+    return response.data;
+  },
+
+  create: async (data: any) => {
+    const response = await api.post('/leave', data);
+    return response.data;
+  },
+
+  update: async (id: string, data: any) => {
+    const response = await api.put(`/leave/${id}`, data);
+    return response.data;
+  },
+
+  getCalendar: async (params: any) => {
+    const response = await api.get('/leave/calendar', { params });
+    return response.data;
+  },
+
+  getBalances: async (employeeId: string, year?: number) => {
+    const response = await api.get('/leave/balances', { params: { employee_id: employeeId, year } });
     return response.data;
   },
 };
@@ -40,16 +40,27 @@ export interface Employee {
   emergency_contact_relationship?: string;
   profile_picture_url?: string;
   bio?: string;
+  department?: { id: string; name: string };
+  position?: { id: string; title: string };
+  manager?: EmployeeSummary;
   created_at: string;
   updated_at: string;
 }
 
+export interface EmployeeSummary {
+  id: string;
+  employee_id: string;
+  first_name: string;
+  last_name: string;
+}
+
 export interface Department {
   id: string;
   organization_id: string;
   name: string;
   description?: string;
   manager_id?: string;
+  manager?: EmployeeSummary;
   budget?: number;
   created_at: string;
   updated_at: string;
@@ -100,6 +111,18 @@ export interface LeaveRequest {
   updated_at: string;
 }
 
+export interface LeaveBalance {
+  employee_id: string;
+  leave_type_id: string;
+  year: number;
+  accrued_days: number;
+  carried_forward_days: number;
+  used_days: number;
+  pending_days: number;
+  available_days: number;
+  updated_at?: string;
+}
+
 export interface JobApplication {
   id: string;
   job_posting_id: string;
@@ -163,10 +186,11 @@ export interface ApiResponse<T> {
 
 export interface PaginatedResponse<T> {
   items: T[];
-  total: number;
-  page: number;
+  total?: number;
+  page?: number;
   per_page: number;
-  pages: number;
+  pages?: number;
+  next_cursor?: string;
 }
 
 // Form types